@@ -0,0 +1,204 @@
+import os
+import glob
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from .utils.market_calendar import NSECalendar
+
+
+class BarStore:
+    """
+    Typed, columnar storage for bar-indexed frames (raw candles, features, backtest results).
+
+    Layout: `{root}/{dataset}/{symbol}/{YYYY-MM}.parquet`, one file per symbol and month.
+    The 'date' column is stored as timezone-naive IST datetime64 and every partition is sorted by it.
+    Reads support column projection and [start, end] time-range predicates; month files outside
+    the range are never opened.
+
+    Datasets used by the pipeline:
+        'minute', '60minute', 'day'  raw Zerodha candles (dataset name = Kite interval)
+        'features'                   FeatureEngineer training data
+        'backtest'                   backtest_engine signals and P&L
+    """
+
+    def __init__(self, root="ai_option_brain/data/store"):
+        self.root = root
+
+    def _symbol_dir(self, dataset, symbol):
+        return os.path.join(self.root, dataset, symbol)
+
+    def partitions(self, dataset, symbol):
+        """
+        Sorted month partition files for a symbol.
+        """
+        return sorted(glob.glob(os.path.join(self._symbol_dir(dataset, symbol), "*.parquet")))
+
+    def symbols(self, dataset):
+        dataset_dir = os.path.join(self.root, dataset)
+        if not os.path.isdir(dataset_dir):
+            return []
+        return sorted(s for s in os.listdir(dataset_dir) if self.partitions(dataset, s))
+
+    def exists(self, dataset, symbol):
+        return bool(self.partitions(dataset, symbol))
+
+    def handle(self, dataset, symbol):
+        return BarHandle(self, dataset, symbol)
+
+    @staticmethod
+    def _normalise(df):
+        df = df.copy()
+        df['date'] = NSECalendar.to_ist_naive(df['date'])
+        return df
+
+    @staticmethod
+    def _write_partition(path, df):
+        tmp_path = f"{path}.tmp"
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path)
+        os.replace(tmp_path, path)
+
+    def _write_months(self, dataset, symbol, df, merge):
+        symbol_dir = self._symbol_dir(dataset, symbol)
+        os.makedirs(symbol_dir, exist_ok=True)
+        months = df['date'].dt.strftime("%Y-%m")
+        for month, part in df.groupby(months.values, sort=True):
+            path = os.path.join(symbol_dir, f"{month}.parquet")
+            if merge and os.path.exists(path):
+                existing = pq.read_table(path).to_pandas()
+                part = pd.concat([existing, part], ignore_index=True)
+            part = part.drop_duplicates(subset='date', keep='last').sort_values('date')
+            self._write_partition(path, part.reset_index(drop=True))
+
+    def write(self, dataset, symbol, df):
+        """
+        Replaces everything stored for the symbol with `df` (must have a 'date' column).
+        """
+        self.delete(dataset, symbol)
+        if df.empty:
+            return
+        self._write_months(dataset, symbol, self._normalise(df), merge=False)
+
+    def append(self, dataset, symbol, df):
+        """
+        Merges `df` into the affected month partitions. Rows with an already stored 'date' replace it.
+        """
+        if df.empty:
+            return
+        self._write_months(dataset, symbol, self._normalise(df), merge=True)
+
+    def delete(self, dataset, symbol):
+        """
+        Removes everything stored for the symbol.
+        """
+        for path in self.partitions(dataset, symbol):
+            os.remove(path)
+
+    def truncate(self, dataset, symbol, start):
+        """
+        Deletes a symbol's rows with 'date' >= start (only partitions from start's month are touched).
+        """
+        start = pd.Timestamp(start)
+        for path in self.partitions(dataset, symbol):
+            if os.path.basename(path)[:7] < start.strftime("%Y-%m"):
+                continue
+            part = pq.read_table(path).to_pandas()
+            part = part[part['date'] < start]
+            if part.empty:
+                os.remove(path)
+            else:
+                self._write_partition(path, part.reset_index(drop=True))
+
+    def read(self, dataset, symbol, columns=None, start=None, end=None):
+        """
+        Loads a symbol's rows.
+        :param columns: Columns to load (None = all). 'date' is always included.
+        :param start: Inclusive lower bound on 'date'
+        :param end: Inclusive upper bound on 'date'
+        """
+        if columns is not None and 'date' not in columns:
+            columns = ['date'] + list(columns)
+
+        files = self.partitions(dataset, symbol)
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        if start is not None:
+            files = [f for f in files if os.path.basename(f)[:7] >= start.strftime("%Y-%m")]
+        if end is not None:
+            files = [f for f in files if os.path.basename(f)[:7] <= end.strftime("%Y-%m")]
+
+        filters = []
+        if start is not None:
+            filters.append(('date', '>=', start))
+        if end is not None:
+            filters.append(('date', '<=', end))
+
+        tables = [pq.read_table(f, columns=columns, filters=filters or None) for f in files]
+        if not tables:
+            return pd.DataFrame(columns=columns or [])
+        return pa.concat_tables(tables).to_pandas()
+
+    def last_timestamp(self, dataset, symbol):
+        """
+        Latest stored 'date' for a symbol (reads only the date column of the newest partition).
+        """
+        files = self.partitions(dataset, symbol)
+        if not files:
+            return None
+        dates = pq.read_table(files[-1], columns=['date']).column('date').to_pandas()
+        return dates.max() if len(dates) else None
+
+    def import_csv(self, dataset, symbol, path, append=False):
+        """
+        Converts a legacy CSV (with a 'date' column) into the store.
+        :param append: Merge into already stored rows instead of replacing them
+        """
+        df = pd.read_csv(path)
+        df['date'] = pd.to_datetime(df['date'])
+        if append:
+            self.append(dataset, symbol, df)
+        else:
+            self.write(dataset, symbol, df)
+        return len(df)
+
+
+class BarHandle:
+    """
+    Lazy reference to one symbol's bars in a BarStore. Nothing is read until `load` or `iter_months`.
+    """
+
+    def __init__(self, store, dataset, symbol):
+        self.store = store
+        self.dataset = dataset
+        self.symbol = symbol
+
+    def __repr__(self):
+        return f"BarHandle({self.dataset}/{self.symbol}, rows={len(self)})"
+
+    def __len__(self):
+        # Row counts come from the Parquet footers; no column data is read
+        return sum(pq.ParquetFile(f).metadata.num_rows for f in self.store.partitions(self.dataset, self.symbol))
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    def load(self, columns=None, start=None, end=None):
+        """
+        Materialises the bars (see BarStore.read for the projection and range arguments).
+        """
+        return self.store.read(self.dataset, self.symbol, columns=columns, start=start, end=end)
+
+    def iter_months(self, columns=None, start=None):
+        """
+        Yields one DataFrame per month partition, keeping memory bounded by a single month.
+        :param start: First month to yield ('YYYY-MM' or anything pd.Timestamp accepts)
+        """
+        if columns is not None and 'date' not in columns:
+            columns = ['date'] + list(columns)
+        first = pd.Timestamp(start).strftime("%Y-%m") if start is not None else ""
+        for path in self.store.partitions(self.dataset, self.symbol):
+            if os.path.basename(path)[:7] >= first:
+                yield pq.read_table(path, columns=columns).to_pandas()
+
+    def last_timestamp(self):
+        return self.store.last_timestamp(self.dataset, self.symbol)
@@ -1,33 +1,64 @@
 import logging
 from kiteconnect import KiteConnect
+from kiteconnect import exceptions as kite_exceptions
+import numpy as np
 import pandas as pd
 import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from .instrument_master import InstrumentMaster
+from .utils.rate_limiter import TokenBucket
+
+# Kite Connect historical candle API allows 3 requests/second per API key.
+# One bucket per process so every fetcher and worker thread shares the same budget.
+HISTORICAL_RATE_LIMIT = 3
+HISTORICAL_LIMITER = TokenBucket(rate=HISTORICAL_RATE_LIMIT)
+
+# Errors that will not go away on retry (bad token/params, expired session, no permission)
+NON_RETRYABLE_ERRORS = (
+    kite_exceptions.InputException,
+    kite_exceptions.TokenException,
+    kite_exceptions.PermissionException,
+)
+
+# Column dtypes of a Kite candle ('oi' only present when requested)
+CANDLE_DTYPES = {
+    'open': np.float64, 'high': np.float64, 'low': np.float64, 'close': np.float64,
+    'volume': np.int64, 'oi': np.int64,
+}
 
 class ZerodhaDataFetcher:
     """
     Fetches historical data for Stocks, Futures, and Options using Zerodha Kite Connect API.
     """
-    def __init__(self, api_key=None, access_token=None):
+    def __init__(self, api_key=None, access_token=None, max_workers=4, max_retries=4, limiter=None, root=None):
+        """
+        :param root: Kite API base URL (default: ZERODHA_API_ROOT env, else the live API).
+                     Point it at a KiteStubServer for offline runs and benchmarks.
+        """
         self.api_key = api_key or os.getenv("ZERODHA_API_KEY")
         self.access_token = access_token or os.getenv("ZERODHA_ACCESS_TOKEN")
+        self.root = root or os.getenv("ZERODHA_API_ROOT")
         
         if self.api_key and self.access_token:
-            self.kite = KiteConnect(api_key=self.api_key)
+            self.kite = KiteConnect(api_key=self.api_key, root=self.root)
             self.kite.set_access_token(self.access_token)
         else:
             print("⚠️ Zerodha API Key/Token not found. Live data fetching will fail.")
             self.kite = None
 
-    def fetch_historical_data(self, instrument_token, from_date, to_date, interval="minute"):
+        self.instruments = InstrumentMaster(self.kite)
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.limiter = limiter or HISTORICAL_LIMITER
+
+    @staticmethod
+    def get_chunk_ranges(from_date, to_date, interval="minute"):
         """
-        Fetch historical candle data with chunking support.
-        :param interval: minute, day, 3minute, 5minute...
+        Splits a date range into the largest windows Zerodha serves per historical request.
         """
-        if not self.kite:
-            return pd.DataFrame()
-
-        all_data = []
         current_from = pd.to_datetime(from_date)
         end_date = pd.to_datetime(to_date)
         
@@ -42,39 +73,126 @@ class ZerodhaDataFetcher:
         else:
             chunk_days = 365
 
+        # Chunks end one second before midnight so consecutive windows neither overlap nor skip a bar
+        chunks = []
         while current_from < end_date:
-            current_to = min(current_from + timedelta(days=chunk_days), end_date)
+            boundary = current_from.normalize() + timedelta(days=chunk_days)
+            current_to = min(boundary - timedelta(seconds=1), end_date)
+            chunks.append((current_from, current_to))
+            current_from = boundary
+        return chunks
+
+    def fetch_chunk(self, instrument_token, from_date, to_date, interval="minute"):
+        """
+        Fetch one historical window through the shared rate limiter.
+        Transient failures (rate limit, network, server errors) are retried with exponential backoff;
+        the last error is raised once retries are exhausted.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
             try:
-                print(f"   Fetching {interval} data from {current_from.date()} to {current_to.date()}...")
-                data = self.kite.historical_data(instrument_token, current_from, current_to, interval)
-                if data:
-                    all_data.extend(data)
+                return self.kite.historical_data(instrument_token, from_date, to_date, interval)
+            except NON_RETRYABLE_ERRORS:
+                raise
             except Exception as e:
-                print(f"   Error fetching chunk: {e}")
-            
-            current_from = current_to + timedelta(seconds=1) # Avoid overlap? Zerodha handles it usually, but let's be safe
+                if attempt == self.max_retries:
+                    raise
+                delay = 2 ** attempt
+                print(f"   ⚠️ Chunk {from_date.date()} → {to_date.date()} failed ({e}). Retrying in {delay}s...")
+                time.sleep(delay)
+
+    def fetch_historical_data(self, instrument_token, from_date, to_date, interval="minute", workers=None):
+        """
+        Fetch historical candle data with chunking support.
+        Chunks are requested concurrently from a worker pool; all workers share the
+        process-wide historical API limiter, so throughput is capped at the API limit.
+        :param interval: minute, day, 3minute, 5minute...
+        :param workers: Concurrent chunk requests (default: self.max_workers, 1 = sequential)
+        """
+        if not self.kite:
+            return pd.DataFrame()
+
+        chunks = self.get_chunk_ranges(from_date, to_date, interval)
+        workers = min(workers or self.max_workers, len(chunks)) or 1
+
+        def fetch(chunk):
+            print(f"   Fetching {interval} data from {chunk[0].date()} to {chunk[1].date()}...")
+            return self.fetch_chunk(instrument_token, chunk[0], chunk[1], interval)
+
+        if workers == 1:
+            results = [fetch(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(fetch, chunks))
+
+        all_data = []
+        for data in results:
+            if data:
+                all_data.extend(data)
             
         df = pd.DataFrame(all_data)
+        if not df.empty:
+            df = df.drop_duplicates(subset='date', keep='last').sort_values('date').reset_index(drop=True)
         return df
 
+    @staticmethod
+    def candles_to_frame(candles):
+        """
+        Converts one chunk of Kite candle dicts into a DataFrame of typed column arrays.
+        """
+        if not candles:
+            return pd.DataFrame()
+        n = len(candles)
+        frame = {'date': pd.to_datetime([c['date'] for c in candles])}
+        for col, dtype in CANDLE_DTYPES.items():
+            if col in candles[0]:
+                frame[col] = np.fromiter((c[col] for c in candles), dtype=dtype, count=n)
+        return pd.DataFrame(frame)
+
+    def stream_historical_data(self, instrument_token, from_date, to_date, store, symbol,
+                               interval="minute", workers=None):
+        """
+        Streaming variant of fetch_historical_data for long pulls.
+        Each chunk is converted to typed arrays and appended to `store` (dataset = interval) as soon
+        as it arrives, so peak memory is bounded by the chunks in flight (at most `workers`),
+        not by the length of the history.
+        :return: BarHandle over the stored bars (nothing is loaded until handle.load())
+        """
+        handle = store.handle(interval, symbol)
+        if not self.kite:
+            return handle
+
+        chunks = self.get_chunk_ranges(from_date, to_date, interval)
+        workers = min(workers or self.max_workers, len(chunks)) or 1
+
+        def fetch(chunk):
+            print(f"   Fetching {interval} data from {chunk[0].date()} to {chunk[1].date()}...")
+            return self.candles_to_frame(self.fetch_chunk(instrument_token, chunk[0], chunk[1], interval))
+
+        # Chunks are written in order from this thread; at most `workers` results are held at once
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            in_flight = deque()
+            for chunk in chunks:
+                in_flight.append(pool.submit(fetch, chunk))
+                if len(in_flight) >= workers:
+                    store.append(interval, symbol, in_flight.popleft().result())
+            while in_flight:
+                store.append(interval, symbol, in_flight.popleft().result())
+        return handle
+
     def get_instrument_token(self, symbol, exchange="NSE"):
         """
         Get instrument token for a symbol (e.g., 'RELIANCE', 'NIFTY23OCT19000CE').
-        This requires fetching the full instrument dump (heavy operation, should be cached).
+        Served from the daily instrument master cache (one download per exchange per day).
         """
-        # TODO: Implement caching mechanism for instruments list
         if not self.kite:
             return None
             
         try:
-            instruments = self.kite.instruments(exchange)
-            for instr in instruments:
-                if instr['tradingsymbol'] == symbol:
-                    return instr['instrument_token']
+            return self.instruments.get_token(symbol, exchange)
         except Exception as e:
             print(f"Error fetching instrument token: {e}")
             return None
-        return None
 
 class YFinanceDataFetcher:
     """
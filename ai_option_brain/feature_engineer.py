@@ -1,6 +1,24 @@
 import pandas as pd
 import numpy as np
 from .utils.technical_indicators import TechnicalIndicators
+from .utils.realized_volatility import RealizedVolatility
+from .utils.session_resampler import SessionResampler
+
+# Window parameters of prepare_training_data (also part of the FeatureStore cache key)
+FEATURE_PARAMS = {
+    'target_window': 1875,                      # 5 days * 375 minutes (forward realized vol)
+    # Additional forward-RV labels (NaN where their window runs past the data; not used to drop rows)
+    'extra_targets': {'target_rv_1d': 375, 'target_rv_3d': 1125, 'target_rv_10d': 3750},
+    'hv_windows': {'hv_10': 3750, 'hv_20': 7500},
+    # Range-based estimator columns (RealizedVolatility.estimators): parkinson_10d, gk_10d, rs_10d, yz_10d,
+    # ... over the hv_* windows (close-to-close is hv_*). On by default; {} turns the suite off
+    'estimator_windows': {'10d': 3750, '20d': 7500},
+    'estimators': ['parkinson', 'gk', 'rs', 'yz'],
+    'sma_periods': [50, 200],
+    'rsi_period': 14,
+    'macro_interval': '60minute',
+    'annualisation': 252 * 375,
+}
 
 class FeatureEngineer:
     """
@@ -31,58 +49,275 @@ class FeatureEngineer:
         return vol
 
     @staticmethod
-    def prepare_training_data(df_1min, df_60min, vix_df=None):
+    def target_horizons():
+        """
+        {label column: forward window in bars}: target_rv plus the extra horizons.
+        """
+        return {'target_rv': FEATURE_PARAMS['target_window'], **FEATURE_PARAMS['extra_targets']}
+
+    @staticmethod
+    def volatility_estimators(df, windows, periods_per_year=None, estimators=RealizedVolatility.ESTIMATORS):
+        """
+        Close-to-close, Parkinson, Garman-Klass, Rogers-Satchell and Yang-Zhang volatility (annualised %)
+        for several windows at once, on minute or daily OHLC bars (see RealizedVolatility.estimators).
+        """
+        return RealizedVolatility.estimators(df, windows, periods_per_year, estimators)
+
+    @staticmethod
+    def warmup_bars():
+        """
+        Longest trailing 1-min window of prepare_training_data.
+        """
+        return max([*FEATURE_PARAMS['hv_windows'].values(), *FEATURE_PARAMS['estimator_windows'].values()])
+
+    @staticmethod
+    def advance_carry(carry, df_1min):
+        """
+        Running state (last close and prefix sums of the return / estimator terms) after the bars of
+        df_1min, for prepare_training_data(carry=...) on the bars that follow them.
+        :param carry: State before df_1min (None = df_1min starts the series)
+        """
+        terms = {'ret'}
+        if FEATURE_PARAMS['estimator_windows']:
+            terms |= {t for est in FEATURE_PARAMS['estimators'] for t in RealizedVolatility.ESTIMATOR_TERMS[est]}
+        return RealizedVolatility.advance(carry, df_1min, terms)
+
+    @staticmethod
+    def resample_macro(df_1min, interval=FEATURE_PARAMS['macro_interval']):
+        """
+        Builds the 60-min (macro) bars prepare_training_data expects from 1-min bars
+        (session-aligned: 09:15, 10:15, ..., 15:15, like Kite's 60minute candles).
+        """
+        return SessionResampler.resample(df_1min, interval)
+
+    @staticmethod
+    def downcast(df):
+        """
+        float64 columns as float32 and int64 columns as int32 (when the values fit).
+        """
+        dtypes = {}
+        info = np.iinfo(np.int32)
+        for col, dtype in df.dtypes.items():
+            if dtype == np.float64:
+                dtypes[col] = np.float32
+            elif dtype == np.int64 and (df.empty or (df[col].min() >= info.min and df[col].max() <= info.max)):
+                dtypes[col] = np.int32
+        return df.astype(dtypes)
+
+    @staticmethod
+    def _asof_positions(dates, right_dates):
+        """
+        Row of `right_dates` (sorted) that merge_asof(direction='backward') would pick for each of
+        `dates`, -1 where no row precedes. Lets callers look up only the columns they need.
+        """
+        return np.searchsorted(right_dates, dates, side='right') - 1
+
+    @staticmethod
+    def _take(values, positions, dtype=np.float64):
+        """
+        values[positions] as `dtype`, NaN where positions is -1. Always float, so a column's type
+        does not depend on whether this particular range had a missing lookup.
+        """
+        values = np.asarray(values)
+        if not len(values):
+            return np.full(len(positions), np.nan, dtype=dtype)
+        out = values[np.maximum(positions, 0)].astype(dtype, copy=False)
+        out[positions < 0] = np.nan
+        return out
+
+    @staticmethod
+    def _sorted_by_date(df):
+        return df if df['date'].is_monotonic_increasing else df.sort_values('date', ignore_index=True)
+
+    @staticmethod
+    def graph():
+        """
+        Feature dependency graph: {name: (builder(ctx), FEATURE_PARAMS keys it depends on)}.
+        Builders pull their inputs from the FeatureContext, so each node is computed at most once
+        and only when a requested feature needs it. Names starting with '_' are intermediates.
+        All feature nodes are float64 arrays aligned with the 1-min rows.
+        """
+        annualise = lambda: np.sqrt(FEATURE_PARAMS['annualisation']) * 100
+        nodes = {
+            '_close': (lambda ctx: ctx.df_1min['close'].astype(np.float64), []),
+            'log_ret': (lambda ctx: RealizedVolatility.bar_terms(
+                ctx.df_1min, ['ret'], ctx.carry.get('close', np.nan))['ret'], []),
+            # Prefix sums of the log returns, shared by the forward RV labels and the hv_* features
+            # (continued from ctx.carry, so chunked builds make the same additions as one pass)
+            '_ret_sums': (lambda ctx: RealizedVolatility.prefix_sums(
+                ctx['log_ret'], origin=ctx.carry.get('ret', (0.0, 0.0))), []),
+            '_targets': (lambda ctx: RealizedVolatility.forward_rv(
+                ctx['log_ret'],
+                {name: w for name, w in FeatureEngineer.target_horizons().items() if name in ctx.wanted},
+                FEATURE_PARAMS['annualisation'], ctx['_ret_sums']), []),
+            'vwap_dev': (lambda ctx: ((ctx['_close'] - ctx['_vwap']) / ctx['_vwap']).values, []),
+            '_vwap': (lambda ctx: TechnicalIndicators.calculate_vwap(ctx.df_1min), []),
+            # 60-min (macro) indicators, looked up at each 1-min bar (merge_asof 'backward')
+            '_macro_close': (lambda ctx: ctx.df_60min['close'].astype(np.float64), []),
+            '_macro_pos': (lambda ctx: FeatureEngineer._asof_positions(ctx.dates, ctx.df_60min['date'].values), []),
+            '_rsi_60m': (lambda ctx: TechnicalIndicators.calculate_rsi(
+                ctx['_macro_close'], FEATURE_PARAMS['rsi_period']).values, []),
+            '_sma_fast_60m': (lambda ctx: TechnicalIndicators.calculate_sma(
+                ctx['_macro_close'], FEATURE_PARAMS['sma_periods'][0]).values, []),
+            '_sma_slow_60m': (lambda ctx: TechnicalIndicators.calculate_sma(
+                ctx['_macro_close'], FEATURE_PARAMS['sma_periods'][1]).values, []),
+            'rsi': (lambda ctx: FeatureEngineer._take(ctx['_rsi_60m'], ctx['_macro_pos']),
+                    ['rsi_period', 'macro_interval']),
+            'sma_50': (lambda ctx: FeatureEngineer._take(ctx['_sma_fast_60m'], ctx['_macro_pos']),
+                       ['sma_periods', 'macro_interval']),
+            'sma_200': (lambda ctx: FeatureEngineer._take(ctx['_sma_slow_60m'], ctx['_macro_pos']),
+                        ['sma_periods', 'macro_interval']),
+            'trend_dist': (lambda ctx: FeatureEngineer._take(
+                (ctx['_macro_close'].values - ctx['_sma_slow_60m']) / ctx['_sma_slow_60m'], ctx['_macro_pos']),
+                ['sma_periods', 'macro_interval']),
+            # India VIX close of the latest VIX bar at or before each 1-min bar
+            # (a MarketContext row by integer position, else a lookup in the raw VIX bars)
+            '_vix_pos': (lambda ctx: ctx.market.positions(ctx.dates) if ctx.market is not None
+                         else FeatureEngineer._asof_positions(ctx.dates, pd.to_datetime(ctx.vix_df['date']).values), []),
+            'india_vix': (lambda ctx: FeatureEngineer._take(ctx.vix_values('close'), ctx['_vix_pos']), []),
+        }
+        for name in FeatureEngineer.target_horizons():
+            params = ['target_window'] if name == 'target_rv' else ['extra_targets']
+            nodes[name] = (lambda ctx, name=name: ctx['_targets'][name], params + ['annualisation'])
+        for name, window in FEATURE_PARAMS['hv_windows'].items():
+            nodes[name] = (lambda ctx, name=name, window=window: RealizedVolatility.trailing_std(
+                ctx['log_ret'], {name: window}, ctx['_ret_sums'])[name] * annualise(), ['hv_windows', 'annualisation'])
+        if FEATURE_PARAMS['estimator_windows']:
+            nodes['_estimators'] = (lambda ctx: RealizedVolatility.estimators(
+                ctx.df_1min, FEATURE_PARAMS['estimator_windows'], FEATURE_PARAMS['annualisation'],
+                [est for est in FEATURE_PARAMS['estimators']
+                 if any(f"{est}_{label}" in ctx.wanted for label in FEATURE_PARAMS['estimator_windows'])],
+                carry=ctx.carry), [])
+            for est in FEATURE_PARAMS['estimators']:
+                for label in FEATURE_PARAMS['estimator_windows']:
+                    nodes[f"{est}_{label}"] = (lambda ctx, name=f"{est}_{label}": ctx['_estimators'][name].values,
+                                               ['estimator_windows', 'estimators', 'annualisation'])
+        return nodes
+
+    @staticmethod
+    def input_features(columns):
+        """
+        The model inputs among `columns` (graph features that are neither labels nor log_ret), in order.
+        Raw OHLCV and the carried VIX OHLCV columns are never inputs.
+        """
+        graph = FeatureEngineer.graph()
+        labels = set(FeatureEngineer.target_horizons()) | {'log_ret'}
+        return [c for c in columns if c in graph and not c.startswith('_') and c not in labels]
+
+    @staticmethod
+    def feature_params(features):
+        """
+        The FEATURE_PARAMS entries the given features depend on (recorded in model manifests).
+        """
+        graph = FeatureEngineer.graph()
+        unknown = [f for f in features if f not in graph or f.startswith('_')]
+        if unknown:
+            raise ValueError(f"Unknown features: {unknown}")
+        keys = sorted({key for f in features for key in graph[f][1]})
+        return {key: FEATURE_PARAMS[key] for key in keys}
+
+    @staticmethod
+    def prepare_training_data(df_1min, df_60min, vix_df=None, include_target=True, compact=False,
+                              market=None, carry=None):
         """
         Merges 1-min (Micro structure) and 60-min (Macro structure) features.
         Target: Future Realized Volatility (5-day).
+        :param include_target: Compute target_rv. Live inference passes False: the forward window
+                               leaves the newest 1874 rows without a target, and dropna would discard them.
+        :param compact: Memory-lean mode. Features are still computed in float64 but stored as float32
+                        (int64 columns as int32), and the inputs are not copied.
+        :param market: Shared MarketContext with VIX already on the session grid (replaces vix_df;
+                       VIX columns are joined by grid position instead of a per-symbol lookup)
+        :param carry: State of the bars before df_1min (advance_carry) when df_1min is a slice of a longer
+                      series: rolling volatility sums continue the series', so the slice's rows are
+                      bit-identical to those of one pass over the whole series
         """
         print("   ⚙️ Engineering Features...")
+        dtype = np.float32 if compact else np.float64
+        targets = list(FeatureEngineer.target_horizons()) if include_target else []
+        estimators = [f"{est}_{label}" for label in FEATURE_PARAMS['estimator_windows']
+                      for est in FEATURE_PARAMS['estimators']]
+        macro = ['trend_dist', 'rsi', 'sma_50', 'sma_200']
+        ctx = FeatureContext(df_1min, df_60min, vix_df, market=market, carry=carry,
+                             wanted=['log_ret', *targets, *FEATURE_PARAMS['hv_windows'], *estimators, 'vwap_dev', *macro])
         
-        # 1. Process 60-min Data (Trend & Structure)
-        df_macro = df_60min.copy()
-        df_macro['rsi'] = TechnicalIndicators.calculate_rsi(df_macro['close'])
-        df_macro['sma_50'] = TechnicalIndicators.calculate_sma(df_macro['close'], 50)
-        df_macro['sma_200'] = TechnicalIndicators.calculate_sma(df_macro['close'], 200)
-        df_macro['trend_dist'] = (df_macro['close'] - df_macro['sma_200']) / df_macro['sma_200']
-        
-        # 2. Process 1-min Data (Volatility & Micro)
-        df_micro = df_1min.copy()
+        # 1. Process 1-min Data (Volatility & Micro)
+        df_micro = FeatureEngineer.downcast(ctx.df_1min) if compact else ctx.df_1min.copy()
         
-        # Log Returns
-        df_micro['log_ret'] = np.log(df_micro['close'] / df_micro['close'].shift(1))
+        # Log Returns, Realized Volatility (Targets), Historical Volatility (hv_10 = 10-day HV, hv_20 = 20-day HV),
+        # range-based estimators (FEATURE_PARAMS['estimator_windows']) and VWAP deviation
+        for name in ctx.wanted:
+            if name in macro:
+                continue
+            df_micro[name] = np.asarray(ctx[name]).astype(dtype, copy=False)
+            ctx.release(name)
         
-        # Realized Volatility (Target)
-        # Calculate 5-day future realized volatility
-        # 5 days * 375 minutes = 1875 bars
-        indexer = pd.api.indexers.FixedForwardWindowIndexer(window_size=1875)
-        df_micro['target_rv'] = df_micro['log_ret'].rolling(window=indexer).std() * np.sqrt(252 * 375) * 100
-        
-        # Historical Volatility Features (Inputs)
-        df_micro['hv_10'] = df_micro['log_ret'].rolling(window=3750).std() * np.sqrt(252 * 375) * 100 # 10-day HV
-        df_micro['hv_20'] = df_micro['log_ret'].rolling(window=7500).std() * np.sqrt(252 * 375) * 100 # 20-day HV
-        
-        # VWAP Deviation
-        vwap = TechnicalIndicators.calculate_vwap(df_micro)
-        df_micro['vwap_dev'] = (df_micro['close'] - vwap) / vwap
-        
-        # 3. Merge VIX (Market Fear)
-        # Resample VIX to 1-min and ffill
-        if vix_df is not None:
-             vix_df['date'] = pd.to_datetime(vix_df['date'])
-             vix_df = vix_df.set_index('date').resample('1T').ffill().reset_index()
-             # Merge on date (nearest)
-             df_micro = pd.merge_asof(df_micro.sort_values('date'), vix_df.sort_values('date'), on='date', direction='backward')
+        # 2. Merge VIX (Market Fear)
+        # Latest VIX bar at or before each 1-min bar (merge_asof 'backward' at the stock's own timestamps).
+        # Overlapping OHLCV names get merge_asof's _x/_y suffixes; VIX close becomes india_vix.
+        if ctx.has_vix:
+             positions = ctx['_vix_pos']
+             vix_cols = ctx.vix_columns()
+             df_micro.rename(columns={c: f"{c}_x" for c in vix_cols if c in df_micro.columns}, inplace=True)
+             for col in vix_cols:
+                 name = f"{col}_y" if f"{col}_x" in df_micro.columns else col
+                 df_micro[name] = FeatureEngineer._take(ctx.vix_values(col), positions, dtype)
              df_micro.rename(columns={'close_y': 'india_vix'}, inplace=True)
              df_micro.rename(columns={'close_x': 'close'}, inplace=True)
         
-        # 4. Merge Macro Features (Trend)
-        # Resample 60min macro data to 1min (ffill) or merge_asof
-        if not df_macro.empty:
-            df_macro = df_macro[['date', 'trend_dist', 'rsi', 'sma_50', 'sma_200']]
-            df_micro = pd.merge_asof(df_micro.sort_values('date'), df_macro.sort_values('date'), on='date', direction='backward')
+        # 3. Merge Macro Features (Trend)
+        if not ctx.df_60min.empty:
+            for name in macro:
+                df_micro[name] = ctx[name].astype(dtype, copy=False)
         
-        # 5. Clean & Finalize
-        # Drop NaNs created by rolling windows
-        df_final = df_micro.dropna()
+        # 4. Clean & Finalize
+        # Drop NaNs created by rolling windows (the extra horizons may stay NaN near the end)
+        subset = [c for c in df_micro.columns if c not in FEATURE_PARAMS['extra_targets']]
+        df_final = df_micro.dropna(subset=subset).reset_index(drop=True)
         
         return df_final
+
+
+class FeatureContext:
+    """
+    Inputs of one feature computation and the graph nodes computed so far (see FeatureEngineer.graph).
+    """
+
+    def __init__(self, df_1min, df_60min, vix_df=None, wanted=(), market=None, carry=None):
+        # Inputs are normally sorted already (BarStore, resample); only sort when they are not
+        self.df_1min = FeatureEngineer._sorted_by_date(df_1min)
+        self.df_60min = FeatureEngineer._sorted_by_date(df_60min)
+        self.market = market if market is not None and 'india_vix' in market else None
+        self.vix_df = FeatureEngineer._sorted_by_date(vix_df) if vix_df is not None and self.market is None else None
+        self.dates = self.df_1min['date'].values
+        self.wanted = list(wanted)
+        # Running state of the bars before df_1min (FeatureEngineer.advance_carry; empty = series start)
+        self.carry = carry or {}
+        self.graph = FeatureEngineer.graph()
+        self.nodes = {}
+
+    def __getitem__(self, name):
+        if name not in self.nodes:
+            self.nodes[name] = self.graph[name][0](self)
+        return self.nodes[name]
+
+    def release(self, name):
+        """
+        Drops a computed feature column (intermediates other features may still need are kept).
+        """
+        if not name.startswith('_') and name != 'log_ret':
+            self.nodes.pop(name, None)
+
+    @property
+    def has_vix(self):
+        return self.market is not None or self.vix_df is not None
+
+    def vix_columns(self):
+        if self.market is not None:
+            return self.market.value_columns('india_vix')
+        return [c for c in self.vix_df.columns if c != 'date']
+
+    def vix_values(self, col):
+        if self.market is not None:
+            return self.market.column('india_vix', col)
+        return self.vix_df[col].values
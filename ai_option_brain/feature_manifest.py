@@ -0,0 +1,108 @@
+import joblib
+import pandas as pd
+from datetime import datetime
+from .feature_engineer import FeatureEngineer, FEATURE_PARAMS
+
+
+class FeatureManifest:
+    """
+    The input contract of a trained model: its features in column order, the target it predicts
+    and the FEATURE_PARAMS entries those features were computed with.
+
+    Saved next to the model in the same artifact (see `save_model`), so training, backtests and
+    the live scanner all feed the model exactly the columns it was fitted on.
+    """
+
+    def __init__(self, features, target='target_rv', params=None, created=None):
+        self.features = list(features)
+        self.target = target
+        self.params = params
+        self.created = created or datetime.now().isoformat()
+
+    def __repr__(self):
+        return f"FeatureManifest({self.features}, target={self.target!r})"
+
+    @classmethod
+    def for_features(cls, features, target='target_rv'):
+        """
+        Manifest for `features` with the current FEATURE_PARAMS they depend on.
+        """
+        return cls(features, target, FeatureEngineer.feature_params(features))
+
+    @classmethod
+    def from_model(cls, model):
+        """
+        Fallback for models saved without a manifest: the column names sklearn recorded at fit time.
+        Parameters are unknown, so `check_params` cannot verify them.
+        """
+        names = getattr(model, 'feature_names_in_', None)
+        if names is None:
+            raise ValueError("Model has no manifest and no feature_names_in_; retrain it to record its features")
+        return cls(list(names), created='unknown')
+
+    def to_dict(self):
+        return {'features': self.features, 'target': self.target, 'params': self.params, 'created': self.created}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['features'], data.get('target', 'target_rv'), data.get('params'), data.get('created'))
+
+    def check_params(self):
+        """
+        Raises ValueError if the current FEATURE_PARAMS would compute these features differently.
+        """
+        if self.params is None:
+            return
+        changed = {key: (value, FEATURE_PARAMS.get(key)) for key, value in self.params.items()
+                   if FEATURE_PARAMS.get(key) != value}
+        if changed:
+            details = ", ".join(f"{key}: trained {old} != now {new}" for key, (old, new) in changed.items())
+            raise ValueError(f"Feature parameters changed since training ({details})")
+
+    def check_columns(self, columns):
+        """
+        Raises ValueError unless `columns` are exactly the manifest features in manifest order.
+        """
+        columns = list(columns)
+        if columns != self.features:
+            missing = [f for f in self.features if f not in columns]
+            extra = [c for c in columns if c not in self.features]
+            reason = f"missing {missing}, unexpected {extra}" if missing or extra else "different order"
+            raise ValueError(f"Model input mismatch ({reason}): expected {self.features}, got {columns}")
+
+    def frame(self, data):
+        """
+        Model input in manifest order from a DataFrame (extra columns ignored) or a feature dict (one row).
+        Missing features raise ValueError.
+        """
+        if isinstance(data, dict):
+            data = pd.DataFrame([data])
+        missing = [f for f in self.features if f not in data.columns]
+        if missing:
+            raise ValueError(f"Model input is missing features {missing}")
+        X = data[self.features]
+        self.check_columns(X.columns)
+        return X
+
+
+def save_model(model, manifest, path):
+    """
+    Saves the model and its manifest as one joblib artifact.
+    """
+    manifest.check_columns(getattr(model, 'feature_names_in_', manifest.features))
+    joblib.dump({'model': model, 'manifest': manifest.to_dict()}, path)
+
+
+def load_model(path):
+    """
+    Loads a model artifact as (model, manifest). Plain pickled models (saved before manifests)
+    get a manifest from their sklearn feature_names_in_.
+    """
+    artifact = joblib.load(path)
+    if isinstance(artifact, dict) and 'model' in artifact:
+        model, manifest = artifact['model'], FeatureManifest.from_dict(artifact['manifest'])
+        names = getattr(model, 'feature_names_in_', None)
+        if names is not None:
+            manifest.check_columns(names)
+        return model, manifest
+    return artifact, FeatureManifest.from_model(artifact)
@@ -0,0 +1,270 @@
+import os
+import json
+import hashlib
+import inspect
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from . import feature_engineer
+from .bar_store import BarStore
+from .feature_engineer import FeatureEngineer, FEATURE_PARAMS
+from .utils import technical_indicators, indicator_kernels, realized_volatility, session_resampler
+
+RAW_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+
+
+class FeatureStore:
+    """
+    Content-addressed cache of FeatureEngineer outputs in the BarStore 'features' dataset.
+
+    Each symbol's feature set is recorded in `{root}/_meta/features/{symbol}.json` with:
+      - 'definition': hash of FEATURE_PARAMS and the feature code (feature_engineer,
+        technical_indicators, indicator_kernels, realized_volatility, session_resampler)
+      - 'months' / 'vix': content digest of every month partition of the raw 1-min bars and of VIX
+
+      - 'compact': whether the features were built in prepare_training_data's float32 mode
+
+    `build` recomputes nothing when all of these match. A new definition or mode triggers a full rebuild.
+    Changed raw or VIX months (e.g. appended bars) only recompute the tail: rows from the longest
+    forward label window before the first changed month onwards.
+
+    Features are computed by `stream`, optionally in chunks of raw rows with their window warm-up
+    and look-ahead, and appended to the store as they are produced. Only the 60-min series (and the
+    shared MarketContext) is held in full: RSI is recursive over all of it and it is ~1/60 of the bars.
+    Chunked output and tail rebuilds are identical to the in-memory build (`verify` checks both).
+    """
+
+    def __init__(self, store=None, dataset="features", source="minute"):
+        self.store = store or BarStore()
+        self.dataset = dataset
+        self.source = source
+        self.meta_dir = os.path.join(self.store.root, "_meta", dataset)
+        self.definition = self.definition_key()
+
+    @staticmethod
+    def definition_key():
+        digest = hashlib.sha1(json.dumps(FEATURE_PARAMS, sort_keys=True).encode())
+        for module in (feature_engineer, technical_indicators, indicator_kernels, realized_volatility,
+                       session_resampler):
+            digest.update(inspect.getsource(module).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def month_digests(df):
+        """
+        {'YYYY-MM': sha1 of the month's rows} for a frame sorted by 'date'.
+        """
+        if df is None or df.empty:
+            return {}
+        months = df['date'].values.astype('datetime64[M]')
+        keys, starts = np.unique(months, return_index=True)
+        bounds = list(starts) + [len(df)]
+        row_hashes = pd.util.hash_pandas_object(df, index=False).values
+        return {str(k)[:7]: hashlib.sha1(row_hashes[bounds[i]:bounds[i + 1]].tobytes()).hexdigest()
+                for i, k in enumerate(keys)}
+
+    def _meta_path(self, symbol):
+        return os.path.join(self.meta_dir, f"{symbol}.json")
+
+    def load_meta(self, symbol):
+        path = self._meta_path(symbol)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _save_meta(self, symbol, meta):
+        os.makedirs(self.meta_dir, exist_ok=True)
+        path = self._meta_path(symbol)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f, indent=1)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _first_change(old, new):
+        """
+        Earliest month whose digest differs ('' if identical, None if history was removed).
+        """
+        changed = sorted(m for m in set(old) | set(new) if old.get(m) != new.get(m))
+        if not changed:
+            return ''
+        if any(m not in new for m in changed):
+            return None
+        return changed[0]
+
+    def plan(self, symbol, digests, vix_digests=None, compact=False):
+        """
+        :return: ('cached', None), ('full', None) or ('tail', first changed month start)
+        """
+        meta = self.load_meta(symbol)
+        if (meta is None or meta['definition'] != self.definition or meta.get('compact', False) != compact
+                or (meta['vix'] is None) != (vix_digests is None)
+                or not self.store.exists(self.dataset, symbol)):
+            return 'full', None
+
+        firsts = [self._first_change(meta['months'], digests)]
+        if vix_digests is not None:
+            firsts.append(self._first_change(meta['vix'], vix_digests))
+        if None in firsts:
+            return 'full', None
+        changed = [m for m in firsts if m]
+        if not changed:
+            return 'cached', None
+        if min(changed) <= min(digests):
+            return 'full', None
+        return 'tail', pd.Timestamp(f"{min(changed)}-01")
+
+    def scan(self, symbol):
+        """
+        One pass over the raw month partitions (one month in memory at a time).
+        :return: (month digests, {'YYYY-MM': row count}, 60-min bars)
+        """
+        digests, counts, macro = {}, {}, []
+        for month in self.store.handle(self.source, symbol).iter_months(RAW_COLUMNS):
+            if month.empty:
+                continue
+            month_digest = self.month_digests(month)
+            digests.update(month_digest)
+            counts[next(iter(month_digest))] = len(month)
+            # 60-min buckets never span months, so per-month resampling matches the whole series
+            macro.append(FeatureEngineer.resample_macro(month))
+        df_60m = pd.concat(macro, ignore_index=True) if macro else pd.DataFrame(columns=RAW_COLUMNS)
+        return digests, counts, df_60m
+
+    def _row_date(self, symbol, counts, row):
+        """
+        'date' of raw row number `row` (reads the date column of its month only).
+        """
+        for month in sorted(counts):
+            if row < counts[month]:
+                dates = next(self.store.handle(self.source, symbol).iter_months(['date'], start=month))['date']
+                return dates.iloc[row]
+            row -= counts[month]
+        raise IndexError("row out of range")
+
+    def stream(self, symbol, first_row, counts, df_60m, market=None, compact=False, chunk_rows=None):
+        """
+        Yields the feature rows of raw rows `first_row` onwards, `chunk_rows` raw rows per chunk
+        (None = a single chunk). Each chunk is computed from its own slice of raw bars: the longest
+        trailing window (+1 return) before it, widened to a session start for VWAP, and the forward target
+        windows after it. Memory depends on the chunk size, not on the length of the history.
+        The running volatility sums are carried over every raw row before the slice
+        (FeatureEngineer.advance_carry), so the rows are exactly those of one pass over the whole history.
+        """
+        lookahead = max(FeatureEngineer.target_horizons().values()) - 1
+        warmup = FeatureEngineer.warmup_bars() + 1
+
+        # Start at the month holding the first warm-up row (a session never spans two months)
+        base, start_month = 0, None
+        for month in sorted(counts):
+            if base + counts[month] > first_row - warmup:
+                start_month = month
+                break
+            base += counts[month]
+        if start_month is None:
+            return
+
+        # State of every raw row before the buffer; earlier months only advance it (one month at a time)
+        carry = None
+        months = self.store.handle(self.source, symbol).iter_months(RAW_COLUMNS) if base else ()
+        for month in months:
+            if month.empty:
+                continue
+            if month['date'].iloc[0].strftime("%Y-%m") >= start_month:
+                break
+            carry = FeatureEngineer.advance_carry(carry, month)
+
+        def session_start(buffer, row):
+            day = buffer['date'].iloc[max(row, 0)].normalize()
+            return int(np.searchsorted(buffer['date'].values, day.to_datetime64()))
+
+        def compute(buffer, carry, lo, hi):
+            # lo/hi are buffer positions of the chunk; rows past hi only feed the forward target
+            in_lo = session_start(buffer, lo - warmup)
+            carry = FeatureEngineer.advance_carry(carry, buffer.iloc[:in_lo])
+            window = buffer.iloc[in_lo:hi + lookahead].reset_index(drop=True)
+            features = FeatureEngineer.prepare_training_data(window, df_60m, compact=compact, market=market,
+                                                             carry=carry)
+            keep = features['date'] >= buffer['date'].iloc[lo]
+            if hi < len(buffer):
+                keep &= features['date'] < buffer['date'].iloc[hi]
+            return features[keep].reset_index(drop=True)
+
+        buffer = pd.DataFrame(columns=RAW_COLUMNS)
+        emit = first_row
+        for month in self.store.handle(self.source, symbol).iter_months(RAW_COLUMNS, start=start_month):
+            buffer = pd.concat([buffer, month], ignore_index=True) if len(buffer) else month
+            while chunk_rows and base + len(buffer) >= emit + chunk_rows + lookahead:
+                yield compute(buffer, carry, emit - base, emit - base + chunk_rows)
+                emit += chunk_rows
+                # Keep only what the next chunk's warm-up needs
+                cut = session_start(buffer, emit - base - warmup)
+                carry = FeatureEngineer.advance_carry(carry, buffer.iloc[:cut])
+                buffer = buffer.iloc[cut:].reset_index(drop=True)
+                base += cut
+        if emit < base + len(buffer):
+            yield compute(buffer, carry, emit - base, len(buffer))
+
+    def verify(self, symbol, market=None, compact=False, chunk_rows=100000):
+        """
+        Checks that a chunked build reproduces the in-memory one exactly (DataFrame.equals on every
+        row, column and dtype), and so do the stored features when they are up to date: a set grown by
+        tail rebuilds has to equal a full rebuild. Holds the symbol's whole feature set in memory three times.
+        :return: True if identical
+        """
+        digests, counts, df_60m = self.scan(symbol)
+
+        def run(rows):
+            frames = list(self.stream(symbol, 0, counts, df_60m, market, compact, rows))
+            return pd.concat(frames, ignore_index=True) if frames else None
+
+        in_memory = run(None)
+        chunked = run(chunk_rows)
+        if (chunked is None) != (in_memory is None) or (in_memory is not None and not chunked.equals(in_memory)):
+            return False
+        vix_digests = market.digests['india_vix'] if market is not None and 'india_vix' in market else None
+        if in_memory is None or self.plan(symbol, digests, vix_digests, compact)[0] != 'cached':
+            return True
+        return self.store.read(self.dataset, symbol).equals(in_memory)
+
+    def build(self, symbol, market=None, force=False, compact=False, chunk_rows=None):
+        """
+        Brings the stored features of `symbol` up to date with its raw bars.
+        :param market: Shared MarketContext (None or without 'india_vix' = no VIX features)
+        :param compact: Build with prepare_training_data(compact=True) (float32 features)
+        :param chunk_rows: Compute and write the features this many raw rows at a time (None = in one go)
+        :return: (mode, rows written) with mode 'cached', 'full' or 'tail'
+        """
+        digests, counts, df_60m = self.scan(symbol)
+        vix_digests = market.digests['india_vix'] if market is not None and 'india_vix' in market else None
+        mode, dirty_from = ('full', None) if force else self.plan(symbol, digests, vix_digests, compact)
+        if mode == 'cached':
+            return mode, 0
+
+        if mode == 'full':
+            first_row = 0
+        else:
+            # Rows whose forward target window reaches the changed range also change
+            rows_before = sum(n for month, n in counts.items() if month < dirty_from.strftime("%Y-%m"))
+            first_row = max(rows_before - (max(FeatureEngineer.target_horizons().values()) - 1), 0)
+
+        # Features are written chunk by chunk: drop the meta first so an interrupted build is redone in full
+        meta_path = self._meta_path(symbol)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        if mode == 'full':
+            self.store.delete(self.dataset, symbol)
+        else:
+            self.store.truncate(self.dataset, symbol, self._row_date(symbol, counts, first_row))
+
+        rows = 0
+        for features in self.stream(symbol, first_row, counts, df_60m, market, compact, chunk_rows):
+            self.store.append(self.dataset, symbol, features)
+            rows += len(features)
+
+        self._save_meta(symbol, {
+            'definition': self.definition, 'months': digests, 'vix': vix_digests, 'compact': compact,
+            'rows': len(self.store.handle(self.dataset, symbol)), 'updated': datetime.now().isoformat(),
+        })
+        return mode, rows
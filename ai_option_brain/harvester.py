@@ -0,0 +1,213 @@
+import os
+import json
+import threading
+import pandas as pd
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .bar_store import BarStore
+from .utils.market_calendar import NSECalendar
+
+
+class HarvestManifest:
+    """
+    JSON checkpoint of a harvest run: per-symbol status and per-chunk progress.
+
+    {
+      "interval": "minute", "from_date": ..., "to_date": ...,
+      "symbols": {
+        "RELIANCE": {"status": "pending|done|failed", "attempts": 1, "rows": 0, "error": null,
+                     "chunks": {"<from>|<to>": "pending|done|failed"}}
+      }
+    }
+    Symbols without an instrument token are 'failed' with "unresolvable": true; they do not keep
+    the run resumable (retrying the same date range cannot fetch them).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.data = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.data = json.load(f)
+
+    def save(self):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.data, f, indent=1, default=str)
+            os.replace(tmp_path, self.path)
+
+    def is_resumable(self, interval):
+        symbols = self.data.get("symbols", {})
+        return (self.data.get("interval") == interval and
+                any(s["status"] != "done" and not s.get("unresolvable") for s in symbols.values()))
+
+    def start(self, interval, from_date, to_date):
+        self.data = {"interval": interval, "from_date": str(from_date), "to_date": str(to_date), "symbols": {}}
+
+    def symbol(self, symbol):
+        return self.data["symbols"].get(symbol)
+
+    def add_symbol(self, symbol, chunks):
+        self.data["symbols"][symbol] = {
+            "status": "pending", "attempts": 0, "rows": 0, "error": None,
+            "chunks": {self.chunk_key(c): "pending" for c in chunks},
+        }
+
+    @staticmethod
+    def chunk_key(chunk):
+        return f"{chunk[0].isoformat()}|{chunk[1].isoformat()}"
+
+    @staticmethod
+    def parse_chunk(key):
+        start, end = key.split("|")
+        return pd.Timestamp(start), pd.Timestamp(end)
+
+    def set_chunk(self, symbol, chunk, status, rows=0, error=None):
+        with self._lock:
+            entry = self.data["symbols"][symbol]
+            entry["chunks"][self.chunk_key(chunk)] = status
+            entry["rows"] += rows
+            if error:
+                entry["error"] = error
+        self.save()
+
+    def set_unresolvable(self, symbol, unresolvable, error=None):
+        with self._lock:
+            entry = self.data["symbols"][symbol]
+            if unresolvable:
+                entry["status"], entry["error"], entry["unresolvable"] = "failed", error, True
+            else:
+                entry.pop("unresolvable", None)
+        self.save()
+
+    def drop_symbol(self, symbol):
+        with self._lock:
+            self.data.get("symbols", {}).pop(symbol, None)
+        self.save()
+
+    def pending_chunks(self, symbol):
+        entry = self.data["symbols"][symbol]
+        return [self.parse_chunk(k) for k, v in entry["chunks"].items() if v != "done"]
+
+
+class Harvester:
+    """
+    Resumable, concurrent multi-symbol candle harvest into the BarStore.
+
+    Chunk requests of every symbol share one worker pool and the fetcher's process-wide API
+    limiter. Each finished chunk is written to the store and checkpointed in the manifest,
+    so an interrupted run resumes at the first unfinished chunk. Failed chunks are retried
+    in further passes; symbols still failing after `max_passes` stay 'failed' in the manifest
+    and are picked up by the next run. Symbols without an instrument token are recorded as
+    unresolvable and do not make the next run resume this one's date range.
+    """
+
+    def __init__(self, fetcher, store=None, manifest_path="ai_option_brain/data/harvest_manifest.json",
+                 max_workers=6, max_passes=3):
+        self.fetcher = fetcher
+        self.store = store or BarStore()
+        self.manifest = HarvestManifest(manifest_path)
+        self.max_workers = max_workers
+        self.max_passes = max_passes
+        self._symbol_locks = {}
+
+    def _plan(self, symbols, from_date, to_date, interval, incremental):
+        """
+        Adds symbols to the manifest. Incremental symbols start from their last stored bar.
+        """
+        for symbol in symbols:
+            if self.manifest.symbol(symbol) is not None:
+                continue
+            start = from_date
+            last_ts = self.store.last_timestamp(interval, symbol) if incremental else None
+            if last_ts is not None:
+                start = max(last_ts, pd.Timestamp(from_date))
+            chunks = self.fetcher.get_chunk_ranges(start, to_date, interval)
+            self.manifest.add_symbol(symbol, chunks)
+        self.manifest.save()
+
+    def _fetch_chunk(self, symbol, token, chunk, interval):
+        try:
+            candles = self.fetcher.fetch_chunk(token, chunk[0], chunk[1], interval)
+            df = self.fetcher.candles_to_frame(candles)
+            if not df.empty:
+                # Month partitions of one symbol must not be rewritten concurrently
+                with self._symbol_locks[symbol]:
+                    self.store.append(interval, symbol, df)
+            self.manifest.set_chunk(symbol, chunk, "done", rows=len(df))
+            return True
+        except Exception as e:
+            self.manifest.set_chunk(symbol, chunk, "failed", error=str(e))
+            return False
+
+    def run(self, symbols, from_date, to_date=None, interval="minute", exchange="NSE", incremental=True, resume=True):
+        """
+        Harvests `symbols` into the store.
+        :param incremental: Fetch only bars after each symbol's last stored timestamp
+        :param resume: Continue an unfinished run recorded in the manifest (its date range is kept)
+        :return: Dict symbol -> manifest entry
+        """
+        to_date = to_date or datetime.now()
+        if not (resume and self.manifest.is_resumable(interval)):
+            self.manifest.start(interval, from_date, to_date)
+        else:
+            print(f"   ♻️ Resuming harvest started for range {self.manifest.data['from_date']} → {self.manifest.data['to_date']}")
+            from_date = pd.Timestamp(self.manifest.data["from_date"])
+            to_date = pd.Timestamp(self.manifest.data["to_date"])
+        self._plan(symbols, from_date, to_date, interval, incremental)
+
+        tokens = {}
+        for symbol in symbols:
+            self._symbol_locks.setdefault(symbol, threading.Lock())
+            token = self.fetcher.get_instrument_token(symbol, exchange)
+            if token:
+                tokens[symbol] = token
+                if self.manifest.symbol(symbol).get("unresolvable"):
+                    self.manifest.set_unresolvable(symbol, False)
+            else:
+                print(f"   ❌ {symbol}: instrument token not found on {exchange}")
+                self.manifest.set_unresolvable(symbol, True, "Token not found")
+
+        for symbol in tokens:
+            if not self.manifest.pending_chunks(symbol):
+                self.manifest.symbol(symbol)["status"] = "done"
+
+        for attempt in range(1, self.max_passes + 1):
+            tasks = [(s, c) for s in tokens if self.manifest.symbol(s)["status"] != "done"
+                     for c in self.manifest.pending_chunks(s)]
+            if not tasks:
+                break
+            print(f"   🚜 Pass {attempt}: {len(tasks)} chunk requests across {len({s for s, _ in tasks})} symbols")
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {pool.submit(self._fetch_chunk, s, tokens[s], c, interval): s for s, c in tasks}
+                for future in as_completed(futures):
+                    future.result()
+
+            for symbol in {s for s, _ in tasks}:
+                entry = self.manifest.symbol(symbol)
+                entry["attempts"] += 1
+                entry["status"] = "done" if not self.manifest.pending_chunks(symbol) else "failed"
+                if entry["status"] == "done":
+                    entry["error"] = None
+            self.manifest.save()
+
+        return {s: self.manifest.symbol(s) for s in symbols}
+
+    def reset(self, symbols, interval="minute"):
+        """
+        Deletes the stored bars and manifest entries of symbols so the next run re-fetches them in full.
+        """
+        for symbol in symbols:
+            self.store.write(interval, symbol, pd.DataFrame())
+            self.manifest.drop_symbol(symbol)
+
+    def check_gaps(self, symbol, interval="minute", start=None):
+        """
+        Session-calendar gap check over the stored bars of a symbol (reads only the date column).
+        """
+        dates = self.store.read(interval, symbol, columns=['date'], start=start)['date']
+        return NSECalendar.find_gaps(dates, interval)
@@ -0,0 +1,155 @@
+import os
+import glob
+import pickle
+import threading
+from datetime import date, datetime
+
+
+class InstrumentMaster:
+    """
+    Daily on-disk cache of the Kite Connect instrument dump with in-memory hash indexes.
+
+    Each exchange is downloaded at most once per day and persisted as
+    `{cache_dir}/{exchange}_{YYYY-MM-DD}.pkl`. Lookups are served from dictionaries
+    keyed by tradingsymbol, by (name, expiry, strike, instrument_type) and by instrument_token.
+    """
+
+    def __init__(self, kite, cache_dir="ai_option_brain/data/instruments"):
+        self.kite = kite
+        self.cache_dir = cache_dir
+        self._indexes = {}  # exchange -> {'day', 'by_symbol', 'by_contract', 'by_name'}
+        self._by_token = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def to_date(expiry):
+        """
+        Normalises an expiry given as datetime.date, datetime or 'YYYY-MM-DD' string.
+        """
+        if isinstance(expiry, str):
+            return datetime.strptime(expiry, "%Y-%m-%d").date()
+        if isinstance(expiry, datetime):
+            return expiry.date()
+        return expiry
+
+    @staticmethod
+    def contract_key(name, expiry, strike, instrument_type):
+        """
+        Normalises a derivative lookup key.
+        """
+        return (name, InstrumentMaster.to_date(expiry), float(strike), instrument_type)
+
+    def _cache_path(self, exchange, day):
+        return os.path.join(self.cache_dir, f"{exchange}_{day.isoformat()}.pkl")
+
+    def _download(self, exchange, day):
+        """
+        Downloads the instrument dump and writes it atomically, removing older dumps of the exchange.
+        """
+        print(f"   📥 Downloading {exchange} instrument master...")
+        instruments = self.kite.instruments(exchange)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._cache_path(exchange, day)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(instruments, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+        for stale in glob.glob(os.path.join(self.cache_dir, f"{exchange}_*.pkl")):
+            if stale != path:
+                os.remove(stale)
+        return instruments
+
+    def load(self, exchange="NSE"):
+        """
+        Returns the indexes for an exchange, loading from memory, then disk, then the API.
+        """
+        day = date.today()
+        entry = self._indexes.get(exchange)
+        if entry is not None and entry['day'] == day:
+            return entry
+
+        with self._lock:
+            entry = self._indexes.get(exchange)
+            if entry is not None and entry['day'] == day:
+                return entry
+
+            path = self._cache_path(exchange, day)
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    instruments = pickle.load(f)
+            elif self.kite is not None:
+                instruments = self._download(exchange, day)
+            else:
+                instruments = []
+
+            entry = self._build_indexes(instruments)
+            entry['day'] = day
+            self._indexes[exchange] = entry
+            return entry
+
+    def _build_indexes(self, instruments):
+        by_symbol = {}
+        by_contract = {}
+        by_name = {}
+        for instr in instruments:
+            by_symbol[instr['tradingsymbol']] = instr
+            self._by_token[instr['instrument_token']] = instr
+            if instr.get('name'):
+                by_name.setdefault(instr['name'], []).append(instr)
+            if instr.get('expiry'):
+                key = self.contract_key(instr['name'], instr['expiry'], instr['strike'], instr['instrument_type'])
+                by_contract[key] = instr
+        return {'by_symbol': by_symbol, 'by_contract': by_contract, 'by_name': by_name}
+
+    def get_instrument(self, symbol, exchange="NSE"):
+        """
+        Instrument record for a tradingsymbol (e.g., 'RELIANCE', 'NIFTY25DEC24000CE').
+        """
+        return self.load(exchange)['by_symbol'].get(symbol)
+
+    def get_token(self, symbol, exchange="NSE"):
+        instr = self.get_instrument(symbol, exchange)
+        return instr['instrument_token'] if instr else None
+
+    def get_contract(self, name, expiry, strike, instrument_type, exchange="NFO"):
+        """
+        Derivative record by underlying name, expiry, strike and 'CE'/'PE'/'FUT'.
+        """
+        key = self.contract_key(name, expiry, strike, instrument_type)
+        return self.load(exchange)['by_contract'].get(key)
+
+    def get_by_token(self, instrument_token):
+        """
+        Instrument record by token, across every exchange loaded so far.
+        """
+        return self._by_token.get(instrument_token)
+
+    def get_chain(self, name, exchange="NFO", expiry=None, instrument_type=None):
+        """
+        All instruments of an underlying, optionally filtered by expiry and type.
+        """
+        chain = self.load(exchange)['by_name'].get(name, [])
+        if expiry is not None:
+            expiry = self.to_date(expiry)
+            chain = [i for i in chain if i['expiry'] == expiry]
+        if instrument_type is not None:
+            chain = [i for i in chain if i['instrument_type'] == instrument_type]
+        return chain
+
+    def get_expiries(self, name, exchange="NFO"):
+        """
+        Sorted expiry dates listed for an underlying.
+        """
+        return sorted({i['expiry'] for i in self.get_chain(name, exchange) if i.get('expiry')})
+
+    def get_fno_underlyings(self, include_indices=False):
+        """
+        Underlyings with listed futures on NFO (the F&O stock universe).
+        """
+        indices = {"NIFTY", "BANKNIFTY", "FINNIFTY", "MIDCPNIFTY", "NIFTYNXT50"}
+        names = {i['name'] for i in self.load("NFO")['by_symbol'].values() if i['instrument_type'] == 'FUT'}
+        if not include_indices:
+            names -= indices
+        return sorted(names)
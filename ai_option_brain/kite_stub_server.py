@@ -0,0 +1,272 @@
+import io
+import csv
+import json
+import time
+import zlib
+import random
+import threading
+import numpy as np
+import pandas as pd
+from datetime import date, timedelta
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from .utils.market_calendar import NSECalendar
+from .utils.session_resampler import SessionResampler
+from .utils.rate_limiter import TokenBucket
+
+INSTRUMENT_COLUMNS = ["instrument_token", "exchange_token", "tradingsymbol", "name", "last_price", "expiry",
+                      "strike", "tick_size", "lot_size", "instrument_type", "segment", "exchange"]
+
+DEFAULT_SYMBOLS = [
+    "ADANIENT", "APOLLOHOSP", "AXISBANK", "HDFCBANK", "ICICIBANK", "INDUSINDBK", "INFY", "ITC",
+    "RELIANCE", "SBIN", "TATAMOTORS", "TATASTEEL", "TCS", "TITAN", "WIPRO", "INDIA VIX",
+]
+
+# Kite Connect per-endpoint limits (requests/second)
+ENDPOINT_LIMITS = {"historical": 3, "quote": 1, "instruments": 10}
+
+
+class SyntheticMarket:
+    """
+    Deterministic synthetic fixtures: an instrument list and 1-min candles generated per token.
+    The same token always yields the same bars regardless of how the range is chunked.
+    Symbols present in `fixture_store` ('minute' dataset) are replayed from recorded bars instead.
+    """
+
+    EPOCH = date(2015, 1, 1)
+
+    def __init__(self, symbols=None, fixture_store=None, option_underlyings=("NIFTY", "RELIANCE")):
+        self.fixture_store = fixture_store
+        self.instruments = {"NSE": [], "NFO": []}
+        self.by_token = {}
+        self._daily_levels = {}
+
+        for i, symbol in enumerate(symbols or DEFAULT_SYMBOLS):
+            instr = self._instrument(100000 + i * 256, symbol, symbol, "EQ", "NSE", "NSE")
+            self.instruments["NSE"].append(instr)
+
+        token = 5000000
+        for name in option_underlyings:
+            spot = self.base_price(zlib.crc32(name.encode()) % 1000 + 1)
+            step = 50 if spot > 5000 else 20
+            for expiry in self._expiries():
+                code = expiry.strftime("%y%b").upper()
+                self.instruments["NFO"].append(
+                    self._instrument(token, f"{name}{code}FUT", name, "FUT", "NFO-FUT", "NFO", expiry=expiry))
+                token += 1
+                atm = round(spot / step) * step
+                for strike in range(int(atm - 10 * step), int(atm + 11 * step), step):
+                    for opt in ("CE", "PE"):
+                        self.instruments["NFO"].append(self._instrument(
+                            token, f"{name}{code}{strike}{opt}", name, opt, "NFO-OPT", "NFO",
+                            expiry=expiry, strike=float(strike)))
+                        token += 1
+
+    def _instrument(self, token, tradingsymbol, name, instrument_type, segment, exchange, expiry="", strike=0.0):
+        instr = {
+            "instrument_token": token, "exchange_token": token // 256, "tradingsymbol": tradingsymbol,
+            "name": name, "last_price": 0.0, "expiry": expiry, "strike": strike, "tick_size": 0.05,
+            "lot_size": 1 if exchange == "NSE" else 75, "instrument_type": instrument_type,
+            "segment": segment, "exchange": exchange,
+        }
+        self.by_token[token] = instr
+        return instr
+
+    @staticmethod
+    def _expiries(months=3):
+        # Last Thursday of the next `months` months
+        today = date.today()
+        expiries = []
+        for m in range(months):
+            first = (pd.Timestamp(today.year, today.month, 1) + pd.DateOffset(months=m + 1)).date()
+            last = first - timedelta(days=1)
+            expiries.append(last - timedelta(days=(last.weekday() - 3) % 7))
+        return expiries
+
+    @staticmethod
+    def base_price(token):
+        return 100.0 + (token * 7919) % 4900
+
+    def instruments_csv(self, exchange):
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=INSTRUMENT_COLUMNS)
+        writer.writeheader()
+        for instr in self.instruments.get(exchange, []):
+            writer.writerow(instr)
+        return buf.getvalue().encode()
+
+    def _day_level(self, token, day):
+        """
+        Opening level of a trading day from a per-token daily random walk since EPOCH.
+        """
+        levels = self._daily_levels.get(token)
+        if levels is None:
+            rng = np.random.default_rng(token)
+            returns = rng.normal(0.0003, 0.015, 6000)
+            levels = self.base_price(token) * np.exp(np.cumsum(returns))
+            self._daily_levels[token] = levels
+        return levels[(day - self.EPOCH).days]
+
+    def minute_bars(self, token, start, end):
+        """
+        1-min OHLCV bars for session minutes in [start, end] (naive IST).
+        """
+        instr = self.by_token.get(token)
+        if instr and self.fixture_store is not None and self.fixture_store.exists("minute", instr["tradingsymbol"]):
+            return self.fixture_store.read("minute", instr["tradingsymbol"], start=start, end=end)
+
+        frames = []
+        for day in NSECalendar.trading_days(start, end):
+            rng = np.random.default_rng((token, day.toordinal()))
+            minutes = NSECalendar.session_minutes(day, day + pd.Timedelta(hours=23))
+            close = self._day_level(token, day.date()) * np.exp(np.cumsum(rng.normal(0, 0.0006, len(minutes))))
+            open_ = np.concatenate([[close[0]], close[:-1]])
+            wick = np.abs(rng.normal(0, 0.0004, len(minutes))) * close
+            frames.append(pd.DataFrame({
+                "date": minutes, "open": open_.round(2), "high": (np.maximum(open_, close) + wick).round(2),
+                "low": (np.minimum(open_, close) - wick).round(2), "close": close.round(2),
+                "volume": rng.integers(100, 20000, len(minutes)),
+            }))
+        if not frames:
+            return pd.DataFrame(columns=["date", "open", "high", "low", "close", "volume"])
+        df = pd.concat(frames, ignore_index=True)
+        return df[(df["date"] >= start) & (df["date"] <= end)]
+
+    def candles(self, token, start, end, interval):
+        """
+        Kite 'candles' payload for any interval ('minute', 'Nminute', 'day').
+        """
+        df = self.minute_bars(token, start, end)
+        if df.empty:
+            return []
+        if interval != "minute":
+            df = SessionResampler.resample(df, interval)
+        stamps = df["date"].dt.strftime("%Y-%m-%dT%H:%M:%S+0530")
+        return [[t, o, h, l, c, int(v)] for t, o, h, l, c, v in
+                zip(stamps, df["open"], df["high"], df["low"], df["close"], df["volume"])]
+
+    def quote(self, key):
+        exchange, tradingsymbol = key.split(":", 1)
+        instr = next((i for i in self.instruments.get(exchange, []) if i["tradingsymbol"] == tradingsymbol), None)
+        if instr is None:
+            return None
+        day = NSECalendar.trading_days(pd.Timestamp.now() - pd.Timedelta(days=10), pd.Timestamp.now())[-1]
+        bars = self.minute_bars(instr["instrument_token"], day, day + pd.Timedelta(hours=23))
+        return {
+            "instrument_token": instr["instrument_token"], "last_price": float(bars["close"].iloc[-1]),
+            "volume": int(bars["volume"].sum()),
+            "ohlc": {"open": float(bars["open"].iloc[0]), "high": float(bars["high"].max()),
+                     "low": float(bars["low"].min()), "close": float(bars["close"].iloc[-1])},
+        }
+
+
+class KiteStubServer:
+    """
+    Local stand-in for the Kite Connect REST API (instruments, historical_data, quote).
+
+    Point a client at it with `KiteConnect(api_key, root=server.root)` or `ZerodhaDataFetcher(root=server.root)`.
+    Latency, random server errors and Kite's per-endpoint rate limits (HTTP 429) can be injected.
+    """
+
+    def __init__(self, market=None, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                 rate_limits=None, seed=0):
+        """
+        :param latency: Fixed delay added to every response (seconds)
+        :param jitter: Extra uniform random delay in [0, jitter] seconds
+        :param error_rate: Probability of answering with a 500 GeneralException
+        :param rate_limits: Dict endpoint -> requests/second (default: Kite limits, None disables)
+        """
+        self.market = market or SyntheticMarket()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        limits = ENDPOINT_LIMITS if rate_limits is None else rate_limits
+        self.limiters = {k: TokenBucket(rate=v, capacity=v) for k, v in limits.items() if v}
+        self._rng = random.Random(seed)
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "throttled": 0, "errors": 0}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def root(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _allow(self, endpoint):
+        """
+        Non-blocking rate check: a request over the limit is rejected, as Kite does.
+        """
+        limiter = self.limiters.get(endpoint)
+        return limiter is None or limiter.try_acquire()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body, content_type="application/json"):
+                if not isinstance(body, bytes):
+                    body = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _error(self, status, error_type, message):
+                self._send(status, {"status": "error", "error_type": error_type, "message": message})
+
+            def do_GET(self):
+                server._count("requests")
+                url = urlparse(self.path)
+                parts = [p for p in url.path.split("/") if p]
+                query = parse_qs(url.query)
+                endpoint = ("historical" if parts[:2] == ["instruments", "historical"]
+                            else "instruments" if parts[:1] == ["instruments"] else parts[0] if parts else "")
+
+                delay = server.latency + (server._rng.uniform(0, server.jitter) if server.jitter else 0)
+                if delay:
+                    time.sleep(delay)
+                if not server._allow(endpoint):
+                    server._count("throttled")
+                    return self._error(429, "NetworkException", "Too many requests")
+                if server.error_rate and server._rng.random() < server.error_rate:
+                    server._count("errors")
+                    return self._error(500, "GeneralException", "Injected server error")
+
+                if endpoint == "historical" and len(parts) == 4:
+                    start = pd.Timestamp(query["from"][0])
+                    end = pd.Timestamp(query["to"][0])
+                    candles = server.market.candles(int(parts[2]), start, end, parts[3])
+                    return self._send(200, {"status": "success", "data": {"candles": candles}})
+                if endpoint == "instruments" and len(parts) == 2:
+                    return self._send(200, server.market.instruments_csv(parts[1]), "text/csv")
+                if endpoint == "quote":
+                    data = {k: q for k in query.get("i", []) if (q := server.market.quote(k)) is not None}
+                    return self._send(200, {"status": "success", "data": data})
+                return self._error(400, "InputException", f"Unknown route {url.path}")
+
+        return Handler
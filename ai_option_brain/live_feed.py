@@ -0,0 +1,325 @@
+import threading
+import time
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from .utils.market_calendar import NSECalendar
+
+BAR_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+
+# Bars kept per symbol. prepare_training_data needs 7500 1-min rows for hv_20 and
+# 200 hourly bars for sma_200 (~30 sessions), so hold a little more than that.
+RING_CAPACITY = 12000
+SEED_DAYS = 45
+
+
+class BarRing:
+    """
+    Fixed-capacity ring buffer of closed 1-min OHLCV bars backed by numpy arrays.
+    """
+
+    def __init__(self, capacity=RING_CAPACITY):
+        self.capacity = capacity
+        self.dates = np.zeros(capacity, dtype='datetime64[ns]')
+        self.ohlc = np.zeros((capacity, 4), dtype=np.float64)
+        self.volume = np.zeros(capacity, dtype=np.int64)
+        self._next = 0
+        self.size = 0
+
+    def append(self, date, o, h, l, c, v):
+        i = self._next
+        self.dates[i] = date
+        self.ohlc[i] = (o, h, l, c)
+        self.volume[i] = v
+        self._next = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def extend(self, df):
+        """
+        Bulk load of a bar frame (keeps only the newest `capacity` rows).
+        """
+        df = df.tail(self.capacity)
+        for row in zip(NSECalendar.to_ist_naive(df['date']).values, df['open'].values, df['high'].values,
+                       df['low'].values, df['close'].values, df['volume'].values):
+            self.append(*row)
+
+    def last_date(self):
+        return self.dates[self._next - 1] if self.size else None
+
+    def _order(self):
+        # Oldest -> newest positions
+        start = (self._next - self.size) % self.capacity
+        return (np.arange(self.size) + start) % self.capacity
+
+    def to_frame(self):
+        idx = self._order()
+        ohlc = self.ohlc[idx]
+        return pd.DataFrame({
+            'date': self.dates[idx], 'open': ohlc[:, 0], 'high': ohlc[:, 1],
+            'low': ohlc[:, 2], 'close': ohlc[:, 3], 'volume': self.volume[idx],
+        })
+
+
+class MinuteBarBuilder:
+    """
+    Aggregates ticks into 1-min OHLCV bars, one BarRing per instrument token.
+
+    A bar closes when the first tick of a later minute arrives, or on `flush(now)` for
+    instruments that stopped ticking. Bar volume is the change in the cumulative day volume
+    ('volume_traded'), so the first live minute only counts volume seen since the first tick.
+    Tick timestamps are taken as IST (tz-aware ones are converted).
+    """
+
+    def __init__(self, capacity=RING_CAPACITY):
+        self.capacity = capacity
+        self.rings = {}
+        self._forming = {}   # token -> [minute, o, h, l, c, cum_volume_at_open]
+        self._cum_volume = {}
+        self._lock = threading.Lock()
+
+    def seed(self, token, df):
+        """
+        Pre-fills a token's ring from historical bars (the bar of the current minute, if any, is dropped).
+        """
+        current = pd.Timestamp.now().floor("min")
+        df = df[NSECalendar.to_ist_naive(df['date']) < current]
+        with self._lock:
+            ring = self.rings.setdefault(token, BarRing(self.capacity))
+            ring.extend(df)
+
+    @staticmethod
+    def _minute(ts):
+        ts = pd.Timestamp(ts)
+        if ts.tzinfo is not None:
+            ts = ts.tz_convert("Asia/Kolkata").tz_localize(None)
+        return ts.floor("min")
+
+    def _close(self, token):
+        minute, o, h, l, c, vol_open = self._forming.pop(token)
+        ring = self.rings.setdefault(token, BarRing(self.capacity))
+        last = ring.last_date()
+        if last is not None and np.datetime64(minute, 'ns') <= last:
+            return
+        volume = max(self._cum_volume.get(token, vol_open) - vol_open, 0)
+        ring.append(np.datetime64(minute, 'ns'), o, h, l, c, volume)
+
+    def on_ticks(self, ticks):
+        with self._lock:
+            for tick in ticks:
+                token = tick['instrument_token']
+                price = tick['last_price']
+                ts = tick.get('exchange_timestamp') or tick.get('last_trade_time') or datetime.now()
+                minute = self._minute(ts)
+                cum_volume = tick.get('volume_traded', self._cum_volume.get(token, 0))
+
+                bar = self._forming.get(token)
+                if bar is not None and minute > bar[0]:
+                    self._close(token)
+                    bar = None
+                if bar is None:
+                    # Day volume restarts at the open of a new session
+                    vol_open = self._cum_volume.get(token, cum_volume)
+                    self._forming[token] = [minute, price, price, price, price,
+                                            vol_open if vol_open <= cum_volume else 0]
+                elif minute == bar[0]:
+                    bar[2] = max(bar[2], price)
+                    bar[3] = min(bar[3], price)
+                    bar[4] = price
+                self._cum_volume[token] = cum_volume
+
+    def flush(self, now=None):
+        """
+        Closes forming bars of minutes that have ended by `now` (naive IST).
+        """
+        current = self._minute(now or datetime.now())
+        with self._lock:
+            for token in [t for t, bar in self._forming.items() if bar[0] < current]:
+                self._close(token)
+
+    def bars(self, token, include_forming=False):
+        with self._lock:
+            ring = self.rings.get(token)
+            df = ring.to_frame() if ring is not None else pd.DataFrame(columns=BAR_COLUMNS)
+            bar = self._forming.get(token) if include_forming else None
+            if bar is not None:
+                volume = max(self._cum_volume.get(token, bar[5]) - bar[5], 0)
+                df = pd.concat([df, pd.DataFrame([bar[:5] + [volume]], columns=BAR_COLUMNS)], ignore_index=True)
+        return df
+
+
+class KiteTickSource:
+    """
+    Live ticks from the Kite Connect WebSocket (KiteTicker, full mode).
+    """
+
+    def __init__(self, api_key, access_token, root=None):
+        from kiteconnect import KiteTicker
+        self.ticker = KiteTicker(api_key, access_token, root=root)
+
+    def start(self, tokens, on_ticks):
+        def on_connect(ws, response):
+            ws.subscribe(tokens)
+            ws.set_mode(ws.MODE_FULL, tokens)
+
+        self.ticker.on_connect = on_connect
+        self.ticker.on_ticks = lambda ws, ticks: on_ticks(ticks)
+        self.ticker.on_close = lambda ws, code, reason: print(f"   ⚠️ Ticker closed ({code}): {reason}")
+        self.ticker.on_error = lambda ws, code, reason: print(f"   ⚠️ Ticker error ({code}): {reason}")
+        self.ticker.connect(threaded=True)
+
+    def stop(self):
+        self.ticker.close()
+
+
+class ReplayTickSource:
+    """
+    Offline tick source: replays recorded ticks (dicts in KiteTicker format) in timestamp order.
+    :param speed: Replay speed multiple of real time (None = as fast as possible)
+    """
+
+    def __init__(self, ticks, speed=None):
+        self.ticks = sorted(ticks, key=lambda t: t['exchange_timestamp'])
+        self.speed = speed
+        self._thread = None
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_file(cls, path, speed=None):
+        """
+        Loads ticks saved by TickRecorder.
+        """
+        df = pd.read_parquet(path)
+        return cls(df.to_dict("records"), speed)
+
+    @classmethod
+    def from_bars(cls, bars_by_token, speed=None):
+        """
+        Synthesises four ticks per recorded 1-min bar (open, high, low, close at 0/15/30/45s)
+        with a cumulative day volume, e.g. to replay a session from the BarStore.
+        """
+        ticks = []
+        for token, df in bars_by_token.items():
+            dates = NSECalendar.to_ist_naive(df['date'])
+            cum = df['volume'].groupby(dates.dt.normalize().values).cumsum().values
+            prev = cum - df['volume'].values
+            for date, o, h, l, c, v0, v1 in zip(dates, df['open'], df['high'], df['low'], df['close'], prev, cum):
+                for k, (price, vol) in enumerate(((o, v0), (h, v0), (l, v0), (c, v1))):
+                    ticks.append({'instrument_token': token, 'last_price': float(price), 'volume_traded': int(vol),
+                                  'exchange_timestamp': date + timedelta(seconds=15 * k)})
+        return cls(ticks, speed)
+
+    def start(self, tokens, on_ticks):
+        tokens = set(tokens)
+
+        def run():
+            prev_ts = None
+            for ts, batch in self._batches(tokens):
+                if self._stop.is_set():
+                    return
+                if self.speed and prev_ts is not None:
+                    time.sleep((ts - prev_ts).total_seconds() / self.speed)
+                on_ticks(batch)
+                prev_ts = ts
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+
+    def _batches(self, tokens):
+        batch, batch_ts = [], None
+        for tick in self.ticks:
+            if tick['instrument_token'] not in tokens:
+                continue
+            if batch and tick['exchange_timestamp'] != batch_ts:
+                yield batch_ts, batch
+                batch = []
+            batch.append(tick)
+            batch_ts = tick['exchange_timestamp']
+        if batch:
+            yield batch_ts, batch
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stop(self):
+        self._stop.set()
+
+
+class TickRecorder:
+    """
+    Wraps a tick callback and keeps every tick, so a live session can be saved and replayed offline.
+    """
+
+    def __init__(self, on_ticks=None):
+        self.on_ticks_next = on_ticks
+        self.ticks = []
+        self._lock = threading.Lock()
+
+    def on_ticks(self, ticks):
+        with self._lock:
+            self.ticks.extend({k: t.get(k) for k in ('instrument_token', 'last_price', 'volume_traded',
+                                                      'exchange_timestamp')} for t in ticks)
+        if self.on_ticks_next:
+            self.on_ticks_next(ticks)
+
+    def save(self, path):
+        with self._lock:
+            pd.DataFrame(self.ticks).to_parquet(path, index=False)
+
+
+class LiveFeed:
+    """
+    In-memory 1-min bars for a set of symbols, seeded once from history and kept current from ticks.
+
+    Startup costs one historical request per symbol; afterwards `bars(symbol)` is served
+    from memory without any REST call.
+    """
+
+    def __init__(self, fetcher, symbols, exchange="NSE", seed_days=SEED_DAYS, capacity=RING_CAPACITY, record=False):
+        self.fetcher = fetcher
+        self.builder = MinuteBarBuilder(capacity)
+        self.tokens = {}
+        for symbol in symbols:
+            token = fetcher.get_instrument_token(symbol, exchange)
+            if token:
+                self.tokens[symbol] = token
+            else:
+                print(f"   ⚠️ Token not found for {symbol}")
+        self.seed_days = seed_days
+        self.recorder = TickRecorder(self.builder.on_ticks) if record else None
+        self.source = None
+
+    def seed(self):
+        to_date = datetime.now()
+        from_date = to_date - timedelta(days=self.seed_days)
+        for symbol, token in self.tokens.items():
+            df = self.fetcher.fetch_historical_data(token, from_date, to_date, interval="minute")
+            if not df.empty:
+                self.builder.seed(token, df)
+
+    def start(self, source=None):
+        """
+        Seeds the buffers and starts streaming (default source: KiteTicker with the fetcher's credentials).
+        """
+        self.seed()
+        self.source = source or KiteTickSource(self.fetcher.api_key, self.fetcher.access_token)
+        callback = self.recorder.on_ticks if self.recorder else self.builder.on_ticks
+        self.source.start(list(self.tokens.values()), callback)
+        return self
+
+    def stop(self):
+        if self.source is not None:
+            self.source.stop()
+
+    def flush(self, now=None):
+        self.builder.flush(now)
+
+    def bars(self, symbol, include_forming=False):
+        token = self.tokens.get(symbol)
+        if token is None:
+            return pd.DataFrame(columns=BAR_COLUMNS)
+        return self.builder.bars(token, include_forming)
+
+    def last_bar_time(self, symbol):
+        ring = self.builder.rings.get(self.tokens.get(symbol))
+        return ring.last_date() if ring is not None else None
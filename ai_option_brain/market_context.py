@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+from .feature_engineer import FeatureEngineer
+from .feature_store import FeatureStore
+from .utils.market_calendar import NSECalendar
+from .utils.session_resampler import NS_PER_MINUTE
+
+# Market-wide series and their BarStore 'minute' symbols (feature name prefix -> symbol)
+MARKET_SYMBOLS = {'india_vix': "INDIA VIX"}
+
+
+class MarketContext:
+    """
+    Market-wide 1-min series (India VIX; later NIFTY spot, futures basis) aligned once to the NSE
+    session minute grid and shared read-only by every symbol's feature computation.
+
+    Each series column holds, at every session minute, the latest value at or before it (what
+    merge_asof(direction='backward') picks). A symbol joins by integer position: its bar minutes map
+    to grid rows by calendar arithmetic, so there is no per-symbol merge, resample or copy.
+    Bars off the session grid take the grid minute before them (VIX bars outside the session are
+    not seen there).
+    """
+
+    def __init__(self, series):
+        """
+        :param series: {name: DataFrame with 'date' and value columns}, e.g. {'india_vix': vix_df}
+        """
+        series = {name: FeatureEngineer._sorted_by_date(df) for name, df in series.items()
+                  if df is not None and not df.empty}
+        self.names = list(series)
+        self.digests = {}
+        self.columns = {}
+        if not series:
+            self.grid = np.empty(0, dtype=np.int64)
+            self.first_day = 0
+            self.day_rows = np.empty(0, dtype=np.int64)
+            return
+
+        first = min(df['date'].iloc[0] for df in series.values())
+        last = max(df['date'].iloc[-1] for df in series.values())
+        grid = NSECalendar.session_minutes(first.normalize(), last.normalize() + pd.Timedelta(hours=23, minutes=59))
+        self.grid = grid.as_unit('ns').asi8 // NS_PER_MINUTE
+
+        # Grid row of each calendar day's open (-1 on weekends and holidays), indexed from first_day
+        days = self.grid[::NSECalendar.MINUTES_PER_SESSION] // 1440
+        self.first_day = int(days[0]) if len(days) else 0
+        self.day_rows = np.full(int(days[-1]) - self.first_day + 1 if len(days) else 0, -1, dtype=np.int64)
+        self.day_rows[days - self.first_day] = np.arange(len(days)) * NSECalendar.MINUTES_PER_SESSION
+
+        for name, df in series.items():
+            self.digests[name] = FeatureStore.month_digests(df)
+            dates = pd.DatetimeIndex(df['date']).as_unit('ns').asi8 // NS_PER_MINUTE
+            rows = np.searchsorted(dates, self.grid, side='right') - 1
+            self.columns[name] = {col: self._take(df[col].to_numpy(np.float64), rows)
+                                  for col in df.columns if col != 'date'}
+        self._freeze()
+
+    def _freeze(self):
+        for columns in self.columns.values():
+            for values in columns.values():
+                values.flags.writeable = False
+
+    def __setstate__(self, state):
+        # Arrays come back writeable from a pickle (e.g. in pool workers)
+        self.__dict__.update(state)
+        self._freeze()
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    @staticmethod
+    def _take(values, rows):
+        out = values[np.maximum(rows, 0)]
+        out[rows < 0] = np.nan
+        return out
+
+    @classmethod
+    def from_store(cls, store, symbols=MARKET_SYMBOLS, start=None, end=None):
+        """
+        Loads the market series present in the store's 'minute' dataset.
+        """
+        return cls({name: store.read("minute", symbol, start=start, end=end)
+                    for name, symbol in symbols.items() if store.exists("minute", symbol)})
+
+    def positions(self, dates):
+        """
+        Grid row of the latest session minute at or before each bar (-1 before the grid starts).
+        """
+        minutes = pd.DatetimeIndex(dates).as_unit('ns').asi8 // NS_PER_MINUTE
+        if not len(self.grid):
+            return np.full(len(minutes), -1, dtype=np.int64)
+        # Session minutes: day's first grid row + minutes since the open
+        day = minutes // 1440 - self.first_day
+        offset = minutes % 1440 - (NSECalendar.SESSION_OPEN.hour * 60 + NSECalendar.SESSION_OPEN.minute)
+        in_range = (day >= 0) & (day < len(self.day_rows))
+        rows = np.where(in_range, self.day_rows[np.clip(day, 0, max(len(self.day_rows) - 1, 0))], -1)
+        on_grid = (rows >= 0) & (offset >= 0) & (offset < NSECalendar.MINUTES_PER_SESSION)
+        rows = np.where(on_grid, rows + offset, -1)
+        # Everything else (off-session bars, beyond the grid) by binary search
+        off = np.flatnonzero(~on_grid)
+        if len(off):
+            rows[off] = np.searchsorted(self.grid, minutes[off], side='right') - 1
+        return rows
+
+    def column(self, name, col='close'):
+        """
+        Read-only grid-aligned values of one column of a series.
+        """
+        return self.columns[name][col]
+
+    def value_columns(self, name):
+        return list(self.columns[name])
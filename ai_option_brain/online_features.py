@@ -0,0 +1,272 @@
+import math
+from collections import deque
+import numpy as np
+import pandas as pd
+from .feature_engineer import FEATURE_PARAMS
+from .utils.realized_volatility import RealizedVolatility
+from .utils.market_calendar import NSECalendar
+from .utils.session_resampler import SessionResampler, NS_PER_MINUTE
+
+ANNUALISE = math.sqrt(FEATURE_PARAMS['annualisation']) * 100
+NS_PER_DAY = 1440 * NS_PER_MINUTE
+# Macro buckets on the session grid (FeatureEngineer.resample_macro): offsets from the 09:15 open
+NS_SESSION_OPEN = (NSECalendar.SESSION_OPEN.hour * 60 + NSECalendar.SESSION_OPEN.minute) * NS_PER_MINUTE
+NS_PER_MACRO_BAR = SessionResampler.bucket_minutes(FEATURE_PARAMS['macro_interval']) * NS_PER_MINUTE
+
+LN2 = math.log(2)
+
+# Range-based estimator columns: {name: (estimator, window)} (FEATURE_PARAMS['estimator_windows'])
+ESTIMATOR_FEATURES = {f"{est}_{label}": (est, window) for label, window in FEATURE_PARAMS['estimator_windows'].items()
+                      for est in FEATURE_PARAMS['estimators']}
+
+# Model inputs the engine can produce (FeatureEngineer.prepare_training_data(..., vix_df=None, include_target=False))
+FEATURES = [*FEATURE_PARAMS['hv_windows'], *ESTIMATOR_FEATURES, 'vwap_dev', 'trend_dist', 'rsi', 'sma_50', 'sma_200']
+
+
+class RollingStd:
+    """
+    Rolling sample std (ddof=1) and mean from running sums, matching `Series.rolling(window).std()`.
+    NaN inputs count as missing; the result is NaN until `window` valid values are in the window.
+    The sums are rebuilt from the window every `window` updates so float drift stays bounded.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.nobs = 0
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self._since_rebuild = 0
+
+    def update(self, x):
+        self.values.append(x)
+        if x == x:
+            self.nobs += 1
+            self.sum += x
+            self.sumsq += x * x
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if old == old:
+                self.nobs -= 1
+                self.sum -= old
+                self.sumsq -= old * old
+
+        self._since_rebuild += 1
+        if self._since_rebuild >= self.window:
+            valid = [v for v in self.values if v == v]
+            self.sum = math.fsum(valid)
+            self.sumsq = math.fsum(v * v for v in valid)
+            self._since_rebuild = 0
+        return self.value()
+
+    def variance(self):
+        n = self.nobs
+        if n < self.window or n < 2:
+            return math.nan
+        var = (self.sumsq - self.sum * self.sum / n) / (n - 1)
+        return var if var > 0 else 0.0
+
+    def mean(self):
+        return self.sum / self.nobs if self.nobs >= self.window else math.nan
+
+    def value(self):
+        return math.sqrt(self.variance())
+
+
+class RollingMean:
+    """
+    Simple moving average with a provisional (not yet committed) last value.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.sum = 0.0
+
+    def commit(self, x):
+        if len(self.values) == self.window:
+            self.sum -= self.values[0]
+        self.values.append(x)
+        self.sum += x
+
+    def value_with(self, x):
+        """
+        Mean of the last `window` committed values with `x` appended (NaN while short of history).
+        """
+        n = len(self.values)
+        if n + 1 < self.window:
+            return math.nan
+        total = self.sum + x - (self.values[0] if n == self.window else 0.0)
+        return total / self.window
+
+
+class WilderRSI:
+    """
+    RSI matching `ta.momentum.rsi`: EWM(alpha=1/window, adjust=False) of gains and losses,
+    seeded with 0 at the first close, NaN for the first `window - 1` values.
+    """
+
+    def __init__(self, window=14):
+        self.alpha = 1.0 / window
+        self.window = window
+        self.count = 0
+        self.prev_close = None
+        self.ema_up = 0.0
+        self.ema_dn = 0.0
+
+    def _step(self, close):
+        if self.prev_close is None:
+            up = dn = 0.0
+        else:
+            diff = close - self.prev_close
+            up, dn = (diff, 0.0) if diff > 0 else (0.0, -diff if diff < 0 else 0.0)
+        if self.count == 0:
+            return up, dn
+        # Same operation order as pandas ewm(adjust=False)
+        keep = 1.0 - self.alpha
+        return keep * self.ema_up + self.alpha * up, keep * self.ema_dn + self.alpha * dn
+
+    def commit(self, close):
+        self.ema_up, self.ema_dn = self._step(close)
+        self.prev_close = close
+        self.count += 1
+
+    def value_with(self, close):
+        if self.count + 1 < self.window:
+            return math.nan
+        ema_up, ema_dn = self._step(close)
+        if ema_dn == 0:
+            return 100.0
+        return 100 - 100 / (1 + ema_up / ema_dn)
+
+
+class OnlineFeatureEngine:
+    """
+    Streaming per-symbol feature state for the live scanner, updated in O(1) per closed 1-min bar.
+
+    `update(bar)` returns the same feature row that
+    `FeatureEngineer.prepare_training_data(df_1m, df_60m, None, include_target=False)` yields for
+    the last bar of the history seen so far, where df_60m is `FeatureEngineer.resample_macro(df_1m)`:
+    - hv_10 / hv_20: rolling std of 1-min log returns over 3750 / 7500 bars (running sums)
+    - parkinson_* / gk_* / rs_* / yz_*: the range-based estimators (RealizedVolatility.estimators) from
+      running sums of their per-bar terms (needs the bar's open)
+    - vwap_dev: distance to the session VWAP (cumulative sums reset at each new day)
+    - rsi, sma_50, sma_200, trend_dist: on session-aligned hourly closes (09:15, 10:15, ...); the current
+      hour is provisional (its close is the latest 1-min close) and is committed when the next hour starts
+    Only the state behind `features` (e.g. a model manifest's inputs) is kept and updated.
+    """
+
+    def __init__(self, features=FEATURES):
+        unknown = [f for f in features if f not in FEATURES]
+        if unknown:
+            raise ValueError(f"OnlineFeatureEngine cannot compute {unknown} (supported: {FEATURES})")
+        self.wanted = list(features)
+        sma_fast, sma_slow = FEATURE_PARAMS['sma_periods']
+        self.hv = {name: RollingStd(window) for name, window in FEATURE_PARAMS['hv_windows'].items()
+                   if name in features}
+        self.estimators = {name: ESTIMATOR_FEATURES[name] for name in features if name in ESTIMATOR_FEATURES}
+        self.terms = {(term, window): RollingStd(window) for est, window in self.estimators.values()
+                      for term in RealizedVolatility.ESTIMATOR_TERMS[est]}
+        self.rsi = WilderRSI(FEATURE_PARAMS['rsi_period']) if 'rsi' in features else None
+        self.sma_50 = RollingMean(sma_fast) if 'sma_50' in features else None
+        self.sma_200 = RollingMean(sma_slow) if {'sma_200', 'trend_dist'} & set(features) else None
+        self.prev_close = None
+        self.session = None
+        self.cum_pv = 0.0
+        self.cum_v = 0.0
+        self.hour = None
+        self.hour_close = None
+        self.last_date = None
+        self.features = dict.fromkeys(self.wanted, math.nan)
+
+    def _bar_terms(self, open_price, high, low, close):
+        """
+        Per-bar estimator terms, as RealizedVolatility.bar_terms.
+        """
+        o, h, l, c = math.log(open_price), math.log(high), math.log(low), math.log(close)
+        body = c - o
+        hl2 = (h - l) ** 2
+        return {
+            'gap': o - math.log(self.prev_close) if self.prev_close else math.nan,
+            'body': body,
+            'parkinson': hl2 / (4 * LN2),
+            'gk': 0.5 * hl2 - (2 * LN2 - 1) * body * body,
+            'rs': (h - o) * (h - c) + (l - o) * (l - c),
+        }
+
+    def _estimate(self, est, window):
+        if est == 'yz':
+            k = 0.34 / (1.34 + (window + 1) / (window - 1))
+            var = (self.terms['gap', window].variance() + k * self.terms['body', window].variance()
+                   + (1 - k) * self.terms['rs', window].mean())
+        else:
+            var = self.terms[est, window].mean()
+        return math.sqrt(max(var, 0.0)) * ANNUALISE if var == var else math.nan
+
+    def update(self, date, high, low, close, volume, open_price=math.nan):
+        """
+        Consumes one closed 1-min bar (naive IST `date`) and returns the feature dict for it.
+        :param open_price: The bar's open (only the estimator features use it; NaN leaves them NaN)
+        """
+        # Session and hour buckets from integer nanoseconds (cheaper than Timestamp.floor per bar)
+        ns = pd.Timestamp(date).value
+        day, offset = divmod(ns, NS_PER_DAY)
+        features = {}
+
+        if self.terms:
+            terms = self._bar_terms(open_price, high, low, close)
+            for (term, _), state in self.terms.items():
+                state.update(terms[term])
+            for name, (est, window) in self.estimators.items():
+                features[name] = self._estimate(est, window)
+
+        if self.hv:
+            log_ret = math.log(close / self.prev_close) if self.prev_close else math.nan
+            for name, state in self.hv.items():
+                features[name] = state.update(log_ret) * ANNUALISE
+        self.prev_close = close
+
+        if 'vwap_dev' in self.features:
+            if day != self.session:
+                self.session, self.cum_pv, self.cum_v = day, 0.0, 0.0
+            self.cum_pv += (high + low + close) / 3 * volume
+            self.cum_v += volume
+            vwap = self.cum_pv / self.cum_v if self.cum_v else math.nan
+            features['vwap_dev'] = (close - vwap) / vwap if vwap else math.nan
+
+        hour = (day, (offset - NS_SESSION_OPEN) // NS_PER_MACRO_BAR)
+        if self.hour is not None and hour != self.hour:
+            for state in (self.rsi, self.sma_50, self.sma_200):
+                if state is not None:
+                    state.commit(self.hour_close)
+        self.hour, self.hour_close = hour, close
+        if self.sma_200 is not None:
+            sma_200 = self.sma_200.value_with(close)
+            features['trend_dist'] = (close - sma_200) / sma_200
+            features['sma_200'] = sma_200
+        if self.rsi is not None:
+            features['rsi'] = self.rsi.value_with(close)
+        if self.sma_50 is not None:
+            features['sma_50'] = self.sma_50.value_with(close)
+
+        self.last_date = pd.Timestamp(ns)
+        self.features = {name: features[name] for name in self.wanted}
+        return self.features
+
+    def update_frame(self, df):
+        """
+        Feeds a frame of 1-min bars in order (e.g. to warm up from seeded history).
+        """
+        opens = df['open'].values if 'open' in df else np.full(len(df), np.nan)
+        for row in zip(df['date'], df['high'].values, df['low'].values, df['close'].values, df['volume'].values,
+                       opens):
+            self.update(*row)
+        return self.features
+
+    @property
+    def ready(self):
+        # Same condition under which the batch path keeps the row (no NaN feature)
+        return all(v == v for v in self.features.values())
+
+    def vector(self, features=None):
+        return np.array([[self.features[f] for f in (features or self.wanted)]])
@@ -0,0 +1,223 @@
+import numpy as np
+from scipy.special import ndtr
+
+SQRT_2PI = np.sqrt(2 * np.pi)
+DAYS_PER_YEAR = 365.0
+
+# Flags accepted for calls (anything else is a put); booleans mean is_call
+CALL_FLAGS = ('c', 'C', 'call', 'Call', 'CALL', 'CE', 'ce')
+
+GREEKS = ('price', 'delta', 'gamma', 'theta', 'vega', 'rho', 'vanna', 'volga', 'charm', 'veta')
+
+# Per-element status of BlackScholes.implied_volatility
+IV_OK = 0                # converged
+IV_BELOW_INTRINSIC = 1   # price below the no-arbitrage lower bound (intrinsic value)
+IV_NO_TIME_VALUE = 2     # time value within tolerance of zero: any vol up to IV_MIN_VOL fits
+IV_ABOVE_MAX = 3         # price at/above the upper bound, or above the price at IV_MAX_VOL
+IV_NOT_CONVERGED = 4     # iteration limit reached (best estimate returned)
+IV_INVALID = 5           # non-finite or non-positive inputs, or expired
+IV_STATUS = {IV_OK: 'ok', IV_BELOW_INTRINSIC: 'below_intrinsic', IV_NO_TIME_VALUE: 'no_time_value',
+             IV_ABOVE_MAX: 'above_max', IV_NOT_CONVERGED: 'not_converged', IV_INVALID: 'invalid'}
+IV_MIN_VOL = 1e-4
+IV_MAX_VOL = 10.0
+
+
+class BlackScholes:
+    """
+    Array-native Black-Scholes (European, no dividends) pricing and Greeks.
+
+    Every argument broadcasts: a whole option chain, a grid of spots or a million simulated path points
+    is one call. d1/d2, N(d) and the density are evaluated once and shared by the price and every Greek.
+
+    Units follow py_vollib's analytical Greeks (what GreeksCalculator returned before):
+      delta, gamma        per 1 unit of the underlying
+      vega, rho           per 1 vol / rate point (0.01)
+      theta               per calendar day
+    and for the second-order Greeks:
+      vanna               change in delta per vol point
+      volga               change in vega (per point) per vol point
+      charm               change in delta per calendar day
+      veta                change in vega (per point) per calendar day
+    At or past expiry (T <= 0) or with zero volatility the option is worth its discounted intrinsic
+    value, delta is 0/1 (-1/0 for puts) and the other Greeks are 0.
+    """
+
+    @staticmethod
+    def is_call(flag):
+        """
+        Boolean array from 'c'/'p', 'call'/'put', 'CE'/'PE' flags (or booleans).
+        """
+        flag = np.asarray(flag)
+        if flag.dtype == bool:
+            return flag
+        return np.isin(flag, CALL_FLAGS)
+
+    @staticmethod
+    def _inputs(S, K, T, r, sigma):
+        S, K, T, r, sigma = (np.asarray(x, dtype=np.float64) for x in (S, K, T, r, sigma))
+        T = np.maximum(T, 0.0)
+        sqrt_t = np.sqrt(T)
+        vol_t = sigma * sqrt_t
+        live = vol_t > 0
+        # Expired / zero-vol elements get a dummy vol_t so nothing divides by zero; masked afterwards
+        safe_vol_t = np.where(live, vol_t, 1.0)
+        d1 = (np.log(S / K) + (r + 0.5 * sigma * sigma) * T) / safe_vol_t
+        d2 = d1 - vol_t
+        discount = np.exp(-r * T)
+        return S, K, T, r, sigma, sqrt_t, safe_vol_t, live, d1, d2, discount
+
+    @staticmethod
+    def price(S, K, T, r, sigma, flag='c'):
+        """
+        Option price only (cheaper than `greeks` when nothing else is needed).
+        """
+        S, K, T, r, sigma, sqrt_t, vol_t, live, d1, d2, discount = BlackScholes._inputs(S, K, T, r, sigma)
+        call = BlackScholes.is_call(flag)
+        sign = np.where(call, 1.0, -1.0)
+        price = sign * (S * ndtr(sign * d1) - K * discount * ndtr(sign * d2))
+        intrinsic = np.maximum(sign * (S - K * discount), 0.0)
+        return np.where(live, price, intrinsic)[()]
+
+    @staticmethod
+    def straddle(S, K, T, r, sigma):
+        """
+        Call + put price from one d1/d2 evaluation (put from call by parity).
+        """
+        S, K, T, r, sigma, sqrt_t, vol_t, live, d1, d2, discount = BlackScholes._inputs(S, K, T, r, sigma)
+        call = S * ndtr(d1) - K * discount * ndtr(d2)
+        price = 2 * call - S + K * discount
+        return np.where(live, price, np.abs(S - K * discount))[()]
+
+    @staticmethod
+    def greeks(S, K, T, r, sigma, flag='c', greeks=GREEKS):
+        """
+        Price and first- and second-order Greeks.
+        :param flag: 'c'/'p' (also 'call'/'put', 'CE'/'PE' or a boolean is_call array)
+        :param greeks: Names to return (subset of GREEKS)
+        :return: {name: array (or float for scalar inputs)}
+        """
+        unknown = set(greeks) - set(GREEKS)
+        if unknown:
+            raise ValueError(f"unknown greeks: {sorted(unknown)}")
+        S, K, T, r, sigma, sqrt_t, vol_t, live, d1, d2, discount = BlackScholes._inputs(S, K, T, r, sigma)
+        call = BlackScholes.is_call(flag)
+        sign = np.where(call, 1.0, -1.0)
+        pdf = np.exp(-0.5 * d1 * d1) / SQRT_2PI
+        n_d1 = ndtr(sign * d1)
+        n_d2 = ndtr(sign * d2)
+        kd = K * discount
+        vega = S * pdf * sqrt_t  # per unit vol, scaled below
+        safe_sigma = np.where(live, sigma, 1.0)
+        safe_t = np.where(live, T, 1.0)
+
+        out = {}
+        for name in greeks:
+            if name == 'price':
+                value = np.where(live, sign * (S * n_d1 - kd * n_d2), np.maximum(sign * (S - kd), 0.0))
+            elif name == 'delta':
+                value = np.where(live, sign * n_d1, np.where(sign * (S - kd) > 0, sign, 0.0))
+            elif name == 'gamma':
+                value = pdf / (S * vol_t)
+            elif name == 'theta':
+                value = (-S * pdf * sigma / (2 * np.where(live, sqrt_t, 1.0)) - sign * r * kd * n_d2) / DAYS_PER_YEAR
+            elif name == 'vega':
+                value = vega / 100
+            elif name == 'rho':
+                value = sign * kd * T * n_d2 / 100
+            elif name == 'vanna':
+                value = -pdf * d2 / safe_sigma / 100
+            elif name == 'volga':
+                value = vega * d1 * d2 / safe_sigma / 10000
+            elif name == 'charm':
+                value = -pdf * (2 * r * T - d2 * vol_t) / (2 * safe_t * vol_t) / DAYS_PER_YEAR
+            else:  # veta
+                value = vega * (r * d1 / vol_t - (1 + d1 * d2) / (2 * safe_t)) / 100 / DAYS_PER_YEAR
+            if name not in ('price', 'delta'):
+                value = np.where(live, value, 0.0)
+            out[name] = value[()]
+        return out
+
+    @staticmethod
+    def implied_volatility(price, S, K, T, r, flag='c', tol=1e-12, max_iter=100):
+        """
+        Implied volatility of every option in one vectorized solve.
+
+        Puts are mapped to calls by parity. Each element starts from the Corrado-Miller
+        approximation and takes Newton steps on the price, kept inside a per-element bracket
+        [IV_MIN_VOL, IV_MAX_VOL] that shrinks every iteration; a step leaving the bracket (or a
+        vanishing vega in the wings) falls back to bisection, so every element converges. Only
+        unconverged elements are iterated. Prices outside the no-arbitrage bounds, or with no time
+        value left to imply a vol from, get a status instead of a number.
+        :param tol: Convergence tolerance on the price (relative to the spot) and on the vol
+        :return: (iv array, status array of IV_* codes); iv is NaN unless the status is IV_OK
+                 or IV_NOT_CONVERGED
+        """
+        price, S, K, T, r = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (price, S, K, T, r)))
+        call = np.broadcast_to(BlackScholes.is_call(flag), price.shape)
+        shape = price.shape
+        price, S, K, T, r, call = (x.ravel() for x in (price, S, K, T, r, call))
+        iv = np.full(price.shape, np.nan)
+        status = np.full(price.shape, IV_INVALID, dtype=np.int8)
+
+        with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+            kd = K * np.exp(-r * T)
+            target = np.where(call, price, price + S - kd)  # call price (put-call parity)
+            valid = (np.isfinite(target) & np.isfinite(S) & np.isfinite(kd) & np.isfinite(T)
+                     & (S > 0) & (K > 0) & (T > 0) & (price >= 0))
+            intrinsic = np.maximum(S - kd, 0.0)
+            atol = tol * S
+            status[valid & (target < intrinsic - atol)] = IV_BELOW_INTRINSIC
+            status[valid & (target >= S)] = IV_ABOVE_MAX
+            todo = np.flatnonzero(valid & (target >= intrinsic - atol) & (target < S))
+
+            # Corrado-Miller initial guess (Brenner-Subrahmanyam when the root is imaginary)
+            c, s, k, t = target[todo], S[todo], kd[todo], T[todo]
+            mid = c - (s - k) / 2
+            root = np.sqrt(np.maximum(mid * mid - (s - k) ** 2 / np.pi, 0.0))
+            sigma = np.sqrt(2 * np.pi / t) * (mid + root) / (s + k)
+            sigma = np.clip(np.where(np.isfinite(sigma), sigma, 0.3), 2 * IV_MIN_VOL, IV_MAX_VOL / 2)
+            lo = np.full(len(todo), IV_MIN_VOL)
+            hi = np.full(len(todo), IV_MAX_VOL)
+
+            # Prices outside [price(IV_MIN_VOL), price(IV_MAX_VOL)] have no solution inside the bracket
+            bounds = BlackScholes.price(np.concatenate([s, s]), np.concatenate([k, k]), np.concatenate([t, t]), 0.0,
+                                        np.concatenate([lo, hi]), 'c')
+            low_price, high_price = bounds[:len(todo)], bounds[len(todo):]
+            at_floor = c <= low_price + atol[todo]
+            status[todo[at_floor]] = IV_NO_TIME_VALUE
+            too_high = ~at_floor & (c > high_price)
+            status[todo[too_high]] = IV_ABOVE_MAX
+            keep = ~at_floor & ~too_high
+            idx, c, s, k, t, sigma, lo, hi = (x[keep] for x in (todo, c, s, k, t, sigma, lo, hi))
+
+            for _ in range(max_iter):
+                if not len(idx):
+                    break
+                # Price and vega with r folded into the discounted strike (kd = K e^{-rT})
+                sqrt_t = np.sqrt(t)
+                vol_t = sigma * sqrt_t
+                d1 = np.log(s / k) / vol_t + 0.5 * vol_t
+                model = s * ndtr(d1) - k * ndtr(d1 - vol_t)
+                vega = s * np.exp(-0.5 * d1 * d1) / SQRT_2PI * sqrt_t
+                diff = model - c
+                # Converged once the price matches and the remaining Newton step is negligible (the
+                # second test keeps low-vega wing options iterating until the vol itself is pinned)
+                done = (np.abs(diff) <= atol[idx]) & (np.abs(diff) <= tol * vega)
+                iv[idx[done]] = sigma[done]
+                status[idx[done]] = IV_OK
+
+                above = diff > 0
+                hi = np.where(above, np.minimum(hi, sigma), hi)
+                lo = np.where(above, lo, np.maximum(lo, sigma))
+                step = sigma - diff / vega
+                bisect = ~np.isfinite(step) | (step <= lo) | (step >= hi)
+                step = np.where(bisect, 0.5 * (lo + hi), step)
+                # A bracket narrower than float resolution cannot improve further
+                done |= (hi - lo) <= 4 * np.finfo(float).eps * hi
+                iv[idx[done]] = sigma[done]
+                status[idx[done]] = IV_OK
+                idx, c, s, k, t, sigma, lo, hi = (x[~done] for x in (idx, c, s, k, t, step, lo, hi))
+
+            iv[idx] = sigma
+            status[idx] = IV_NOT_CONVERGED
+        return iv.reshape(shape)[()], status.reshape(shape)[()]
@@ -0,0 +1,205 @@
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from .market_calendar import NSECalendar
+from .session_resampler import NS_PER_MINUTE
+
+# F&O contracts expire on Thursdays; contracts expiring from this day on expire on Tuesdays
+TUESDAY_EXPIRY_FROM = pd.Timestamp("2025-09-01")
+TUESDAY, THURSDAY = 1, 3
+
+# Weekly expiry weekday per underlying: (first expiry day it applies to, weekday with Monday = 0).
+# Until the Nov-2024 rationalisation BANKNIFTY, FINNIFTY and MIDCPNIFTY had weeklies on their own
+# weekdays; they are not tabulated, so weekly expiries are NIFTY's only.
+WEEKLY_EXPIRY_WEEKDAYS = {
+    'NIFTY': ((pd.Timestamp.min, THURSDAY), (TUESDAY_EXPIRY_FROM, TUESDAY)),
+}
+# Monthly expiry weekday of stock and NIFTY contracts
+MONTHLY_EXPIRY_WEEKDAYS = ((pd.Timestamp.min, THURSDAY), (TUESDAY_EXPIRY_FROM, TUESDAY))
+
+MINUTES_PER_DAY = 1440
+TRADING_DAYS_PER_YEAR = 252
+# Minutes in a year on each time basis
+MINUTES_PER_YEAR = {
+    'calendar': 365 * MINUTES_PER_DAY,
+    'trading': TRADING_DAYS_PER_YEAR * NSECalendar.MINUTES_PER_SESSION,
+}
+
+_OPEN_MINUTE = NSECalendar.SESSION_OPEN.hour * 60 + NSECalendar.SESSION_OPEN.minute
+_CLOSE_MINUTE = NSECalendar.SESSION_CLOSE.hour * 60 + NSECalendar.SESSION_CLOSE.minute
+
+
+class ExpiryCalendar:
+    """
+    NSE F&O expiry calendar and vectorized time to expiry.
+
+    Expiries are on Thursdays (Tuesdays for contracts expiring from 2025-09-01): 'monthly' is the last
+    one of each month (stock and NIFTY contracts), 'weekly' every expiry weekday of the underlying's
+    index options (WEEKLY_EXPIRY_WEEKDAYS; NIFTY only). An expiry falling on a trading holiday moves
+    to the previous trading day (NSECalendar.HOLIDAYS; years outside the table warn and only skip
+    weekends). Contracts expire at the session close (15:30 IST).
+
+    Time to expiry is measured in years on one of two bases:
+      calendar   wall-clock minutes / 365 days (theta decays over nights and weekends)
+      trading    session minutes / 252 sessions of 375 minutes (only market hours count)
+    Expiry dates are cached per year and the running count of session minutes per trading day per
+    range of years, so bar timestamps map to year fractions with integer arithmetic and lookups:
+    no per-row date parsing.
+    """
+
+    @staticmethod
+    def _schedule(kind, underlying):
+        """
+        ((first expiry day, weekday), ...) of the expiry kind and underlying.
+        """
+        if kind == 'monthly':
+            return MONTHLY_EXPIRY_WEEKDAYS
+        if kind != 'weekly':
+            raise ValueError(f"unknown expiry kind: {kind!r} (use 'weekly' or 'monthly')")
+        if underlying not in WEEKLY_EXPIRY_WEEKDAYS:
+            raise ValueError(f"no weekly expiry schedule for {underlying!r} "
+                             f"(known: {sorted(WEEKLY_EXPIRY_WEEKDAYS)})")
+        return WEEKLY_EXPIRY_WEEKDAYS[underlying]
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _year_expiries(kind, year, underlying='NIFTY'):
+        """
+        Holiday-adjusted expiry days of one year as days since the epoch (read-only int64 array).
+        """
+        schedule = ExpiryCalendar._schedule(kind, underlying)
+        NSECalendar.check_holidays(year, year)
+        days = pd.date_range(f"{year}-01-01", f"{year}-12-31", freq="D")
+        weekday = np.full(len(days), -1)
+        for since, day in schedule:
+            weekday[days >= since] = day
+        expiries = days[days.dayofweek == weekday]
+        if kind == 'monthly':
+            expiries = pd.Series(expiries).groupby(expiries.month).max()
+        expiries = [ExpiryCalendar._previous_trading_day(day) for day in expiries]
+        out = np.asarray(pd.DatetimeIndex(expiries).as_unit('ns').asi8 // NS_PER_MINUTE // MINUTES_PER_DAY)
+        out.flags.writeable = False
+        return out
+
+    @staticmethod
+    def _previous_trading_day(day):
+        day = pd.Timestamp(day)
+        while not NSECalendar.is_trading_day(day):
+            day -= pd.Timedelta(days=1)
+        return day
+
+    @staticmethod
+    def _expiry_days(kind, first_year, last_year, underlying='NIFTY'):
+        return np.concatenate([ExpiryCalendar._year_expiries(kind, year, underlying)
+                               for year in range(first_year, last_year + 1)])
+
+    @staticmethod
+    def expiries(start, end, kind='monthly', underlying='NIFTY'):
+        """
+        Expiry dates between start and end (inclusive) as a DatetimeIndex at midnight.
+        :param underlying: Index whose weekly schedule to use (kind='weekly'; see WEEKLY_EXPIRY_WEEKDAYS)
+        """
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        days = ExpiryCalendar._expiry_days(kind, start.year, end.year, underlying)
+        expiries = pd.DatetimeIndex((days * MINUTES_PER_DAY * NS_PER_MINUTE).astype('datetime64[ns]'))
+        return expiries[(expiries >= start) & (expiries <= end)]
+
+    @staticmethod
+    def _minutes(dates):
+        """
+        Minutes since the epoch (timezone-naive IST) of timestamps: a scalar, list, array, Series or Index
+        of datetimes or strings. Strings are parsed once per distinct value.
+        """
+        scalar = np.ndim(dates) == 0
+        values = pd.Series([dates] if scalar else dates)
+        if values.dtype.kind != 'M' and not isinstance(values.dtype, pd.DatetimeTZDtype):
+            # Strings / dates / Timestamps: parse each distinct value once
+            codes, uniques = pd.factorize(values)
+            return ExpiryCalendar._minutes(pd.DatetimeIndex(pd.to_datetime(uniques)))[0][codes], scalar
+        values = pd.DatetimeIndex(values)
+        if values.tz is not None:
+            values = values.tz_convert("Asia/Kolkata").tz_localize(None)
+        return values.as_unit('ns').asi8 // NS_PER_MINUTE, scalar
+
+    @staticmethod
+    def _expiry_close(kind, minutes, underlying='NIFTY'):
+        """
+        Close minute of the first expiry at or after each timestamp (minutes since the epoch).
+        """
+        first_year = pd.Timestamp(int(minutes.min()), unit='m').year
+        last_year = pd.Timestamp(int(minutes.max()), unit='m').year
+        close = ExpiryCalendar._expiry_days(kind, first_year, last_year, underlying) * MINUTES_PER_DAY + _CLOSE_MINUTE
+        index = np.searchsorted(close, minutes, side='left')
+        if len(close) == 0 or index.max() == len(close):
+            # Timestamps after the year's last expiry roll into the next year
+            close = np.concatenate([close, ExpiryCalendar._year_expiries(kind, last_year + 1, underlying)
+                                    * MINUTES_PER_DAY + _CLOSE_MINUTE])
+        return close[index]
+
+    @staticmethod
+    def next_expiry(dates, kind='monthly', underlying='NIFTY'):
+        """
+        Expiry date (midnight) of the nearest contract still trading at each timestamp; on an expiry
+        day that is the expiring contract until the close.
+        """
+        minutes, scalar = ExpiryCalendar._minutes(dates)
+        days = ExpiryCalendar._expiry_close(kind, minutes, underlying) // MINUTES_PER_DAY
+        expiries = pd.DatetimeIndex((days * MINUTES_PER_DAY * NS_PER_MINUTE).astype('datetime64[ns]'))
+        return expiries[0] if scalar else expiries
+
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def _session_minutes_before(first_year, last_year):
+        """
+        Session minutes from first_year's Jan 1 to the open of each calendar day up to last_year's
+        Dec 31 (read-only int64 array indexed by day - first day) and the first day.
+        """
+        NSECalendar.check_holidays(first_year, last_year)
+        days = pd.date_range(f"{first_year}-01-01", f"{last_year}-12-31", freq="D")
+        trading = np.asarray((days.dayofweek < 5) & ~days.isin(NSECalendar.HOLIDAYS))
+        before = np.concatenate([[0], np.cumsum(trading * NSECalendar.MINUTES_PER_SESSION)[:-1]])
+        before.flags.writeable = False
+        trading.flags.writeable = False
+        return before, trading, int(days[0].value // NS_PER_MINUTE // MINUTES_PER_DAY)
+
+    @staticmethod
+    def _session_minutes(minutes):
+        """
+        Running count of session minutes up to each timestamp (same origin for every element).
+        """
+        first_year = pd.Timestamp(int(minutes.min()), unit='m').year
+        last_year = pd.Timestamp(int(minutes.max()), unit='m').year
+        before, trading, first_day = ExpiryCalendar._session_minutes_before(first_year, last_year)
+        day = minutes // MINUTES_PER_DAY - first_day
+        offset = np.clip(minutes % MINUTES_PER_DAY - _OPEN_MINUTE, 0, NSECalendar.MINUTES_PER_SESSION)
+        return before[day] + np.where(trading[day], offset, 0)
+
+    @staticmethod
+    def years_to_expiry(dates, expiry=None, kind='monthly', basis='calendar', underlying='NIFTY'):
+        """
+        Years from each timestamp to the expiry close (0 once expired).
+
+        :param dates: Valuation timestamps (bar dates; scalar or array, tz-aware or naive IST)
+        :param expiry: Expiry date(s) broadcasting against dates (default: the next `kind` expiry of
+                       each timestamp, see next_expiry)
+        :param basis: 'calendar' or 'trading' (see class docstring)
+        :param underlying: Index whose weekly schedule to use (kind='weekly'; see WEEKLY_EXPIRY_WEEKDAYS)
+        :return: float for scalar inputs, else a float64 array
+        """
+        if basis not in MINUTES_PER_YEAR:
+            raise ValueError(f"unknown time basis: {basis!r} (use one of {list(MINUTES_PER_YEAR)})")
+        minutes, scalar = ExpiryCalendar._minutes(dates)
+        if not len(minutes):
+            return np.empty(0)
+        if expiry is None:
+            close = ExpiryCalendar._expiry_close(kind, minutes, underlying)
+        else:
+            expiry_minutes, expiry_scalar = ExpiryCalendar._minutes(expiry)
+            close = expiry_minutes // MINUTES_PER_DAY * MINUTES_PER_DAY + _CLOSE_MINUTE
+            scalar = scalar and expiry_scalar
+        minutes, close = np.broadcast_arrays(minutes, close)
+        if basis == 'trading':
+            both = ExpiryCalendar._session_minutes(np.concatenate([minutes, close]))
+            minutes, close = both[:len(minutes)], both[len(minutes):]
+        years = np.maximum(close - minutes, 0) / MINUTES_PER_YEAR[basis]
+        return float(years[0]) if scalar else years
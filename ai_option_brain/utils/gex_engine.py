@@ -1,98 +1,141 @@
 import pandas as pd
 import numpy as np
-from .greeks_calculator import GreeksCalculator
+from .black_scholes import BlackScholes, SQRT_2PI
+from .expiry_calendar import ExpiryCalendar
+
+# Contract multipliers of the index options (NSE revision effective 2026). Fallback only: a 'lot_size'
+# column in the chain (from the instrument master) or an explicit lot_size argument takes precedence.
+LOT_SIZES = {'NIFTY': 65, 'BANKNIFTY': 30, 'FINNIFTY': 60, 'MIDCPNIFTY': 120, 'NIFTYNXT50': 25}
+
+RISK_FREE_RATE = 0.07
+MIN_YEARS_TO_EXPIRY = 0.001  # Expiring/expired contracts are valued as if a few hours remained
+
+# Hypothetical spots of the GEX profile: spot +/- 10% in 0.1% steps
+PROFILE_RANGE = 0.10
+PROFILE_POINTS = 201
 
 class GEXEngine:
     """
     The GEX Engine (Market Physics).
     Calculates Gamma Exposure (GEX) to determine the Market Regime.
+
+    Convention (SpotGamma / SqueezeMetrics): dealers are assumed long the calls and short the puts,
+    so call OI adds positive GEX and put OI negative GEX:
+        GEX = +/- Gamma * OI * Spot * LotSize
+    The whole chain (every strike and expiry) is priced in one array operation.
     """
 
     @staticmethod
-    def calculate_gex(option_chain_df, spot_price):
+    def lot_size(underlying):
+        """
+        Fallback contract multiplier of an underlying (LOT_SIZES).
+        """
+        try:
+            return LOT_SIZES[underlying]
+        except KeyError:
+            raise ValueError(f"unknown lot size for {underlying!r}; pass lot_size or a 'lot_size' column") from None
+
+    @staticmethod
+    def years_to_expiry(expiries, now=None):
         """
-        Calculates Net Gamma Exposure (GEX) for the entire option chain.
-        
-        Formula: GEX = Gamma * Open Interest * 100 * Spot Price
-        (Multiplied by 100 because 1 option contract = 100 shares usually, 
-         but for Nifty it's 50 or 25. We should check lot size. 
-         Standard GEX formula often uses 100 as a scaler or contract size).
-         
-        For Nifty, Lot Size is currently 25 (as of late 2024/2025). 
-        Let's pass lot_size as a parameter or assume 25.
-        
-        :param option_chain_df: DataFrame with columns: 
-               ['strike', 'type', 'oi', 'iv', 'expiry']
+        Years to each expiry close ('YYYY-MM-DD' or dates), floored at MIN_YEARS_TO_EXPIRY.
+        """
+        now = pd.Timestamp.now() if now is None else now
+        return np.maximum(ExpiryCalendar.years_to_expiry(now, expiries), MIN_YEARS_TO_EXPIRY)
+
+    @staticmethod
+    def _exposure_terms(strikes, t, r, iv, call, scale):
+        """
+        Per-option terms of GEX(S) = weight * exp(-d1^2 / 2) with d1 = slope * ln(S) + intercept.
+
+        Gamma * Spot = N'(d1) / (sigma sqrt(T)) and d1 is affine in ln(Spot), so these are computed once
+        and every hypothetical spot costs one exp per option.
+        """
+        slope = 1.0 / (iv * np.sqrt(t))
+        intercept = (-np.log(strikes) + (r + 0.5 * iv * iv) * t) * slope
+        weight = np.where(call, 1.0, -1.0) * scale * slope / SQRT_2PI
+        return slope, intercept, weight
+
+    @staticmethod
+    def _kernel(spots, slope, intercept):
+        """
+        exp(-d1^2 / 2) for every (spot, option): array (len(spots), n_options).
+        """
+        d1 = np.multiply.outer(np.log(np.asarray(spots, dtype=np.float64)), slope)
+        d1 += intercept
+        d1 *= d1
+        d1 *= -0.5
+        return np.exp(d1, out=d1)
+
+    @staticmethod
+    def zero_gamma(spots, profile):
+        """
+        Spot where the GEX profile crosses zero (linear interpolation between grid points).
+        With several crossings the one nearest the middle of the grid (the current spot) is returned;
+        None if the profile never changes sign (or there is no exposure at all).
+        """
+        spots = np.asarray(spots, dtype=np.float64)
+        profile = np.asarray(profile, dtype=np.float64)
+        if not np.any(profile):
+            return None
+        crossing = np.flatnonzero(np.sign(profile[:-1]) * np.sign(profile[1:]) < 0)
+        exact = np.flatnonzero(profile == 0)
+        if not len(crossing) and not len(exact):
+            return None
+        lo, hi = profile[crossing], profile[crossing + 1]
+        levels = np.concatenate([spots[crossing] + (spots[crossing + 1] - spots[crossing]) * lo / (lo - hi),
+                                 spots[exact]])
+        return float(levels[np.argmin(np.abs(levels - spots[len(spots) // 2]))])
+
+    @staticmethod
+    def calculate_gex(option_chain_df, spot_price, underlying='NIFTY', lot_size=None, r=RISK_FREE_RATE,
+                      now=None, spot_grid=None):
+        """
+        Calculates Net Gamma Exposure (GEX) for the entire option chain, per strike, and over a grid of
+        hypothetical spots (the profile that locates the zero-gamma flip level).
+
+        :param option_chain_df: DataFrame with columns:
+               ['strike', 'type', 'oi', 'iv', 'expiry'] (+ optional 'lot_size')
         :param spot_price: Current Underlying Price
-        :return: Dictionary with 'net_gex', 'regime', 'gex_by_strike'
+        :param underlying: Name used to look up the lot size when the chain has no 'lot_size' column
+        :param lot_size: Contract multiplier overriding the chain / LOT_SIZES
+        :param now: Valuation time (default: now)
+        :param spot_grid: Hypothetical spots of the profile (default: spot +/- PROFILE_RANGE)
+        :return: Dictionary with 'net_gex_inr_crores', 'regime', 'gex_by_strike' (net per strike),
+                 'details' (per option), 'profile' (spot -> net GEX in crores) and 'zero_gamma'
         """
-        lot_size = 25 # Nifty Lot Size
-        
-        gex_data = []
-        net_gex = 0
-        
-        # Assume we have a risk-free rate and time to expiry
-        # In a real system, these come from the data loader
-        r = 0.07 # 7% Risk Free Rate
-        
-        for index, row in option_chain_df.iterrows():
-            strike = row['strike']
-            opt_type = row['type'] # 'CE' or 'PE'
-            oi = row['oi']
-            iv = row['iv']
-            expiry = row['expiry'] # String 'YYYY-MM-DD'
-            
-            if oi == 0 or iv == 0:
-                continue
-                
-            t = GreeksCalculator.get_days_to_expiry(expiry)
-            if t <= 0:
-                t = 0.001 # Avoid division by zero
-                
-            # Calculate Gamma
-            flag = 'c' if opt_type == 'CE' else 'p'
-            greeks = GreeksCalculator.calculate_greeks(spot_price, strike, t, r, iv, flag)
-            gamma = greeks['gamma']
-            
-            # Calculate GEX for this strike
-            # Call GEX is Positive (Dealers Long Gamma)
-            # Put GEX is Negative (Dealers Short Gamma) - typically.
-            # Wait, standard theory:
-            # Market Makers Sell Calls -> Short Gamma -> Need to Buy Underlying to hedge -> No, wait.
-            # If MM Sells Call -> MM is Short Call -> MM is Short Gamma.
-            # If MM Sells Put -> MM is Short Put -> MM is Long Gamma? No.
-            # Short Call Gamma is Negative. Short Put Gamma is Negative.
-            # Long Call Gamma is Positive. Long Put Gamma is Positive.
-            
-            # Assumption: Market Makers are the ones SELLING to Retail.
-            # So if OI is high, MM is likely SHORT that option.
-            # MM Short Option = MM Short Gamma.
-            # So High OI = Negative GEX?
-            
-            # Let's stick to the SpotGamma / SqueezeMetrics definition:
-            # Call OI adds to Positive GEX (Dealers Long Gamma - assuming they bought from overwriters?)
-            # Put OI adds to Negative GEX (Dealers Short Gamma - assuming they sold to hedgers).
-            
-            # Convention:
-            # Call GEX = Gamma * OI * Spot * LotSize
-            # Put GEX = Gamma * OI * Spot * LotSize * -1
-            
-            strike_gex = gamma * oi * spot_price * lot_size
-            
-            if opt_type == 'PE':
-                strike_gex *= -1
-                
-            net_gex += strike_gex
-            gex_data.append({
-                'strike': strike,
-                'type': opt_type,
-                'gex': strike_gex
-            })
-            
+        chain = option_chain_df
+        oi = chain['oi'].to_numpy(np.float64)
+        iv = chain['iv'].to_numpy(np.float64)
+        # Options without open interest or a solved IV carry no exposure
+        keep = (oi > 0) & (iv > 0)
+        oi, iv = oi[keep], iv[keep]
+
+        if lot_size is None:
+            lot_size = (chain['lot_size'].to_numpy(np.float64)[keep] if 'lot_size' in chain
+                        else GEXEngine.lot_size(underlying))
+        strikes = chain['strike'].to_numpy(np.float64)[keep]
+        types = chain['type'].to_numpy()[keep]
+        t = GEXEngine.years_to_expiry(chain['expiry'].to_numpy()[keep], now)
+        slope, intercept, weight = GEXEngine._exposure_terms(strikes, t, r, iv, BlackScholes.is_call(types),
+                                                             oi * lot_size)
+
+        gex = weight * GEXEngine._kernel([spot_price], slope, intercept)[0]
+        net_gex = float(gex.sum())
+
+        if spot_grid is None:
+            spot_grid = spot_price * np.linspace(1 - PROFILE_RANGE, 1 + PROFILE_RANGE, PROFILE_POINTS)
+        spot_grid = np.asarray(spot_grid, dtype=np.float64)
+        profile = GEXEngine._kernel(spot_grid, slope, intercept) @ weight
+
+        details = pd.DataFrame({'strike': strikes, 'type': types, 'gex': gex})
         regime = "Positive (Pinning)" if net_gex > 0 else "Negative (Trending)"
-        
+
         return {
             "net_gex_inr_crores": net_gex / 10000000, # Convert to Crores
             "regime": regime,
-            "details": gex_data
+            "gex_by_strike": details.groupby('strike')['gex'].sum() / 10000000,
+            "details": details,
+            "profile": pd.Series(profile / 10000000, index=pd.Index(spot_grid, name='spot'), name='net_gex'),
+            "zero_gamma": GEXEngine.zero_gamma(spot_grid, profile),
         }
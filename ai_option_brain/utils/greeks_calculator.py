@@ -1,8 +1,7 @@
 import numpy as np
-from scipy.stats import norm
-from py_vollib.black_scholes import black_scholes
-from py_vollib.black_scholes.greeks.analytical import delta, gamma, theta, vega, rho
-from py_vollib.black_scholes.implied_volatility import implied_volatility
+import pandas as pd
+from .black_scholes import BlackScholes, GREEKS, IV_OK
+from .expiry_calendar import ExpiryCalendar
 
 class GreeksCalculator:
     """
@@ -20,13 +19,21 @@ class GreeksCalculator:
         :param t: Time to Expiration (in years)
         :param r: Risk-free Interest Rate
         :param flag: 'c' for Call, 'p' for Put
-        :return: Implied Volatility (sigma)
+        :return: Implied Volatility (sigma), 0.0 if it cannot be solved (see calculate_chain_iv for the reason)
         """
-        try:
-            return implied_volatility(price, S, K, t, r, flag)
-        except Exception as e:
-            # print(f"Error calculating IV: {e}")
-            return 0.0
+        iv, status = BlackScholes.implied_volatility(price, S, K, t, r, flag)
+        return float(iv) if status == IV_OK else 0.0
+
+    @staticmethod
+    def calculate_chain_iv(price, S, K, t, r, flag):
+        """
+        Implied Volatility for a whole chain (or any arrays) in one vectorized solve.
+
+        :param flag: 'c'/'p' per option (also 'CE'/'PE')
+        :return: (iv array, status array); status is a BlackScholes IV_* code (IV_STATUS names them)
+                 and iv is NaN where no volatility reproduces the price
+        """
+        return BlackScholes.implied_volatility(price, S, K, t, r, flag)
 
     @staticmethod
     def calculate_greeks(S, K, t, r, sigma, flag):
@@ -41,32 +48,30 @@ class GreeksCalculator:
         :param flag: 'c' for Call, 'p' for Put
         :return: Dictionary of Greeks
         """
-        try:
-            d = delta(flag, S, K, t, r, sigma)
-            g = gamma(flag, S, K, t, r, sigma)
-            th = theta(flag, S, K, t, r, sigma)
-            v = vega(flag, S, K, t, r, sigma)
-            rh = rho(flag, S, K, t, r, sigma)
-            
-            return {
-                "delta": d,
-                "gamma": g,
-                "theta": th,
-                "vega": v,
-                "rho": rh
-            }
-        except Exception as e:
-            # print(f"Error calculating Greeks: {e}")
+        with np.errstate(invalid='ignore', divide='ignore'):
+            greeks = BlackScholes.greeks(S, K, t, r, sigma, flag, greeks=("delta", "gamma", "theta", "vega", "rho"))
+        if any(not np.isfinite(value) for value in greeks.values()):
+            # Invalid inputs (e.g. non-positive price or strike)
             return {
                 "delta": 0, "gamma": 0, "theta": 0, "vega": 0, "rho": 0
             }
+        return {name: float(value) for name, value in greeks.items()}
+
+    @staticmethod
+    def calculate_chain_greeks(S, K, t, r, sigma, flag, greeks=GREEKS):
+        """
+        Price and first/second-order Greeks for a whole chain (or any arrays) in one vectorized call.
+        Same units as calculate_greeks (see BlackScholes).
+
+        :param flag: 'c'/'p' per option (also 'CE'/'PE')
+        :return: Dictionary of arrays
+        """
+        return BlackScholes.greeks(S, K, t, r, sigma, flag, greeks)
 
     @staticmethod
-    def get_days_to_expiry(expiry_date):
+    def get_days_to_expiry(expiry_date, now=None):
         """
-        Calculate days to expiry from a date string.
+        Time to expiry in years (to the expiry-day close, 0 once expired) from a date string or array
+        of them (see ExpiryCalendar.years_to_expiry).
         """
-        from datetime import datetime
-        today = datetime.now()
-        exp = datetime.strptime(expiry_date, "%Y-%m-%d")
-        return (exp - today).days / 365.0
+        return ExpiryCalendar.years_to_expiry(pd.Timestamp.now() if now is None else now, expiry_date)
@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+
+class IndicatorKernels:
+    """
+    Vectorized indicator kernels over contiguous float64 arrays.
+
+    Every kernel is a single pass of cumulative sums or a linear IIR filter (no per-row
+    or per-day Python code) and reproduces the `ta` / pandas definitions used by
+    TechnicalIndicators, including their warm-up NaNs.
+    """
+
+    @staticmethod
+    def session_starts(dates):
+        """
+        Boolean array marking the first bar of each calendar day.
+        Tz-aware dates are taken in their own local wall time.
+        """
+        dates = pd.DatetimeIndex(dates)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        days = dates.values.astype('datetime64[D]')
+        starts = np.empty(len(days), dtype=bool)
+        starts[:1] = True
+        starts[1:] = days[1:] != days[:-1]
+        return starts
+
+    @staticmethod
+    def session_cumsum(values, starts):
+        """
+        Cumulative sum that restarts at every True in `starts` (one pass, no groupby).
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return values.copy()
+        idx = np.flatnonzero(starts)
+        if len(idx) == 0 or idx[0] != 0:
+            idx = np.concatenate([[0], idx])
+        # One zero-padded row per session, cumulated along the rows: each session's sums are its own
+        # additions from 0, independent of earlier sessions (no precision loss over years, and a
+        # frame starting at any session start gives bit-identical values)
+        lengths = np.diff(np.append(idx, len(values)))
+        rows = np.repeat(np.arange(len(idx)), lengths)
+        cols = np.arange(len(values)) - np.repeat(idx, lengths)
+        grid = np.zeros((len(idx), lengths.max()))
+        grid[rows, cols] = values
+        np.cumsum(grid, axis=1, out=grid)
+        return grid[rows, cols]
+
+    @staticmethod
+    def vwap(high, low, close, volume, starts=None):
+        """
+        VWAP of the typical price, reset at each session start (None = one cumulative session).
+        """
+        tp = (np.asarray(high, dtype=np.float64) + low + close) / 3
+        volume = np.asarray(volume, dtype=np.float64)
+        if starts is None:
+            cum_pv, cum_v = np.cumsum(tp * volume), np.cumsum(volume)
+        else:
+            cum_pv = IndicatorKernels.session_cumsum(tp * volume, starts)
+            cum_v = IndicatorKernels.session_cumsum(volume, starts)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return cum_pv / cum_v
+
+    @staticmethod
+    def ewm(values, alpha, min_periods=0):
+        """
+        `Series.ewm(alpha=alpha, adjust=False).mean()` as a first-order IIR filter.
+        Series with NaNs go through pandas, whose NaN weighting has no closed filter form.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return values.copy()
+        if np.isnan(values).any():
+            out = pd.Series(values).ewm(alpha=alpha, adjust=False).mean().to_numpy(copy=True)
+            valid = np.cumsum(~np.isnan(values))
+        else:
+            # y[0] = x[0]; y[t] = (1 - alpha) * y[t-1] + alpha * x[t]
+            out, _ = lfilter([alpha], [1.0, alpha - 1.0], values, zi=[(1.0 - alpha) * values[0]])
+            valid = np.arange(1, len(values) + 1)
+        out[valid < max(min_periods, 1)] = np.nan
+        return out
+
+    @staticmethod
+    def ema(values, period):
+        """
+        ta.trend.ema_indicator: span=`period`, adjust=False, NaN for the first period - 1 values.
+        """
+        return IndicatorKernels.ewm(values, 2.0 / (period + 1), min_periods=period)
+
+    @staticmethod
+    def rsi(close, period=14):
+        """
+        ta.momentum.rsi: Wilder smoothing (alpha=1/period) of gains and losses.
+        """
+        close = np.asarray(close, dtype=np.float64)
+        diff = np.diff(close, prepend=np.nan)
+        up = np.where(diff > 0, diff, 0.0)
+        down = np.where(diff < 0, -diff, 0.0)
+        ema_up = IndicatorKernels.ewm(up, 1.0 / period, min_periods=period)
+        ema_down = IndicatorKernels.ewm(down, 1.0 / period, min_periods=period)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(ema_down == 0, 100.0, 100 - 100 / (1 + ema_up / ema_down))
+
+    @staticmethod
+    def _window_sums(values, period, origin=None):
+        """
+        Trailing-window sum, sum of squares and NaN count for every full window, from cumulative sums.
+        Values are centred on `origin` first so the running totals (and the cancellation in the
+        variance) stay small. The default origin is the first valid value: each window then depends
+        only on the values up to its end, so appending values leaves earlier windows bit-identical.
+        """
+        values = np.asarray(values, dtype=np.float64)
+
+        def trailing(a):
+            c = np.cumsum(a)
+            out = c[period - 1:].copy()
+            out[1:] -= c[:-period]
+            return out
+
+        nan = np.isnan(values)
+        if origin is None:
+            origin = values[np.argmin(nan)] if not nan.all() else 0.0
+        if not nan.any():
+            x = values - origin
+            return trailing(x), trailing(x * x), np.zeros(len(values) - period + 1), origin
+        x = np.where(nan, 0.0, values - origin)
+        return trailing(x), trailing(x * x), trailing(nan.astype(np.float64)), origin
+
+    @staticmethod
+    def sma(values, period, origin=None):
+        """
+        Rolling mean with min_periods=period (windows containing NaN are NaN).
+        :param origin: Centring value of the running sums (default: the first valid value, see _window_sums)
+        """
+        out = np.full(len(values), np.nan)
+        if len(values) >= period:
+            s1, _, nans, ref = IndicatorKernels._window_sums(values, period, origin)
+            out[period - 1:] = s1 / period + ref
+            out[period - 1:][nans > 0] = np.nan
+        return out
+
+    @staticmethod
+    def rolling_std(values, period, ddof=1, origin=None):
+        """
+        Rolling std with min_periods=period (windows containing NaN are NaN).
+        :param origin: Centring value of the running sums (default: the first valid value, see _window_sums)
+        """
+        out = np.full(len(values), np.nan)
+        if len(values) >= period:
+            s1, s2, nans, _ = IndicatorKernels._window_sums(values, period, origin)
+            var = np.maximum((s2 - s1 * s1 / period) / (period - ddof), 0.0)
+            out[period - 1:] = np.sqrt(var)
+            out[period - 1:][nans > 0] = np.nan
+        return out
+
+    @staticmethod
+    def bollinger(values, period=20, std_dev=2):
+        """
+        ta.volatility.BollingerBands: SMA -/+ std_dev * population std. Returns (high band, low band).
+        """
+        mavg = IndicatorKernels.sma(values, period)
+        mstd = IndicatorKernels.rolling_std(values, period, ddof=0)
+        return mavg + std_dev * mstd, mavg - std_dev * mstd
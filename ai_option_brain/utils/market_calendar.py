@@ -0,0 +1,112 @@
+import warnings
+import numpy as np
+import pandas as pd
+from datetime import time
+
+
+class NSECalendar:
+    """
+    NSE cash/F&O session calendar (weekends, exchange holidays, 09:15-15:30 IST session).
+    Timestamps are handled as timezone-naive IST.
+    """
+
+    SESSION_OPEN = time(9, 15)
+    SESSION_CLOSE = time(15, 30)
+    MINUTES_PER_SESSION = 375
+
+    # NSE trading holidays (equity segment). Update from the NSE circular each December.
+    HOLIDAYS = pd.to_datetime([
+        # 2023
+        "2023-01-26", "2023-03-07", "2023-03-30", "2023-04-04", "2023-04-07", "2023-04-14",
+        "2023-05-01", "2023-06-29", "2023-08-15", "2023-09-19", "2023-10-02", "2023-10-24",
+        "2023-11-14", "2023-11-27", "2023-12-25",
+        # 2024
+        "2024-01-22", "2024-01-26", "2024-03-08", "2024-03-25", "2024-03-29", "2024-04-11",
+        "2024-04-17", "2024-05-01", "2024-05-20", "2024-06-17", "2024-07-17", "2024-08-15",
+        "2024-10-02", "2024-11-01", "2024-11-15", "2024-11-20", "2024-12-25",
+        # 2025
+        "2025-02-26", "2025-03-14", "2025-03-31", "2025-04-10", "2025-04-14", "2025-04-18",
+        "2025-05-01", "2025-08-15", "2025-08-27", "2025-10-02", "2025-10-21", "2025-10-22",
+        "2025-11-05", "2025-12-25",
+        # 2026
+        "2026-01-15", "2026-01-26", "2026-03-03", "2026-03-26", "2026-03-31", "2026-04-03",
+        "2026-04-14", "2026-05-01", "2026-05-28", "2026-06-26", "2026-09-14", "2026-10-02",
+        "2026-10-20", "2026-11-10", "2026-11-24", "2026-12-25",
+    ])
+
+    @staticmethod
+    def to_ist_naive(dates):
+        """
+        Converts a datetime Series/Index (tz-aware or naive IST) to timezone-naive IST.
+        """
+        dates = pd.to_datetime(dates)
+        tz = dates.dt.tz if isinstance(dates, pd.Series) else dates.tz
+        if tz is None:
+            return dates
+        if isinstance(dates, pd.Series):
+            return dates.dt.tz_convert("Asia/Kolkata").dt.tz_localize(None)
+        return dates.tz_convert("Asia/Kolkata").tz_localize(None)
+
+    @classmethod
+    def trading_days(cls, start, end):
+        """
+        Trading days between start and end (inclusive) as a DatetimeIndex at midnight.
+        """
+        days = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq="D")
+        days = days[days.dayofweek < 5]
+        return days[~days.isin(cls.HOLIDAYS)]
+
+    @classmethod
+    def check_holidays(cls, first_year, last_year):
+        """
+        Warns when any year in first_year..last_year is outside HOLIDAYS: days of such a year are
+        treated as trading days unless they fall on a weekend.
+        """
+        covered = set(cls.HOLIDAYS.year)
+        missing = [year for year in range(first_year, last_year + 1) if year not in covered]
+        if missing:
+            warnings.warn(f"NSE holiday table covers {min(covered)}-{max(covered)}, not {missing}: only "
+                          f"weekends are treated as non-trading days there", stacklevel=3)
+
+    @classmethod
+    def is_trading_day(cls, day):
+        day = pd.Timestamp(day).normalize()
+        return day.dayofweek < 5 and day not in cls.HOLIDAYS
+
+    @classmethod
+    def session_minutes(cls, start, end):
+        """
+        Expected 1-minute bar timestamps (09:15 ... 15:29) between start and end (inclusive).
+        """
+        days = cls.trading_days(start, end).values.astype("datetime64[ns]")
+        open_offset = np.timedelta64(cls.SESSION_OPEN.hour * 60 + cls.SESSION_OPEN.minute, "m")
+        offsets = open_offset + np.arange(cls.MINUTES_PER_SESSION).astype("timedelta64[m]")
+        minutes = pd.DatetimeIndex((days[:, None] + offsets[None, :]).ravel())
+        return minutes[(minutes >= pd.Timestamp(start)) & (minutes <= pd.Timestamp(end))]
+
+    @classmethod
+    def find_gaps(cls, dates, interval="minute", start=None, end=None):
+        """
+        Compares stored bar timestamps against the session calendar.
+        :param dates: Bar timestamps (tz-aware or naive IST)
+        :param interval: 'minute' checks every session minute, anything else checks trading days
+        :return: DataFrame ['day', 'missing'] with one row per day that has missing bars
+        """
+        dates = pd.DatetimeIndex(cls.to_ist_naive(pd.Series(dates)))
+        if dates.empty:
+            return pd.DataFrame(columns=["day", "missing"])
+        start = pd.Timestamp(start) if start is not None else dates.min()
+        end = pd.Timestamp(end) if end is not None else dates.max()
+
+        if interval == "minute":
+            expected = cls.session_minutes(start, end)
+            actual = dates.floor("min")
+        else:
+            expected = cls.trading_days(start, end)
+            actual = dates.normalize()
+
+        missing = pd.DatetimeIndex(np.setdiff1d(expected.values, actual.values))
+        if missing.empty:
+            return pd.DataFrame(columns=["day", "missing"])
+        counts = pd.Series(1, index=missing.normalize()).groupby(level=0).sum()
+        return pd.DataFrame({"day": counts.index, "missing": counts.values})
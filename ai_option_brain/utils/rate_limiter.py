@@ -0,0 +1,48 @@
+import time
+import threading
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket used to keep concurrent API calls under a request-rate limit.
+    """
+
+    def __init__(self, rate, capacity=1):
+        """
+        :param rate: Tokens added per second (sustained requests/second)
+        :param capacity: Maximum burst size. 1 spaces requests evenly at 1/rate seconds.
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, tokens=1):
+        """
+        Blocks until `tokens` are available, then consumes them.
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def try_acquire(self, tokens=1):
+        """
+        Non-blocking variant: consumes `tokens` and returns True if available, else returns False.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
@@ -0,0 +1,261 @@
+import numpy as np
+import pandas as pd
+
+
+class RealizedVolatility:
+    """
+    Forward realized volatility (the training label) from prefix sums of returns and squared returns.
+
+    One pass of cumulative sums serves every horizon, each in O(n), instead of pandas'
+    generic custom-indexer rolling path (`rolling(FixedForwardWindowIndexer(w)).std()`).
+    The sums can be carried from one slice of a series into the next (advance), so chunked
+    computations give bit-identical results to a single pass.
+    """
+
+    @staticmethod
+    def _prefix(a, origin=0.0):
+        out = np.empty(len(a) + 1)
+        out[0] = origin
+        out[1:] = a
+        return np.cumsum(out, out=out)
+
+    @staticmethod
+    def prefix_sums(values, squares=True, origin=None):
+        """
+        Prefix sums (starting with the origin) of the values and, if `squares`, of their squares. NaNs count as 0.
+        Without `origin` the values are centred on their mean so the running totals stay small and
+        window differences do not cancel badly.
+        :param origin: Running (sum, square sum) of the values before values[0] (see advance): the sums
+                       continue those of the longer series with the same additions, so slices of it give
+                       bit-identical window statistics. Not centred (the mean would depend on the slice).
+        :return: (sum prefix, square prefix or None, leading NaN count, NaN-count prefix or None
+                  when there are no NaNs after the leading run)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        nan = np.isnan(values)
+        lead = int(np.argmin(nan)) if not nan.all() else n  # leading NaNs (e.g. the first log return)
+        gaps = nan[lead:].any()
+        ref = values[~nan].mean() if squares and origin is None and lead < n else 0.0
+        if gaps:
+            x = np.where(nan, 0.0, values - ref)
+        else:
+            x = values - ref
+            x[:lead] = 0.0
+        c1_origin, c2_origin = origin if origin is not None else (0.0, 0.0)
+        c1 = RealizedVolatility._prefix(x, c1_origin)
+        c2 = RealizedVolatility._prefix(np.multiply(x, x, out=x), c2_origin) if squares else None
+        nan_count = RealizedVolatility._prefix(nan.astype(np.float64)) if gaps else None
+        return c1, c2, lead, nan_count
+
+    @staticmethod
+    def _window(sums, w, var):
+        """
+        Variance (ddof=1) if `var` else mean of every w-bar window, one value per window start
+        (n - w + 1 values); NaN for windows holding a NaN.
+        """
+        c1, c2, lead, nan_count = sums
+        s1 = c1[w:] - c1[:-w]
+        if var:
+            out = c2[w:] - c2[:-w]
+            s1 *= s1
+            s1 /= w
+            out -= s1
+            out /= (w - 1)
+            np.maximum(out, 0.0, out=out)
+        else:
+            out = s1
+            out /= w
+        out[:lead] = np.nan
+        if nan_count is not None:
+            out[nan_count[w:] - nan_count[:-w] > 0] = np.nan
+        return out
+
+    @staticmethod
+    def forward_std(values, windows, sums=None):
+        """
+        Std (ddof=1) of values[i : i + w] at every i for each window w, like
+        `rolling(FixedForwardWindowIndexer(w)).std()`: NaN where the window runs past the end
+        or contains a NaN.
+        :param windows: {name: window in bars}
+        :param sums: prefix_sums of the values (default: computed here)
+        :return: {name: float64 array}
+        """
+        n = len(values)
+        sums = RealizedVolatility.prefix_sums(values) if sums is None else sums
+        out = {}
+        for name, w in windows.items():
+            std = np.full(n, np.nan)
+            if n >= w:
+                np.sqrt(RealizedVolatility._window(sums, w, var=True), out=std[:n - w + 1])
+            out[name] = std
+        return out
+
+    @staticmethod
+    def trailing_std(values, windows, sums=None):
+        """
+        Std (ddof=1) of values[i - w + 1 : i + 1] at every i for each window w, like `rolling(w).std()`:
+        NaN until the window is full and while it holds a NaN.
+        :param windows: {name: window in bars}
+        :param sums: prefix_sums of the values (default: computed here)
+        :return: {name: float64 array}
+        """
+        n = len(values)
+        sums = RealizedVolatility.prefix_sums(values) if sums is None else sums
+        out = {}
+        for name, w in windows.items():
+            std = np.full(n, np.nan)
+            if n >= w:
+                np.sqrt(RealizedVolatility._window(sums, w, var=True), out=std[w - 1:])
+            out[name] = std
+        return out
+
+    @staticmethod
+    def forward_rv(log_ret, horizons, annualisation=252 * 375, sums=None):
+        """
+        Annualised forward realized volatility (in %) of 1-min log returns for several horizons at once.
+        :param horizons: {column name: horizon in bars}, e.g. {'target_rv': 1875} for 5 days
+        :param sums: prefix_sums of log_ret (default: computed here)
+        """
+        scale = np.sqrt(annualisation) * 100
+        out = RealizedVolatility.forward_std(log_ret, horizons, sums)
+        for std in out.values():
+            std *= scale
+        return out
+
+    # Estimators of `estimators`: close-to-close, Parkinson, Garman-Klass, Rogers-Satchell, Yang-Zhang
+    ESTIMATORS = ('cc', 'parkinson', 'gk', 'rs', 'yz')
+    # Per-bar series (bar_terms) whose prefix sums each estimator uses; the VARIANCE_TERMS also need squares
+    ESTIMATOR_TERMS = {'cc': ('ret',), 'parkinson': ('parkinson',), 'gk': ('gk',), 'rs': ('rs',),
+                       'yz': ('gap', 'body', 'rs')}
+    VARIANCE_TERMS = ('ret', 'gap', 'body')
+
+    @staticmethod
+    def periods_per_year(dates, trading_days=252, session_minutes=375):
+        """
+        Annualisation factor from the bar spacing (median step of the first 10000 bars): intraday
+        bars count session_minutes / step per day, daily bars one per trading day.
+        """
+        dates = pd.DatetimeIndex(dates[:10000])
+        if len(dates) < 2:
+            raise ValueError("need at least two bars to infer the bar frequency")
+        step = pd.Timedelta(np.median(np.diff(dates.asi8)), unit='ns')
+        if step < pd.Timedelta(days=1):
+            return trading_days * session_minutes / (step / pd.Timedelta(minutes=1))
+        if step == pd.Timedelta(days=1):
+            return trading_days
+        raise ValueError(f"unsupported bar frequency: {step} (intraday or daily bars)")
+
+    @staticmethod
+    def estimators(df, windows, periods_per_year=None, estimators=ESTIMATORS, carry=None):
+        """
+        Trailing-window volatility estimators for every window from one set of prefix sums.
+        Annualised in %, like the hv_* features. A window is NaN until it holds `w` valid bars.
+          cc        close-to-close std of log returns (ddof=1, same as hv_*)
+          parkinson mean (ln H/L)^2 / (4 ln 2)
+          gk        mean 0.5 (ln H/L)^2 - (2 ln 2 - 1)(ln C/O)^2
+          rs        mean ln(H/O) ln(H/C) + ln(L/O) ln(L/C)
+          yz        var(ln O/C_prev) + k var(ln C/O) + (1 - k) rs, k = 0.34 / (1.34 + (w + 1) / (w - 1))
+        :param df: 'open', 'high', 'low', 'close' (and 'date' when periods_per_year is None)
+        :param windows: {label: window in bars} or a list of windows; columns are f"{estimator}_{label}"
+        :param periods_per_year: Bars per year (None = inferred from 'date' with periods_per_year)
+        :param carry: State of the bars before df (advance; {} = df starts the series): the prefix sums
+                      continue those of the longer series, so a slice reproduces its values exactly
+        """
+        unknown = set(estimators) - set(RealizedVolatility.ESTIMATORS)
+        if unknown:
+            raise ValueError(f"unknown estimators: {sorted(unknown)}")
+        if not isinstance(windows, dict):
+            windows = {str(w): w for w in windows}
+        if periods_per_year is None:
+            periods_per_year = RealizedVolatility.periods_per_year(df['date'])
+        scale = np.sqrt(periods_per_year) * 100
+        wanted = set(estimators)
+        terms = RealizedVolatility.bar_terms(
+            df, {t for est in estimators for t in RealizedVolatility.ESTIMATOR_TERMS[est]},
+            np.nan if carry is None else carry.get('close', np.nan))
+        n = len(df)
+        sums = {name: RealizedVolatility.prefix_sums(values, name in RealizedVolatility.VARIANCE_TERMS,
+                                                     None if carry is None else carry.get(name, (0.0, 0.0)))
+                for name, values in terms.items()}
+        del terms
+
+        # One (columns, rows) block: the DataFrame wraps it without a per-column copy
+        columns = [f"{est}_{label}" for label in windows for est in estimators]
+        out = np.empty((len(columns), n))
+        rows = iter(out)
+        for label, w in windows.items():
+            if n < w:
+                for _ in estimators:
+                    next(rows)[:] = np.nan
+                continue
+            var = {name: RealizedVolatility._window(sums[name], w, var=name in RealizedVolatility.VARIANCE_TERMS)
+                   for name in sums}
+            if 'yz' in wanted:
+                k = 0.34 / (1.34 + (w + 1) / (w - 1))
+                yz = var['body'] * k
+                yz += var['gap']
+                yz += (1 - k) * var['rs']
+                var['yz'] = yz
+            var['cc'] = var.get('ret')
+            for est in estimators:
+                # Window sums are per window start; the estimate belongs to the window's last bar
+                row = next(rows)
+                row[:w - 1] = np.nan
+                col = row[w - 1:]
+                np.maximum(var[est], 0.0, out=col)
+                np.sqrt(col, out=col)
+                col *= scale
+        return pd.DataFrame(out.T, index=df.index, columns=columns, copy=False)
+
+    @staticmethod
+    def bar_terms(df, names, prev_close=np.nan):
+        """
+        Per-bar series behind the estimators' prefix sums, for the given names:
+          ret        ln(C / C_prev) (the 1-min log return)
+          gap, body  ln O - ln C_prev, ln C - ln O
+          parkinson  (ln H/L)^2 / (4 ln 2)
+          gk         0.5 (ln H/L)^2 - (2 ln 2 - 1)(ln C/O)^2
+          rs         ln(H/O) ln(H/C) + ln(L/O) ln(L/C)
+        :param prev_close: Close before the first bar (NaN = none: the first ret and gap are NaN)
+        """
+        names = set(names)
+        close = np.asarray(df['close'], dtype=np.float64)
+        prev = np.concatenate([[prev_close], close[:-1]])
+        out = {}
+        if 'ret' in names:
+            out['ret'] = np.log(close / prev)
+        if names - {'ret'}:
+            o, h, l = (np.log(np.asarray(df[col], dtype=np.float64)) for col in ('open', 'high', 'low'))
+            c = np.log(close)
+            body = c - o
+            hl2 = (h - l) ** 2
+            if 'gap' in names:
+                out['gap'] = o - np.log(prev)
+            if 'body' in names:
+                out['body'] = body
+            if 'parkinson' in names:
+                out['parkinson'] = hl2 / (4 * np.log(2))
+            if 'gk' in names:
+                out['gk'] = 0.5 * hl2 - (2 * np.log(2) - 1) * body * body
+            if 'rs' in names:
+                out['rs'] = (h - o) * (h - c) + (l - o) * (l - c)
+        return out
+
+    @staticmethod
+    def advance(carry, df, names):
+        """
+        State after the bars of df for continuing prefix sums into the bars that follow: the last close
+        and the running (sum, square sum) of each bar_terms series in `names`. Chunked computations pass
+        it as `origin` / `carry` so every chunk makes the same additions as one pass over the whole series.
+        :param carry: State before df (None = df starts the series)
+        """
+        carry = dict(carry or {})
+        if not len(df):
+            return carry
+        for name, values in RealizedVolatility.bar_terms(df, names, carry.get('close', np.nan)).items():
+            c1, c2, _, _ = RealizedVolatility.prefix_sums(values, name in RealizedVolatility.VARIANCE_TERMS,
+                                                          carry.get(name, (0.0, 0.0)))
+            carry[name] = (float(c1[-1]), float(c2[-1]) if c2 is not None else 0.0)
+        carry['close'] = float(np.asarray(df['close'], dtype=np.float64)[-1])
+        return carry
@@ -0,0 +1,130 @@
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from .market_calendar import NSECalendar
+
+NS_PER_MINUTE = 60_000_000_000
+
+OHLCV_AGG = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+
+
+class SessionResampler:
+    """
+    OHLCV resampling of 1-min bars on the NSE session grid (NSECalendar: trading days, 09:15-15:30).
+
+    Intraday buckets start at the session open like Kite's candles: 60minute bars are 09:15, 10:15, ...,
+    15:15 (a 15-minute last bar), never clock hours that split the open and close. 'day' is one bar per
+    session, labelled at midnight. Bars are labelled with their bucket start.
+
+    The minute -> bucket map of the session grid is built once per (interval, first day, last day) and
+    cached, so every symbol over the same date range reuses it: resampling is a lookup of the bar
+    minutes in the grid and a reduce over the bucket boundaries, with no per-symbol pandas resample.
+    Minutes outside the session grid (pre-open, holidays) are dropped.
+    """
+
+    @staticmethod
+    def bucket_minutes(interval):
+        """
+        Bucket length in minutes for a Kite interval ('5minute', 'day') or pandas offset ('15min', '1h', '1D').
+        Daily buckets are a whole session. Raises ValueError for anything else (e.g. weekly).
+        """
+        if interval in ('day', 'D', '1D', '1d'):
+            return NSECalendar.MINUTES_PER_SESSION
+        if interval == 'minute':
+            return 1
+        if isinstance(interval, str) and interval.endswith('minute'):
+            interval = f"{interval[:-len('minute')]}min"
+        try:
+            minutes = pd.Timedelta(interval) / pd.Timedelta(minutes=1)
+        except ValueError:
+            raise ValueError(f"unsupported session interval: {interval!r}") from None
+        if minutes != int(minutes) or not 1 <= minutes <= NSECalendar.MINUTES_PER_SESSION:
+            raise ValueError(f"unsupported session interval: {interval!r}")
+        return int(minutes)
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _grid(minutes, first_day, last_day):
+        """
+        Session minutes of [first_day, last_day] (int64 minutes since epoch), the bucket of each one
+        and the bucket start labels.
+        """
+        grid = NSECalendar.session_minutes(first_day, last_day + pd.Timedelta(days=1) - pd.Timedelta(minutes=1))
+        grid = grid.asi8 // NS_PER_MINUTE
+        per_session = NSECalendar.MINUTES_PER_SESSION
+        per_day = -(-per_session // minutes)
+        # Bucket number: session index * buckets per session + bucket within the session
+        in_session = np.arange(len(grid)) % per_session
+        bucket = (np.arange(len(grid)) // per_session) * per_day + in_session // minutes
+        starts = np.flatnonzero(in_session % minutes == 0)
+        if minutes == per_session:
+            labels = (grid[starts] // 1440) * 1440
+        else:
+            labels = grid[starts]
+        grid.flags.writeable = bucket.flags.writeable = False
+        return grid, bucket, pd.DatetimeIndex(labels * NS_PER_MINUTE)
+
+    @classmethod
+    def bucket_map(cls, dates, interval):
+        """
+        Bucket of every bar timestamp on the cached session grid.
+        :param dates: Sorted 1-min bar timestamps (naive IST)
+        :return: (bucket per bar, -1 for bars off the session grid; bucket start labels)
+        """
+        minutes = cls.bucket_minutes(interval)
+        dates = pd.DatetimeIndex(dates)
+        if dates.tz is not None:
+            dates = NSECalendar.to_ist_naive(dates)
+        values = dates.as_unit('ns').asi8 // NS_PER_MINUTE
+        if len(values) == 0:
+            return np.empty(0, dtype=np.int64), pd.DatetimeIndex([])
+        first_day = pd.Timestamp(values[0] * NS_PER_MINUTE).normalize()
+        last_day = pd.Timestamp(values[-1] * NS_PER_MINUTE).normalize()
+        grid, bucket, labels = cls._grid(minutes, first_day, last_day)
+        if len(values) == len(grid) and np.array_equal(values, grid):
+            return bucket, labels  # complete sessions: the grid itself
+        if len(grid) == 0:
+            return np.full(len(values), -1), labels
+        pos = np.searchsorted(grid, values)
+        pos[pos == len(grid)] = 0
+        return np.where(grid[pos] == values, bucket[pos], -1), labels
+
+    @classmethod
+    def resample(cls, df, interval, agg=OHLCV_AGG):
+        """
+        Resamples 1-min bars to session-aligned `interval` bars.
+        :param df: 'date' column (or DatetimeIndex) sorted ascending and the columns of `agg`
+        :param agg: {column: 'first' | 'max' | 'min' | 'last' | 'sum'}; columns missing from df are skipped
+        :return: DataFrame with 'date' (bucket start) and the aggregated columns, one row per non-empty bucket
+        """
+        dates = df.index if isinstance(df.index, pd.DatetimeIndex) else df['date']
+        agg = {col: how for col, how in agg.items() if col in df.columns}
+        buckets, labels = cls.bucket_map(dates, interval)
+        keep = np.flatnonzero(buckets >= 0)
+        if len(keep) < len(buckets):
+            buckets = buckets[keep]
+        else:
+            keep = None
+        if len(buckets) == 0:
+            return pd.DataFrame({'date': pd.DatetimeIndex([]), **{col: [] for col in agg}})
+
+        first = np.flatnonzero(np.diff(buckets, prepend=-2))
+        last = np.append(first[1:], len(buckets)) - 1
+        out = {'date': labels[buckets[first]].as_unit(pd.DatetimeIndex(dates).unit)}
+        for col, how in agg.items():
+            values = np.asarray(df[col])
+            if keep is not None:
+                values = values[keep]
+            if how == 'first':
+                out[col] = values[first]
+            elif how == 'last':
+                out[col] = values[last]
+            elif how == 'max':
+                out[col] = np.maximum.reduceat(values, first)
+            elif how == 'min':
+                out[col] = np.minimum.reduceat(values, first)
+            elif how == 'sum':
+                out[col] = np.add.reduceat(values, first)
+            else:
+                raise ValueError(f"unsupported aggregation {how!r} for {col}")
+        return pd.DataFrame(out)
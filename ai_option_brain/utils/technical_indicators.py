@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
-import ta
+from .indicator_kernels import IndicatorKernels
+from .session_resampler import SessionResampler, OHLCV_AGG
 
 class TechnicalIndicators:
     """
@@ -13,33 +14,20 @@ class TechnicalIndicators:
         """
         Calculates Volume Weighted Average Price (VWAP).
         Expects a DataFrame with 'high', 'low', 'close', 'volume' columns.
-        VWAP is typically reset daily for intraday charts.
+        VWAP is reset daily (session boundaries from the DatetimeIndex or 'date' column);
+        without date info it is cumulative over the whole frame. The input frame is not modified.
         """
         try:
-            # Typical Price
-            df['tp'] = (df['high'] + df['low'] + df['close']) / 3
-            # VWAP = Cumulative(TP * Volume) / Cumulative(Volume)
-            # Grouping by Date to reset VWAP daily if data spans multiple days
-            # Assuming 'date' is the index or a column. If index is datetime:
-            
-            # Create a copy to avoid SettingWithCopy warnings on the original df
-            df = df.copy()
-            
             if isinstance(df.index, pd.DatetimeIndex):
-                df['date_only'] = df.index.date
+                starts = IndicatorKernels.session_starts(df.index)
             elif 'date' in df.columns:
-                df['date_only'] = pd.to_datetime(df['date']).dt.date
+                starts = IndicatorKernels.session_starts(pd.to_datetime(df['date']))
             else:
-                # If no date info, calculate cumulative for the whole dataset
-                df['cum_vol'] = df['volume'].cumsum()
-                df['cum_vol_price'] = (df['tp'] * df['volume']).cumsum()
-                return df['cum_vol_price'] / df['cum_vol']
+                starts = None
 
-            # Group by day for intraday VWAP
-            df['cum_vol'] = df.groupby('date_only')['volume'].cumsum()
-            df['cum_vol_price'] = df.groupby('date_only').apply(lambda x: (x['tp'] * x['volume']).cumsum()).reset_index(level=0, drop=True)
-            
-            return df['cum_vol_price'] / df['cum_vol']
+            vwap = IndicatorKernels.vwap(df['high'].values, df['low'].values, df['close'].values,
+                                         df['volume'].values, starts)
+            return pd.Series(vwap, index=df.index)
             
         except Exception as e:
             print(f"Error calculating VWAP: {e}")
@@ -48,23 +36,23 @@ class TechnicalIndicators:
     @staticmethod
     def calculate_rsi(series, period=14):
         """
-        Calculates Relative Strength Index (RSI).
+        Calculates Relative Strength Index (RSI). Same definition as ta.momentum.rsi.
         """
-        return ta.momentum.rsi(series, window=period)
+        return pd.Series(IndicatorKernels.rsi(series.values, period), index=series.index)
 
     @staticmethod
     def calculate_sma(series, period):
         """
         Calculates Simple Moving Average (SMA).
         """
-        return ta.trend.sma_indicator(series, window=period)
+        return pd.Series(IndicatorKernels.sma(series.values, period), index=series.index)
 
     @staticmethod
     def calculate_ema(series, period):
         """
-        Calculates Exponential Moving Average (EMA).
+        Calculates Exponential Moving Average (EMA). Same definition as ta.trend.ema_indicator.
         """
-        return ta.trend.ema_indicator(series, window=period)
+        return pd.Series(IndicatorKernels.ema(series.values, period), index=series.index)
 
     @staticmethod
     def calculate_bollinger_bands(series, period=20, std_dev=2):
@@ -72,26 +60,28 @@ class TechnicalIndicators:
         Calculates Bollinger Bands.
         Returns (High Band, Low Band)
         """
-        indicator = ta.volatility.BollingerBands(close=series, window=period, window_dev=std_dev)
-        return indicator.bollinger_hband(), indicator.bollinger_lband()
+        hband, lband = IndicatorKernels.bollinger(series.values, period, std_dev)
+        return pd.Series(hband, index=series.index), pd.Series(lband, index=series.index)
 
     @staticmethod
     def resample_data(df, interval):
         """
         Resamples OHLCV data to a different timeframe.
+        Intraday and daily intervals use the NSE session grid (SessionResampler: buckets from the 09:15 open);
+        longer ones (e.g. '1W') fall back to a calendar resample.
         :param df: DataFrame with DatetimeIndex and OHLCV columns
-        :param interval: Pandas offset string (e.g., '15T', '1H', '1D', '1W')
+        :param interval: Kite interval or pandas offset string (e.g., '15minute', '15min', '1h', '1D', '1W')
         """
         try:
-            conversion = {
-                'open': 'first',
-                'high': 'max',
-                'low': 'min',
-                'close': 'last',
-                'volume': 'sum'
-            }
+            try:
+                SessionResampler.bucket_minutes(interval)
+            except ValueError:
+                pass
+            else:
+                return SessionResampler.resample(df, interval).set_index('date')
+
             # Ensure columns exist
-            available_cols = {col: conversion[col] for col in conversion if col in df.columns}
+            available_cols = {col: OHLCV_AGG[col] for col in OHLCV_AGG if col in df.columns}
             
             resampled_df = df.resample(interval).agg(available_cols)
             # Drop rows with NaN (e.g., non-trading hours/days)
@@ -21,9 +21,11 @@ def main():
     
     print(f"Backtesting on {len(tickers)} stocks...")
     
+    # Fetch Data (2 Years, Daily) - cached tickers are reused, the rest come in one bulk request
+    data = dm.fetch_many(tickers, period="2y", interval="1d")
+    
     for ticker in tickers:
-        # Fetch Data (1 Year, Daily)
-        df = dm.fetch_data(ticker, period="2y", interval="1d")
+        df = data.get(ticker)
         
         if df is None or len(df) < 200:
             continue
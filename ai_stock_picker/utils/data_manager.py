@@ -1,20 +1,37 @@
 import yfinance as yf
 import pandas as pd
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, time
+
+# NSE session close (IST). Daily bars for a session are final after this.
+MARKET_CLOSE = time(15, 30)
+MARKET_TZ = "Asia/Kolkata"
+
+# Bar length of intraday intervals, used to decide when a cached intraday file is stale
+INTRADAY_INTERVALS = {
+    "1m": timedelta(minutes=1), "2m": timedelta(minutes=2), "5m": timedelta(minutes=5),
+    "15m": timedelta(minutes=15), "30m": timedelta(minutes=30), "60m": timedelta(hours=1),
+    "90m": timedelta(minutes=90), "1h": timedelta(hours=1),
+}
+
+# Relative change of the overlapping bar's open above which a top-up is on a new adjustment basis
+REBASE_TOLERANCE = 1e-6
 
 class DataManager:
-    def __init__(self, storage_path="data", use_zerodha=False, zerodha_api_key=None):
+    def __init__(self, storage_path="data", use_zerodha=False, zerodha_api_key=None, use_cache=True):
         self.storage_path = storage_path
         self.use_zerodha = use_zerodha
         self.zerodha_api_key = zerodha_api_key
-        
+        self.use_cache = use_cache
+
         if not os.path.exists(self.storage_path):
             os.makedirs(self.storage_path)
 
     def fetch_data(self, ticker, period="1y", interval="1d"):
         """
         Fetches data for a given ticker.
+        Served from the on-disk cache when fresh; a stale cache is topped up with only the newest bars,
+        or refetched in full when a dividend or split has re-adjusted the price history.
         Args:
             ticker (str): Stock symbol (e.g., 'RELIANCE').
             period (str): Data period (e.g., '1y', '5y', 'max').
@@ -27,27 +44,215 @@ class DataManager:
         else:
             return self._fetch_from_yfinance(ticker, period, interval)
 
-    def _fetch_from_yfinance(self, ticker, period, interval):
+    def fetch_many(self, tickers, period="1y", interval="1d"):
+        """
+        Bulk variant of fetch_data.
+        Fresh tickers are read from cache; all remaining tickers are fetched with one
+        multi-ticker yfinance request (plus one top-up request for stale caches, and one full
+        refetch of those whose top-up shows a dividend or split).
+        Args:
+            tickers (list): Stock symbols.
+        Returns:
+            dict: ticker -> pd.DataFrame (None when no data was found).
+        """
+        symbols = {ticker: self._to_yf_symbol(ticker) for ticker in tickers}
+        results = {}
+        missing = []
+        stale = {}
+
+        for ticker, symbol in symbols.items():
+            cached = self._read_cache(symbol, period, interval) if self.use_cache else None
+            if cached is None:
+                missing.append(ticker)
+            elif self._is_fresh(cached, interval):
+                results[ticker] = cached
+            else:
+                stale[ticker] = cached
+
+        if missing:
+            print(f"Fetching {len(missing)} tickers from yfinance (bulk)...")
+            downloaded = self._download([symbols[t] for t in missing], interval, period=period)
+            for ticker in missing:
+                df = downloaded.get(symbols[ticker])
+                if df is None or df.empty:
+                    print(f"Warning: No data found for {symbols[ticker]}")
+                    results[ticker] = None
+                    continue
+                self._write_cache(symbols[ticker], period, interval, df)
+                results[ticker] = df
+
+        if stale:
+            print(f"Topping up {len(stale)} cached tickers from yfinance (bulk)...")
+            start = min(df.index[-1] for df in stale.values())
+            downloaded = self._download([symbols[t] for t in stale], interval, start=start)
+            rebased = [t for t, cached in stale.items() if self._rebased(cached, downloaded.get(symbols[t]))]
+            if rebased:
+                # Dividend / split since the cache was written: its history is on the old price basis
+                print(f"Refetching {len(rebased)} tickers after a corporate action: {rebased}")
+                downloaded.update(self._download([symbols[t] for t in rebased], interval, period=period))
+            for ticker, cached in stale.items():
+                new = downloaded.get(symbols[ticker])
+                if ticker in rebased and new is not None and not new.empty:
+                    df = new
+                else:
+                    df = self._merge(cached, new, period)
+                self._write_cache(symbols[ticker], period, interval, df)
+                results[ticker] = df
+
+        return results
+
+    @staticmethod
+    def _to_yf_symbol(ticker):
         # Append .NS for NSE if not present
         if not ticker.endswith(".NS") and not ticker.endswith(".BO"):
             ticker = f"{ticker}.NS"
-        
-        print(f"Fetching data for {ticker} from yfinance...")
+        return ticker
+
+    def _cache_path(self, ticker, period, interval):
+        return os.path.join(self.storage_path, f"{ticker}_{period}_{interval}.csv")
+
+    def _read_cache(self, ticker, period, interval):
+        file_path = self._cache_path(ticker, period, interval)
+        if not os.path.exists(file_path):
+            return None
+        try:
+            df = pd.read_csv(file_path, index_col=0)
+            df.index = pd.to_datetime(df.index, utc=True).tz_convert(MARKET_TZ)
+            df.index.name = "Date"
+            return df if not df.empty else None
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable cache {file_path}: {e}")
+            return None
+
+    def _write_cache(self, ticker, period, interval, df):
+        df.to_csv(self._cache_path(ticker, period, interval))
+
+    @staticmethod
+    def _is_fresh(df, interval, now=None):
+        """
+        A cache is fresh when no newer bar can exist yet:
+        - intraday: the last bar is younger than one bar length
+        - daily/weekly/monthly: the last bar belongs to the latest completed session
+          (today after 15:30 IST, otherwise the previous weekday)
+        """
+        now = now or pd.Timestamp.now(tz=MARKET_TZ)
+        last = df.index[-1]
+
+        if interval in INTRADAY_INTERVALS:
+            return now - last < INTRADAY_INTERVALS[interval]
+
+        session = now.normalize()
+        if now.time() < MARKET_CLOSE:
+            session -= pd.Timedelta(days=1)
+        while session.dayofweek >= 5:
+            session -= pd.Timedelta(days=1)
+
+        if interval == "1wk":
+            return last.normalize() > session - pd.Timedelta(days=7)
+        if interval in ("1mo", "3mo"):
+            return last.to_period("M") == session.to_period("M")
+        return last.normalize() >= session
+
+    @staticmethod
+    def _period_start(period, end):
+        """
+        Oldest timestamp a rolling period (e.g. '2y', '6mo', '5d') should keep. None = keep all.
+        """
+        units = {"y": "years", "mo": "months", "wk": "weeks", "d": "days"}
+        for suffix, unit in units.items():
+            if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+                return end - pd.DateOffset(**{unit: int(period[:-len(suffix)])})
+        return None
+
+    @staticmethod
+    def _localise(df):
+        if df.index.tz is None:
+            return df.tz_localize(MARKET_TZ)
+        return df.tz_convert(MARKET_TZ)
+
+    @staticmethod
+    def _rebased(cached, new):
+        """
+        True when top-up bars are on a different price basis from the cache. yfinance back-adjusts the
+        whole history for every dividend and split, so a corporate action among the new bars, or a
+        changed open of the last cached bar, means the cached prices are stale and cannot be merged.
+        """
+        if new is None or new.empty:
+            return False
+        new = DataManager._localise(new)
+        last = cached.index[-1]
+        after = new[new.index > last]
+        for column in ("Dividends", "Stock Splits"):
+            if column in after and (after[column].fillna(0) != 0).any():
+                return True
+        overlap = new.loc[new.index == last]
+        if overlap.empty or "Open" not in overlap or "Open" not in cached:
+            return False
+        return abs(overlap["Open"].iloc[0] / cached["Open"].iloc[-1] - 1) > REBASE_TOLERANCE
+
+    def _merge(self, cached, new, period):
+        if new is None or new.empty:
+            return cached
+        df = pd.concat([cached, self._localise(new)])
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+        start = self._period_start(period, df.index[-1])
+        return df[df.index >= start] if start is not None else df
+
+    @staticmethod
+    def _download(symbols, interval, period=None, start=None):
+        """
+        One multi-ticker yfinance request. Returns symbol -> DataFrame in Ticker.history() format.
+        """
+        window = {"start": start} if start is not None else {"period": period}
+        try:
+            raw = yf.download(symbols, interval=interval, group_by="ticker", auto_adjust=True, actions=True,
+                              ignore_tz=False, threads=True, progress=False, **window)
+        except Exception as e:
+            print(f"Error in bulk download: {e}")
+            return {}
+
+        frames = {}
+        for symbol in symbols:
+            if symbol not in raw.columns.get_level_values(0):
+                continue
+            df = raw[symbol].dropna(how="all")
+            if not df.empty:
+                frames[symbol] = DataManager._localise(df)
+        return frames
+
+    def _fetch_from_yfinance(self, ticker, period, interval):
+        ticker = self._to_yf_symbol(ticker)
+
+        cached = self._read_cache(ticker, period, interval) if self.use_cache else None
+        if cached is not None and self._is_fresh(cached, interval):
+            return cached
+
         try:
             stock = yf.Ticker(ticker)
-            df = stock.history(period=period, interval=interval)
-            
+            if cached is not None:
+                # Incremental top-up: only bars from the last cached one onwards
+                print(f"Topping up {ticker} from yfinance...")
+                new = stock.history(start=cached.index[-1], interval=interval)
+                if self._rebased(cached, new):
+                    # Dividend / split since the cache was written: its history is on the old price basis
+                    print(f"Refetching {ticker} after a corporate action...")
+                    df = stock.history(period=period, interval=interval)
+                else:
+                    df = self._merge(cached, new, period)
+            else:
+                print(f"Fetching data for {ticker} from yfinance...")
+                df = stock.history(period=period, interval=interval)
+
             if df.empty:
                 print(f"Warning: No data found for {ticker}")
                 return None
-            
+
             # Save to CSV for caching
-            file_path = os.path.join(self.storage_path, f"{ticker}_{period}_{interval}.csv")
-            df.to_csv(file_path)
+            self._write_cache(ticker, period, interval, df)
             return df
         except Exception as e:
             print(f"Error fetching data for {ticker}: {e}")
-            return None
+            return cached
 
     def _fetch_from_zerodha(self, ticker, period, interval):
         # Placeholder for Zerodha implementation
@@ -1,29 +1,22 @@
 import pandas as pd
 import numpy as np
-import joblib
 import os
 import matplotlib.pyplot as plt
-
-import glob
+from ai_option_brain.bar_store import BarStore
+from ai_option_brain.feature_manifest import load_model
 
 def run_backtest():
-    data_dir = "ai_option_brain/data/processed"
+    store = BarStore()
     model_dir = "ai_option_brain/models"
-    results_dir = "ai_option_brain/results"
-    os.makedirs(results_dir, exist_ok=True)
     
     print("🧪 Starting Mass Backtest (Nifty 50)...")
     print("="*60)
     
     # Scan for all processed training data
-    files = glob.glob(f"{data_dir}/*_training_data.csv")
-    print(f"   Found {len(files)} datasets.")
+    symbols = store.symbols("features")
+    print(f"   Found {len(symbols)} datasets.")
     
-    for file_path in files:
-        # Extract Symbol
-        filename = os.path.basename(file_path)
-        symbol = filename.replace("_training_data.csv", "")
-        
+    for symbol in symbols:
         # 1. Load Data & Model
         model_path = f"{model_dir}/{symbol}_rf_vol.pkl"
         
@@ -31,14 +24,17 @@ def run_backtest():
             print(f"⚠️ Model missing for {symbol}. Skipping.")
             continue
             
-        df = pd.read_csv(file_path)
-        df['date'] = pd.to_datetime(df['date']).dt.tz_localize(None)
-        model = joblib.load(model_path)
+        model, manifest = load_model(model_path)
+        try:
+            manifest.check_params()
+        except ValueError as e:
+            print(f"⚠️ {symbol}: {e}. Retrain the model. Skipping.")
+            continue
         
         # 2. Re-create the STRICT Test Split (Date Based)
-        # Must match training split exactly
+        # Must match training split exactly. Only partitions on/after the split are read.
         split_date = pd.Timestamp("2025-06-01")
-        test_df = df[df['date'] >= split_date].copy()
+        test_df = store.read("features", symbol, start=split_date)
         
         if test_df.empty:
             print(f"⚠️ No test data found for {symbol} after {split_date}")
@@ -48,16 +44,13 @@ def run_backtest():
         print(f"   Period: {test_df['date'].min()} to {test_df['date'].max()}")
         
         # 3. Prepare Features
-        # We need 'trend_dist' for the filter, so let's keep it in test_df but exclude from model input if it wasn't a feature
-        # Actually, trend_dist WAS a feature in training.
-        
-        drop_cols = ['date', 'open', 'high', 'low', 'close', 'volume', 'target_rv', 'log_ret']
-        # features = [c for c in test_df.columns if c not in drop_cols] 
-        # The above line might include 'trend_dist' if it's in the csv.
-        # Let's verify if trend_dist is in the csv.
-        
-        features = [c for c in test_df.columns if c not in drop_cols]
-        X_test = test_df[features]
+        # Exactly the model's manifest columns, in training order ('trend_dist' etc. stay in test_df
+        # for the filter either way). Missing features fail here instead of mispredicting.
+        try:
+            X_test = manifest.frame(test_df)
+        except ValueError as e:
+            print(f"⚠️ {symbol}: {e}. Rebuild features. Skipping.")
+            continue
         
         # 4. Generate Predictions (The "Brain's View")
         test_df['predicted_rv'] = model.predict(X_test)
@@ -123,7 +116,7 @@ def run_backtest():
         print(f"   🔹 Long Win Rate: {long_win_rate:.1f}%")
         
         # Save Results
-        test_df.to_csv(f"{results_dir}/{symbol}_backtest.csv", index=False)
+        store.write("backtest", symbol, test_df)
 
     print("="*60)
     print("🏁 Backtest Complete.")
@@ -0,0 +1,77 @@
+import os
+import time
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from ai_option_brain.bar_store import BarStore
+from ai_option_brain.utils.market_calendar import NSECalendar
+
+def make_bars(start="2023-12-01", end="2025-11-28", seed=0):
+    """
+    Synthetic 1-min OHLCV frame shaped like a Zerodha 2-year pull (tz-aware IST dates).
+    """
+    rng = np.random.default_rng(seed)
+    dates = NSECalendar.session_minutes(start, f"{end} 15:29")
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.0005, len(dates))))
+    spread = np.abs(rng.normal(0, 0.0008, len(dates))) * close
+    return pd.DataFrame({
+        'date': dates.tz_localize("Asia/Kolkata"),
+        'open': close + rng.normal(0, 0.2, len(dates)),
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.integers(100, 50000, len(dates)),
+    })
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+def benchmark():
+    print("⏱️ Benchmark: CSV vs Columnar BarStore (1 symbol, 2 years of 1-min bars)")
+    print("="*60)
+    
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        df = make_bars()
+        csv_path = os.path.join(tmp_dir, "BENCH.NS_2y_1d.csv")
+        df.to_csv(csv_path, index=False)
+        store = BarStore(root=os.path.join(tmp_dir, "store"))
+        store.write("minute", "BENCH", df)
+        
+        csv_mb = os.path.getsize(csv_path) / 1e6
+        store_mb = sum(os.path.getsize(p) for p in store.partitions("minute", "BENCH")) / 1e6
+        print(f"   Rows: {len(df)} | CSV: {csv_mb:.1f} MB | Store: {store_mb:.1f} MB")
+        print("-" * 60)
+        
+        def read_csv():
+            frame = pd.read_csv(csv_path)
+            frame['date'] = pd.to_datetime(frame['date'])
+            return frame
+        
+        cases = [
+            ("CSV (read_csv + to_datetime)", read_csv),
+            ("Store: all columns", lambda: store.read("minute", "BENCH")),
+            ("Store: date + close", lambda: store.read("minute", "BENCH", columns=['close'])),
+            ("Store: last 6 months", lambda: store.read("minute", "BENCH", start="2025-06-01")),
+        ]
+        
+        baseline = None
+        print(f"{'Case':<32} | {'Rows':<8} | {'Time (ms)':<10} | {'Speedup':<8}")
+        print("-" * 60)
+        for name, fn in cases:
+            elapsed, frame = timed(fn)
+            baseline = baseline or elapsed
+            print(f"{name:<32} | {len(frame):<8} | {elapsed*1000:<10.1f} | {baseline/elapsed:>6.1f}x")
+    finally:
+        shutil.rmtree(tmp_dir)
+    
+    print("="*60)
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,73 @@
+import os
+import time
+import shutil
+import tempfile
+import pandas as pd
+from ai_option_brain.bar_store import BarStore
+from ai_option_brain.data_loader import ZerodhaDataFetcher, HISTORICAL_RATE_LIMIT
+from ai_option_brain.harvester import Harvester
+from ai_option_brain.instrument_master import InstrumentMaster
+from ai_option_brain.kite_stub_server import KiteStubServer, DEFAULT_SYMBOLS
+from ai_option_brain.utils.rate_limiter import TokenBucket
+
+FROM_DATE = pd.Timestamp("2024-12-01")
+TO_DATE = pd.Timestamp("2025-11-30 23:59:59")
+
+def make_fetcher(server, cache_dir, max_workers=4):
+    """
+    Fetcher pointed at the stub, with its own limiter so cases do not share a budget.
+    """
+    fetcher = ZerodhaDataFetcher(api_key="stub", access_token="stub", max_workers=max_workers,
+                                 limiter=TokenBucket(rate=HISTORICAL_RATE_LIMIT), root=server.root)
+    fetcher.instruments = InstrumentMaster(fetcher.kite, cache_dir=cache_dir)
+    return fetcher
+
+def run_case(server, name, fn, symbol_years):
+    before = dict(server.stats)
+    t0 = time.perf_counter()
+    rows = fn()
+    elapsed = time.perf_counter() - t0
+    requests = server.stats["requests"] - before["requests"]
+    throttled = server.stats["throttled"] - before["throttled"]
+    errors = server.stats["errors"] - before["errors"]
+    print(f"{name:<30} | {rows:<8} | {requests:<4} | {requests/elapsed:<5.2f} | {throttled:<3} | {errors:<3} | "
+          f"{elapsed:<7.1f} | {elapsed/symbol_years:<6.1f}")
+
+def benchmark(n_symbols=4, latency=0.15, jitter=0.1, error_rate=0.02):
+    print("⏱️ Benchmark: Historical fetch paths against the offline Kite stub")
+    print(f"   Range: {FROM_DATE.date()} → {TO_DATE.date()} (1 symbol-year of minute bars per symbol)")
+    print(f"   Stub: latency {latency*1000:.0f}ms + jitter {jitter*1000:.0f}ms | error rate {error_rate:.0%} | "
+          f"historical limit {HISTORICAL_RATE_LIMIT} req/s")
+    print("="*90)
+
+    tmp_dir = tempfile.mkdtemp()
+    server = KiteStubServer(latency=latency, jitter=jitter, error_rate=error_rate).start()
+    try:
+        fetcher = make_fetcher(server, os.path.join(tmp_dir, "instruments"))
+        token = fetcher.get_instrument_token("RELIANCE")
+        symbols = [s for s in DEFAULT_SYMBOLS if s != "INDIA VIX"][:n_symbols]
+
+        def fetch(workers):
+            return lambda: len(fetcher.fetch_historical_data(token, FROM_DATE, TO_DATE, workers=workers))
+
+        def harvest():
+            store = BarStore(root=os.path.join(tmp_dir, "store"))
+            harvester = Harvester(make_fetcher(server, os.path.join(tmp_dir, "instruments")), store=store,
+                                  manifest_path=os.path.join(tmp_dir, "manifest.json"))
+            harvester.run(symbols, FROM_DATE, TO_DATE, incremental=False, resume=False)
+            return sum(len(store.read("minute", s, columns=['date'])) for s in symbols)
+
+        print(f"{'Case':<30} | {'Rows':<8} | {'Reqs':<4} | {'Req/s':<5} | {'429':<3} | {'5xx':<3} | "
+              f"{'Wall (s)':<7} | {'s/sym-yr':<6}")
+        print("-" * 90)
+        run_case(server, "fetch_historical (sequential)", fetch(1), 1)
+        run_case(server, "fetch_historical (4 workers)", fetch(4), 1)
+        run_case(server, f"Harvester ({n_symbols} symbols)", harvest, n_symbols)
+    finally:
+        server.stop()
+        shutil.rmtree(tmp_dir)
+
+    print("="*90)
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from benchmark_bar_store import timed
+from benchmark_indicators import max_rel_diff
+from ai_option_brain.utils.gex_engine import GEXEngine
+from ai_option_brain.utils.greeks_calculator import GreeksCalculator
+
+# Legacy loop timed on a sample of rows and scaled to the full chain
+LEGACY_SAMPLE = 1000
+
+def make_nifty_chain(spot=25000.0, n_expiries=12, n_strikes=200, step=50, seed=0):
+    """
+    Synthetic multi-expiry NIFTY chain: weekly expiries, n_strikes strikes of each type around spot,
+    a smile in IV and open interest peaking near the money.
+    """
+    rng = np.random.default_rng(seed)
+    today = pd.Timestamp.now().normalize()
+    expiries = [(today + pd.Timedelta(days=7 * (i + 1))).strftime("%Y-%m-%d") for i in range(n_expiries)]
+    strikes = round(spot / step) * step + step * (np.arange(n_strikes) - n_strikes // 2)
+    rows = pd.MultiIndex.from_product([expiries, strikes, ['CE', 'PE']], names=['expiry', 'strike', 'type'])
+    chain = rows.to_frame(index=False)
+    moneyness = np.log(chain['strike'] / spot)
+    chain['iv'] = 0.12 + 0.8 * moneyness ** 2 + rng.uniform(0, 0.01, len(chain))
+    # Put writing concentrated below spot, call writing above (the flip sits below spot)
+    skew = np.where(chain['type'] == 'PE', np.exp(-moneyness / 0.02), np.exp(moneyness / 0.04))
+    chain['oi'] = np.round(rng.uniform(1e4, 1e5, len(chain)) * skew * np.exp(-(moneyness / 0.03) ** 2))
+    return chain
+
+def legacy_days_to_expiry(expiry_date):
+    """
+    The previous GreeksCalculator.get_days_to_expiry: whole days to midnight of the expiry.
+    """
+    return (datetime.strptime(expiry_date, "%Y-%m-%d") - datetime.now()).days / 365.0
+
+def legacy_gex(option_chain_df, spot_price, lot_size=65, r=0.07, years_to_expiry=legacy_days_to_expiry):
+    """
+    The previous GEXEngine.calculate_gex loop: iterrows, a strptime per row and scalar Greeks.
+    """
+    gex_data = []
+    net_gex = 0
+    for index, row in option_chain_df.iterrows():
+        if row['oi'] == 0 or row['iv'] == 0:
+            continue
+        t = years_to_expiry(row['expiry'])
+        if t <= 0:
+            t = 0.001
+        flag = 'c' if row['type'] == 'CE' else 'p'
+        gamma = GreeksCalculator.calculate_greeks(spot_price, row['strike'], t, r, row['iv'], flag)['gamma']
+        strike_gex = gamma * row['oi'] * spot_price * lot_size
+        if row['type'] == 'PE':
+            strike_gex *= -1
+        net_gex += strike_gex
+        gex_data.append({'strike': row['strike'], 'type': row['type'], 'gex': strike_gex})
+    return net_gex, gex_data
+
+def benchmark():
+    print("⏱️ Benchmark: Vectorized GEXEngine vs the per-row loop (multi-expiry NIFTY chain)")
+    print("="*90)
+
+    spot = 25000.0
+    chain = make_nifty_chain(spot)
+    n = len(chain)
+    sample = chain.iloc[np.linspace(0, n - 1, LEGACY_SAMPLE).astype(int)]
+
+    legacy_time, _ = timed(lambda: legacy_gex(sample, spot), repeat=1)
+    legacy_time *= n / len(sample)
+    # Accuracy against the loop on the same time to expiry (the engine measures it to the expiry close)
+    now = pd.Timestamp.now()
+    _, legacy_rows = legacy_gex(sample, spot, years_to_expiry=lambda e: GEXEngine.years_to_expiry([e], now)[0])
+    net_time, _ = timed(lambda: GEXEngine.calculate_gex(chain, spot, spot_grid=[spot]))
+    full_time, result = timed(lambda: GEXEngine.calculate_gex(chain, spot))
+    sample_result = GEXEngine.calculate_gex(sample, spot, now=now)
+    legacy = np.array([row['gex'] for row in legacy_rows])
+
+    print(f"{'Case':<44} | {'Loop (ms)':<10} | {'Vector (ms)':<11} | {'Speedup':<8} | {'Max rel diff':<12}")
+    print("-" * 90)
+    print(f"{f'Net + per-strike GEX, {n} options':<44} | {legacy_time*1000:<10.0f} | {net_time*1000:<11.1f} | "
+          f"{legacy_time/net_time:>6.0f}x | {max_rel_diff(sample_result['details']['gex'].to_numpy(), legacy):<12.1e}")
+    points = len(result['profile'])
+    print(f"{f'+ GEX profile over {points} spots':<44} | {'-':<10} | {full_time*1000:<11.1f} | "
+          f"{'':>7} | {'':<12}")
+    print("="*90)
+    flip = result['zero_gamma']
+    print(f"   Net GEX: ₹{result['net_gex_inr_crores']:.0f} Cr ({result['regime']}), "
+          f"zero-gamma flip: {f'{flip:.0f}' if flip is not None else 'none in range'}")
+    print(f"   Loop time is measured on {LEGACY_SAMPLE} options and scaled to the full chain.")
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,120 @@
+import warnings
+import numpy as np
+import scipy.stats as si
+from benchmark_bar_store import timed
+from benchmark_indicators import max_rel_diff
+from ai_option_brain.utils.black_scholes import BlackScholes, IV_OK, IV_NO_TIME_VALUE
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from py_vollib.black_scholes import black_scholes as vollib_price
+    from py_vollib.black_scholes.greeks.analytical import delta, gamma, theta, vega, rho
+    from py_vollib.black_scholes.implied_volatility import implied_volatility
+
+# Scalar baselines are timed on a sample and scaled to the full size
+SCALAR_SAMPLE = 2000
+
+def make_chain(n_underlyings=50, n_strikes=50, seed=0):
+    """
+    Synthetic option chains: calls and puts on n_strikes strikes around spot, weekly to quarterly expiries.
+    """
+    rng = np.random.default_rng(seed)
+    n = n_underlyings * n_strikes * 2
+    spot = np.repeat(rng.uniform(200, 5000, n_underlyings), n_strikes * 2)
+    strike = spot * np.tile(np.repeat(np.linspace(0.8, 1.2, n_strikes), 2), n_underlyings)
+    return {
+        'S': spot, 'K': strike, 'T': rng.uniform(2, 90, n) / 365, 'r': np.full(n, 0.07),
+        'sigma': rng.uniform(0.1, 0.6, n), 'flag': np.tile(['c', 'p'], n // 2),
+    }
+
+def scalar_greeks(chain, idx):
+    """
+    The previous GreeksCalculator path: one py_vollib call per Greek per option.
+    """
+    out = np.empty((6, len(idx)))
+    for j, i in enumerate(idx):
+        args = (chain['flag'][i], chain['S'][i], chain['K'][i], chain['T'][i], chain['r'][i], chain['sigma'][i])
+        out[:, j] = [vollib_price(*args), delta(*args), gamma(*args), theta(*args), vega(*args), rho(*args)]
+    return out
+
+def scalar_iv(prices, chain, idx):
+    """
+    The previous GreeksCalculator.calculate_iv path: one py_vollib solve per option, 0.0 on failure.
+    """
+    out = np.empty(len(idx))
+    for j, i in enumerate(idx):
+        try:
+            out[j] = implied_volatility(prices[i], chain['S'][i], chain['K'][i], chain['T'][i], chain['r'][i],
+                                        chain['flag'][i])
+        except Exception:
+            out[j] = 0.0
+    return out
+
+def scalar_straddle(S, K, T, r, sigma):
+    """
+    The per-minute straddle of calculate_roi / research_exit_strategies (two scipy calls per point).
+    """
+    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
+    d2 = (np.log(S / K) + (r - 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
+    call = S * si.norm.cdf(d1, 0.0, 1.0) - K * np.exp(-r * T) * si.norm.cdf(d2, 0.0, 1.0)
+    put = K * np.exp(-r * T) * si.norm.cdf(-d2, 0.0, 1.0) - S * si.norm.cdf(-d1, 0.0, 1.0)
+    return call + put
+
+def benchmark():
+    print("⏱️ Benchmark: Vectorized Black-Scholes engine vs scalar py_vollib / scipy calls")
+    print("="*90)
+
+    chain = make_chain()
+    n = len(chain['S'])
+    idx = np.linspace(0, n - 1, SCALAR_SAMPLE).astype(int)
+    names = ('price', 'delta', 'gamma', 'theta', 'vega', 'rho')
+
+    base_time, expected = timed(lambda: scalar_greeks(chain, idx), repeat=1)
+    base_time *= n / len(idx)
+    kernel_time, result = timed(lambda: BlackScholes.greeks(chain['S'], chain['K'], chain['T'], chain['r'],
+                                                           chain['sigma'], chain['flag'], names))
+    all_time, _ = timed(lambda: BlackScholes.greeks(chain['S'], chain['K'], chain['T'], chain['r'],
+                                                    chain['sigma'], chain['flag']))
+    got = np.array([result[name][idx] for name in names])
+
+    # Live chain refresh: every strike and expiry of 200 underlyings back out of market prices
+    live = make_chain(n_underlyings=200, n_strikes=100, seed=2)
+    live_n = len(live['S'])
+    prices = BlackScholes.price(live['S'], live['K'], live['T'], live['r'], live['sigma'], live['flag'])
+    live_idx = np.linspace(0, live_n - 1, SCALAR_SAMPLE).astype(int)
+    iv_base, iv_expected = timed(lambda: scalar_iv(prices, live, live_idx), repeat=1)
+    iv_base *= live_n / len(live_idx)
+    iv_time, (iv, status) = timed(lambda: BlackScholes.implied_volatility(prices, live['S'], live['K'], live['T'],
+                                                                          live['r'], live['flag']))
+    # Compared where both solvers found a vol (py_vollib gives 0.0 / garbage on options without time value)
+    solved = (status[live_idx] == IV_OK) & (iv_expected > 0)
+
+    # 1M path points of a straddle replay (calculate_roi): spot path, dynamic IV, decaying time
+    rng = np.random.default_rng(1)
+    m = 1_000_000
+    S = 1000 * np.exp(np.cumsum(rng.normal(0, 0.0005, m)))
+    sigma = rng.uniform(0.1, 0.4, m)
+    T = np.maximum(0.0001, 7 / 365 - (np.arange(m) % 1875 + 1) / (375 * 365))
+    sample = np.linspace(0, m - 1, SCALAR_SAMPLE).astype(int)
+    path_base, path_expected = timed(lambda: [scalar_straddle(S[i], 1000.0, T[i], 0.07, sigma[i]) for i in sample],
+                                     repeat=1)
+    path_base *= m / len(sample)
+    path_time, path_result = timed(lambda: BlackScholes.straddle(S, 1000.0, T, 0.07, sigma))
+
+    print(f"{'Case':<40} | {'Scalar (ms)':<12} | {'Vector (ms)':<11} | {'Speedup':<8} | {'Max rel diff':<12}")
+    print("-" * 90)
+    print(f"{f'Chain {n} options, price + 5 Greeks':<40} | {base_time*1000:<12.0f} | {kernel_time*1000:<11.1f} | "
+          f"{base_time/kernel_time:>6.0f}x | {max_rel_diff(got, expected):<12.1e}")
+    print(f"{f'Chain {n} options, price + 9 Greeks':<40} | {'-':<12} | {all_time*1000:<11.1f} | {'':>7} | {'':<12}")
+    print(f"{f'Straddle path, {m:,} points':<40} | {path_base*1000:<12.0f} | {path_time*1000:<11.1f} | "
+          f"{path_base/path_time:>6.0f}x | {max_rel_diff(path_result[sample], path_expected):<12.1e}")
+    print(f"{f'Chain IV, {live_n} options (200 underlyings)':<40} | {iv_base*1000:<12.0f} | {iv_time*1000:<11.1f} | "
+          f"{iv_base/iv_time:>6.0f}x | {max_rel_diff(iv[live_idx][solved], iv_expected[solved]):<12.1e}")
+    print("="*90)
+    print(f"   IV: {np.count_nonzero(status == IV_OK)}/{live_n} converged "
+          f"({np.count_nonzero(status == IV_NO_TIME_VALUE)} without time value), "
+          f"max error vs true vol {np.max(np.abs(iv - live['sigma'])[status == IV_OK]):.1e}")
+    print(f"   Scalar times are measured on {SCALAR_SAMPLE} elements and scaled to the full size.")
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import ta
+from benchmark_bar_store import make_bars, timed
+from ai_option_brain.utils.technical_indicators import TechnicalIndicators
+from ai_option_brain.utils.realized_volatility import RealizedVolatility
+
+# Forward RV label horizons (1, 3, 5 and 10 trading days of 1-min bars)
+HORIZONS = {'1d': 375, '3d': 1125, '5d': 1875, '10d': 3750}
+# Trailing estimator windows (10 and 20 trading days of 1-min bars)
+VOL_WINDOWS = {'10d': 3750, '20d': 7500}
+
+def legacy_vwap(df):
+    """
+    The previous per-day groupby/apply VWAP (kept here as the benchmark baseline).
+    """
+    df = df.copy()
+    df['tp'] = (df['high'] + df['low'] + df['close']) / 3
+    df['date_only'] = pd.to_datetime(df['date']).dt.date
+    df['cum_vol'] = df.groupby('date_only')['volume'].cumsum()
+    df['cum_vol_price'] = df.groupby('date_only').apply(lambda x: (x['tp'] * x['volume']).cumsum()).reset_index(level=0, drop=True)
+    return df['cum_vol_price'] / df['cum_vol']
+
+def forward_std_pandas(series, window):
+    """
+    The previous target_rv path: pandas rolling with a FixedForwardWindowIndexer.
+    """
+    return series.rolling(window=pd.api.indexers.FixedForwardWindowIndexer(window_size=window)).std()
+
+def estimators_pandas(df, windows, periods_per_year=252 * 375):
+    """
+    CC / Parkinson / Garman-Klass / Rogers-Satchell / Yang-Zhang as separate pandas rolling windows.
+    """
+    o, h, l, c = (np.log(df[col]) for col in ('open', 'high', 'low', 'close'))
+    rs = (h - o) * (h - c) + (l - o) * (l - c)
+    out = []
+    for w in windows.values():
+        k = 0.34 / (1.34 + (w + 1) / (w - 1))
+        out += [(c - c.shift(1)).rolling(w).var(),
+                ((h - l) ** 2).rolling(w).mean() / (4 * np.log(2)),
+                (0.5 * (h - l) ** 2 - (2 * np.log(2) - 1) * (c - o) ** 2).rolling(w).mean(),
+                rs.rolling(w).mean(),
+                (o - c.shift(1)).rolling(w).var() + k * (c - o).rolling(w).var() + (1 - k) * rs.rolling(w).mean()]
+    return np.concatenate([np.sqrt(v.values) * np.sqrt(periods_per_year) * 100 for v in out])
+
+def max_rel_diff(a, b):
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    if not (np.isnan(a) == np.isnan(b)).all():
+        return np.inf
+    mask = ~np.isnan(a)
+    return np.max(np.abs(a[mask] - b[mask]) / np.maximum(np.abs(b[mask]), 1.0)) if mask.any() else 0.0
+
+def benchmark():
+    print("⏱️ Benchmark: Vectorized indicator kernels vs ta / groupby (1 symbol, 2 years of 1-min bars)")
+    print("="*80)
+
+    df = make_bars()
+    close = df['close']
+    log_ret = np.log(close / close.shift(1))
+    print(f"   Rows: {len(df)}")
+
+    cases = [
+        ("VWAP (session reset)", lambda: legacy_vwap(df), lambda: TechnicalIndicators.calculate_vwap(df)),
+        ("RSI 14", lambda: ta.momentum.rsi(close, window=14), lambda: TechnicalIndicators.calculate_rsi(close)),
+        ("SMA 200", lambda: ta.trend.sma_indicator(close, window=200), lambda: TechnicalIndicators.calculate_sma(close, 200)),
+        ("EMA 20", lambda: ta.trend.ema_indicator(close, window=20), lambda: TechnicalIndicators.calculate_ema(close, 20)),
+        ("Bollinger 20/2 (high band)", lambda: ta.volatility.BollingerBands(close, 20, 2).bollinger_hband(),
+         lambda: TechnicalIndicators.calculate_bollinger_bands(close, 20, 2)[0]),
+        ("Forward RV 5d (target_rv)", lambda: forward_std_pandas(log_ret, 1875),
+         lambda: RealizedVolatility.forward_std(log_ret.values, {'5d': 1875})['5d']),
+        ("Forward RV 1/3/5/10d", lambda: np.concatenate([forward_std_pandas(log_ret, w).values for w in HORIZONS.values()]),
+         lambda: np.concatenate(list(RealizedVolatility.forward_std(log_ret.values, HORIZONS).values()))),
+        ("Vol estimators x5, 10d/20d", lambda: estimators_pandas(df, VOL_WINDOWS),
+         lambda: RealizedVolatility.estimators(df, VOL_WINDOWS, 252 * 375).values.T.ravel()),
+    ]
+
+    print(f"{'Indicator':<28} | {'Baseline (ms)':<13} | {'Kernel (ms)':<11} | {'Speedup':<8} | {'Max rel diff':<12}")
+    print("-" * 80)
+    for name, baseline, kernel in cases:
+        base_time, expected = timed(baseline)
+        kernel_time, result = timed(kernel)
+        print(f"{name:<28} | {base_time*1000:<13.1f} | {kernel_time*1000:<11.1f} | "
+              f"{base_time/kernel_time:>6.1f}x | {max_rel_diff(result, expected):<12.1e}")
+
+    print("="*80)
+
+if __name__ == "__main__":
+    benchmark()
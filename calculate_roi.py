@@ -1,8 +1,11 @@
 import pandas as pd
 import numpy as np
+from ai_option_brain.bar_store import BarStore
+from ai_option_brain.utils.black_scholes import BlackScholes
+from ai_option_brain.utils.expiry_calendar import ExpiryCalendar
 
-import glob
-import os
+# Only these backtest columns are needed to replay trades
+SIM_COLUMNS = ['date', 'close', 'signal', 'market_iv_proxy']
 
 def calculate_roi():
     # Constants
@@ -13,7 +16,7 @@ def calculate_roi():
     TAKE_PROFIT_PCT = 0.30  # Exit if Premium gains 30%
     STOP_LOSS_PCT = -0.15   # Exit if Premium loses 15%
     
-    results_dir = "ai_option_brain/results"
+    store = BarStore()
     leaderboard = []
     all_trades_log = []
     
@@ -22,15 +25,12 @@ def calculate_roi():
     print("="*60)
     
     # Scan for all backtest results
-    files = glob.glob(f"{results_dir}/*_backtest.csv")
-    print(f"   Found {len(files)} backtest files.")
+    symbols = store.symbols("backtest")
+    print(f"   Found {len(symbols)} backtest files.")
     
-    for file_path in files:
-        filename = os.path.basename(file_path)
-        symbol = filename.replace("_backtest.csv", "")
-        
+    for symbol in symbols:
         try:
-            df = pd.read_csv(file_path)
+            df = store.read("backtest", symbol, columns=SIM_COLUMNS)
         except Exception as e:
             print(f"⚠️ Error loading {symbol}: {e}")
             continue
@@ -45,6 +45,9 @@ def calculate_roi():
         trades = []
         i = 0
         total_rows = len(df)
+        closes = df['close'].values
+        ivs = df['market_iv_proxy'].values / 100
+        dates = df['date']
         
         while i < total_rows - 2000: # Buffer for lookahead
             row = df.iloc[i]
@@ -55,21 +58,14 @@ def calculate_roi():
                 entry_iv = row['market_iv_proxy'] / 100
                 entry_time = i
                 
-                # Black-Scholes Model
-                def black_scholes(S, K, T, r, sigma, option_type="call"):
-                    import scipy.stats as si
-                    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-                    d2 = (np.log(S / K) + (r - 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-                    if option_type == "call":
-                        return (S * si.norm.cdf(d1, 0.0, 1.0) - K * np.exp(-r * T) * si.norm.cdf(d2, 0.0, 1.0))
-                    if option_type == "put":
-                        return (K * np.exp(-r * T) * si.norm.cdf(-d2, 0.0, 1.0) - S * si.norm.cdf(-d1, 0.0, 1.0))
-                        
                 # Entry Price Calculation (Exact BS)
                 r = 0.07 # Risk Free Rate
-                t_expiry = 7/365 # 7 Days to expiry (Avg)
-                premium_paid = black_scholes(entry_price, entry_price, t_expiry, r, entry_iv, "call") + \
-                               black_scholes(entry_price, entry_price, t_expiry, r, entry_iv, "put")
+                # Contract: the nearest monthly expiry still trading at the end of the look-ahead window,
+                # with time to expiry to the minute (expiry day close)
+                path = slice(i + 1, min(i + 1875, total_rows))
+                expiry = ExpiryCalendar.next_expiry(dates.iloc[path.stop - 1])
+                t_expiry = ExpiryCalendar.years_to_expiry(dates.iloc[i], expiry)
+                premium_paid = BlackScholes.straddle(entry_price, entry_price, t_expiry, r, entry_iv)
                 
                 # Capital Injection Logic (User Request)
                 # Start 30k, +5k every month, Max 50k.
@@ -82,6 +78,11 @@ def calculate_roi():
                     i += 1
                     continue
                 
+                # Current Straddle Value (Exact BS) along the whole look-ahead path in one call,
+                # with Dynamic IV (Crucial for Vol Crush)
+                t_remaining = np.maximum(0.0001, ExpiryCalendar.years_to_expiry(dates.iloc[path], expiry)) # Years remaining
+                path_premium = BlackScholes.straddle(closes[path], entry_price, t_remaining, r, ivs[path])
+                
                 # Trade Loop (Look ahead minute by minute)
                 exit_pnl = 0
                 held_minutes = 0
@@ -94,15 +95,7 @@ def calculate_roi():
                     current_idx = i + j
                     if current_idx >= total_rows: break
                     
-                    curr_row = df.iloc[current_idx]
-                    curr_price = curr_row['close']
-                    curr_iv = curr_row['market_iv_proxy'] / 100 # Dynamic IV (Crucial for Vol Crush)
-                    
-                    # Current Straddle Value (Exact BS)
-                    t_remaining = max(0.0001, t_expiry - (j / (375*365))) # Days remaining in years
-                    
-                    current_premium = black_scholes(curr_price, entry_price, t_remaining, r, curr_iv, "call") + \
-                                      black_scholes(curr_price, entry_price, t_remaining, r, curr_iv, "put")
+                    current_premium = path_premium[j - 1]
                     
                     pnl_per_share = current_premium - premium_paid
                     pnl_pct = pnl_per_share / premium_paid
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from ai_option_brain.utils.technical_indicators import TechnicalIndicators
 
 def analyze_iv_hv_spread():
     print("🔬 Analyzing IV (VIX) vs HV (Realized Volatility) Spread...")
@@ -30,7 +31,7 @@ def analyze_iv_hv_spread():
         df_vix.set_index('date', inplace=True)
         
         # Resample to Daily Close
-        vix_daily = df_vix.resample('D').agg({'close': 'last'}).dropna()
+        vix_daily = TechnicalIndicators.resample_data(df_vix, 'day')[['close']]
         vix_daily.rename(columns={'close': 'vix'}, inplace=True)
         
     except Exception as e:
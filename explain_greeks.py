@@ -1,18 +1,8 @@
-import numpy as np
-import scipy.stats as si
+from ai_option_brain.utils.black_scholes import BlackScholes
 
 def black_scholes_greeks(S, K, T, r, sigma, option_type="call"):
-    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    d2 = (np.log(S / K) + (r - 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    
-    if option_type == "call":
-        price = S * si.norm.cdf(d1, 0.0, 1.0) - K * np.exp(-r * T) * si.norm.cdf(d2, 0.0, 1.0)
-        delta = si.norm.cdf(d1, 0.0, 1.0)
-    if option_type == "put":
-        price = K * np.exp(-r * T) * si.norm.cdf(-d2, 0.0, 1.0) - S * si.norm.cdf(-d1, 0.0, 1.0)
-        delta = si.norm.cdf(d1, 0.0, 1.0) - 1
-        
-    return price, delta
+    greeks = BlackScholes.greeks(S, K, T, r, sigma, option_type, greeks=("price", "delta"))
+    return greeks["price"], greeks["delta"]
 
 def explain_convexity():
     print("🎓 Option Greeks Class: Why Straddles Make Money")
@@ -1,22 +1,23 @@
 import os
 import pandas as pd
 from ai_option_brain.data_loader import ZerodhaDataFetcher
+from ai_option_brain.harvester import Harvester
 from datetime import datetime, timedelta
-import time
 from dotenv import load_dotenv
+from validate_data import NIFTY_50, validate_data
 
 load_dotenv()
 
-# Failed Stocks Retry List
-NIFTY_50 = [
-    'NTPC', 'ONGC', 'POWERGRID', 'RELIANCE', 'SBILIFE', 
-    'SBIN', 'SUNPHARMA', 'TATACONSUM', 'TATAMOTORS', 'TATASTEEL', 
-    'TCS', 'TECHM', 'TITAN', 'ULTRACEMCO', 'WIPRO'
-]
-
-def fetch_all_nifty_data():
+def fetch_all_nifty_data(incremental=True, symbols=None):
+    """
+    Harvests 1-min bars for the Nifty 50 into the BarStore.
+    Progress is checkpointed per chunk, so re-running after an interruption resumes where it stopped.
+    :param incremental: Fetch only bars after each symbol's last stored timestamp (False = full re-download)
+    :param symbols: Subset of symbols (default: all of NIFTY_50)
+    """
+    symbols = symbols or NIFTY_50
     fetcher = ZerodhaDataFetcher()
-    # fetcher.connect() # Removed as connection happens in __init__
+    harvester = Harvester(fetcher, manifest_path="ai_option_brain/data/harvest_nifty50_manifest.json")
     
     # Date Range: 2 Years (Max allowed for 1min data usually, but we'll try)
     # Actually Zerodha allows 1min for ~6 months to 1 year depending on subscription?
@@ -28,48 +29,30 @@ def fetch_all_nifty_data():
     start_date = end_date - timedelta(days=365*2) # 2 Years
     
     print(f"🚜 Starting Nifty 50 Data Harvest...")
-    print(f"   Target: {len(NIFTY_50)} Stocks")
+    print(f"   Target: {len(symbols)} Stocks")
     print(f"   Range: {start_date.date()} to {end_date.date()}")
     print("="*60)
     
-    success_count = 0
-    fail_count = 0
+    # All symbols are fetched concurrently under the fetcher's shared API rate limit
+    results = harvester.run(symbols, start_date, end_date, interval="minute", incremental=incremental)
+    
+    # Symbols that are missing or invalid after the harvest are re-fetched in full, once
+    retry_list = validate_data()
+    if retry_list:
+        print(f"🔄 Re-harvesting {len(retry_list)} symbols in full...")
+        harvester.reset(retry_list, interval="minute")
+        results.update(harvester.run(retry_list, start_date, end_date, interval="minute", incremental=False))
+    
+    success = [s for s, r in results.items() if r and r['status'] == 'done']
+    failed = [s for s, r in results.items() if not r or r['status'] != 'done']
     
-    for i, symbol in enumerate(NIFTY_50):
-        print(f"[{i+1}/{len(NIFTY_50)}] Fetching {symbol}...")
-        
-        try:
-            # 1. Get Instrument Token
-            token = fetcher.get_instrument_token(symbol)
-            if not token:
-                print(f"   ⚠️ Token not found for {symbol}")
-                fail_count += 1
-                continue
-                
-            # 2. Fetch Data
-            df = fetcher.fetch_historical_data(token, start_date, end_date, interval="minute")
-            
-            if df is not None and not df.empty:
-                # 3. Save to CSV
-                filename = f"data/{symbol}.NS_2y_1d.csv"
-                df.to_csv(filename, index=False)
-                print(f"   ✅ Saved {len(df)} rows to {filename}")
-                success_count += 1
-            else:
-                print(f"   ⚠️ No data returned for {symbol}")
-                fail_count += 1
-                
-        except Exception as e:
-            print(f"   ❌ Error fetching {symbol}: {e}")
-            fail_count += 1
-            
-        # Respect API Rate Limits (3 requests per second allowed, but let's be safe)
-        time.sleep(0.5)
-        
     print("="*60)
     print(f"🏁 Harvest Complete.")
-    print(f"   ✅ Success: {success_count}")
-    print(f"   ❌ Failed:  {fail_count}")
+    print(f"   ✅ Success: {len(success)}")
+    print(f"   ❌ Failed:  {len(failed)}")
+    for symbol in failed:
+        error = results[symbol]['error'] if results[symbol] else "Not planned"
+        print(f"      {symbol}: {error}")
 
 if __name__ == "__main__":
     fetch_all_nifty_data()
@@ -1,20 +1,24 @@
-import os
 import pandas as pd
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from ai_option_brain.data_loader import ZerodhaDataFetcher
+from ai_option_brain.bar_sync import BarSync
+from ai_option_brain.bar_store import BarStore
 
 load_dotenv()
 
-def fetch_pilot_data_zerodha():
+def fetch_pilot_data_zerodha(incremental=True):
+    """
+    :param incremental: Top up stored bars with only the missing range (False = full re-download)
+    """
     fetcher = ZerodhaDataFetcher()
     if not fetcher.kite:
         print("❌ Zerodha Login Failed. Check .env")
         return
+    store = BarStore()
+    sync = BarSync(fetcher, store)
 
     stocks = ["RELIANCE", "ADANIENT", "HDFCBANK", "SBIN", "TATAMOTORS", "INDIA VIX"]
-    data_dir = "ai_option_brain/data/raw"
-    os.makedirs(data_dir, exist_ok=True)
     
     print("🚀 Starting Pilot Data Fetch (Source: Zerodha)...")
     print("="*60)
@@ -48,19 +52,28 @@ def fetch_pilot_data_zerodha():
         
         # 2. Fetch 60-min Data (For Trend)
         print(f"   📥 Fetching 60-min data...")
-        df_60 = fetcher.fetch_historical_data(token, from_date, to_date, "60minute")
-        if not df_60.empty:
-            df_60.to_csv(f"{data_dir}/{symbol}_60min.csv", index=False)
-            print(f"      Saved {len(df_60)} rows.")
+        if incremental:
+            result = sync.sync(symbol, from_date, to_date, interval="60minute", exchange=exchange)
+            print(f"      Synced {result['new_rows']} new rows.")
+        else:
+            # Full re-download: drop the stored history so no stale bars survive outside the window
+            store.delete("60minute", symbol)
+            bars = fetcher.stream_historical_data(token, from_date, to_date, store, symbol, "60minute")
+            print(f"      Fetched {len(bars)} rows.")
             
         # 3. Fetch 1-min Data (For Volatility Training - Last 1 Year only to save time/bandwidth for pilot)
         # Fetching 3 years of 1-min is heavy. Let's do 1 year for the Pilot.
         print(f"   📥 Fetching 1-min data (Last 1 Year)...")
         from_date_1m = to_date - timedelta(days=365)
-        df_1 = fetcher.fetch_historical_data(token, from_date_1m, to_date, "minute")
-        if not df_1.empty:
-            df_1.to_csv(f"{data_dir}/{symbol}_1min.csv", index=False)
-            print(f"      Saved {len(df_1)} rows.")
+        if incremental:
+            result = sync.sync(symbol, from_date_1m, to_date, interval="minute", exchange=exchange)
+            print(f"      Synced {result['new_rows']} new rows.")
+            if not result['gaps'].empty:
+                print(f"      ⚠️ Missing bars on {len(result['gaps'])} session(s): {result['gaps']['day'].dt.date.tolist()}")
+        else:
+            store.delete("minute", symbol)
+            bars = fetcher.stream_historical_data(token, from_date_1m, to_date, store, symbol, "minute")
+            print(f"      Fetched {len(bars)} rows.")
 
     print("="*60)
     print("🏁 Data Fetch Complete.")
@@ -4,6 +4,8 @@ import numpy as np
 from kiteconnect import KiteConnect
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
+from ai_option_brain.instrument_master import InstrumentMaster
+from ai_option_brain.utils.expiry_calendar import ExpiryCalendar
 
 load_dotenv()
 
@@ -18,8 +20,9 @@ def fetch_and_validate():
         print("❌ API Key/Token missing.")
         return
 
-    kite = KiteConnect(api_key=api_key)
+    kite = KiteConnect(api_key=api_key, root=os.getenv("ZERODHA_API_ROOT"))
     kite.set_access_token(access_token)
+    instruments = InstrumentMaster(kite)
     
     # 1. Get Spot Price of Reliance on a specific date
     # Let's pick Nov 29, 2025 (Today/Yesterday)
@@ -30,12 +33,7 @@ def fetch_and_validate():
     print(f"   Expiry: {expiry_month}")
     
     # Fetch Spot Data to find ATM
-    instruments = kite.instruments("NSE")
-    rel_token = None
-    for instr in instruments:
-        if instr['tradingsymbol'] == 'RELIANCE':
-            rel_token = instr['instrument_token']
-            break
+    rel_token = instruments.get_token('RELIANCE', "NSE")
             
     if not rel_token:
         print("❌ Reliance token not found.")
@@ -61,12 +59,11 @@ def fetch_and_validate():
     print(f"   ATM Strike: {strike}")
     
     # 3. Find Option Tokens (CE & PE)
-    print("   Fetching NFO Instruments...")
-    nfo_instruments = kite.instruments("NFO")
+    print("   Loading NFO Instruments...")
     
     # Debug: Print first 5 Reliance options
     print("   Debug: Sample NFO Symbols:")
-    samples = [i['tradingsymbol'] for i in nfo_instruments if i['name'] == 'RELIANCE'][:5]
+    samples = [i['tradingsymbol'] for i in instruments.get_chain('RELIANCE', "NFO")][:5]
     print(f"   {samples}")
     
     ce_symbol = f"RELIANCE{expiry_month}{strike}CE"
@@ -74,20 +71,15 @@ def fetch_and_validate():
     
     print(f"   Looking for: {ce_symbol} & {pe_symbol}")
     
-    ce_token = None
-    pe_token = None
-    
-    for instr in nfo_instruments:
-        if instr['tradingsymbol'] == ce_symbol:
-            ce_token = instr['instrument_token']
-        if instr['tradingsymbol'] == pe_symbol:
-            pe_token = instr['instrument_token']
+    ce_token = instruments.get_token(ce_symbol, "NFO")
+    pe_token = instruments.get_token(pe_symbol, "NFO")
             
     if not ce_token or not pe_token:
         print("❌ Option tokens not found. Check symbol format.")
         return
         
     print(f"   Found Tokens: CE={ce_token}, PE={pe_token}")
+    expiry = instruments.get_instrument(ce_symbol, "NFO")['expiry']
     
     # 4. Fetch Option Data
     ce_data = kite.historical_data(ce_token, from_date, to_date, "minute")
@@ -110,7 +102,7 @@ def fetch_and_validate():
     # From previous analysis: HV ~ 19%, VIX ~ 13%
     hv = 0.19
     vix = 0.13
-    t_expiry = 27 / 365 # Approx 27 days left (Nov 28 to Dec 25)
+    t_expiry = ExpiryCalendar.years_to_expiry(spot_df['date'], expiry) # Per bar, to the expiry close
     
     for i in range(0, len(spot_df), 30): # Every 30 mins
         row = spot_df.iloc[i]
@@ -124,8 +116,8 @@ def fetch_and_validate():
         real_straddle = real_ce + real_pe
         
         # Calculator Formula: 0.8 * S * IV * sqrt(T)
-        calc_hv = 0.8 * spot * hv * np.sqrt(t_expiry)
-        calc_vix = 0.8 * spot * vix * np.sqrt(t_expiry)
+        calc_hv = 0.8 * spot * hv * np.sqrt(t_expiry[i])
+        calc_vix = 0.8 * spot * vix * np.sqrt(t_expiry[i])
         
         error_hv = ((calc_hv - real_straddle) / real_straddle) * 100
         
@@ -0,0 +1,40 @@
+from ai_option_brain.data_loader import ZerodhaDataFetcher
+from ai_option_brain.harvester import Harvester
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def harvest_fno_universe(years=2, interval="minute", incremental=True):
+    """
+    Harvests every F&O stock (underlyings with NFO futures, ~200 names) into the BarStore.
+    Interrupted runs resume from the manifest; failed chunks are retried automatically.
+    """
+    fetcher = ZerodhaDataFetcher()
+    if not fetcher.kite:
+        print("❌ Zerodha Login Failed. Check .env")
+        return
+    
+    universe = fetcher.instruments.get_fno_underlyings()
+    harvester = Harvester(fetcher, manifest_path="ai_option_brain/data/harvest_fno_manifest.json")
+    
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=365*years)
+    
+    print(f"🚜 Starting F&O Universe Harvest...")
+    print(f"   Target: {len(universe)} Stocks ({interval})")
+    print(f"   Range: {start_date.date()} to {end_date.date()}")
+    print("="*60)
+    
+    results = harvester.run(universe, start_date, end_date, interval=interval, incremental=incremental)
+    
+    failed = {s: r for s, r in results.items() if r['status'] != 'done'}
+    print("="*60)
+    print(f"🏁 Harvest Complete.")
+    print(f"   ✅ Success: {len(results) - len(failed)}")
+    print(f"   ❌ Failed:  {len(failed)} (re-run to retry)")
+    for symbol, entry in failed.items():
+        print(f"      {symbol}: {entry['error']}")
+
+if __name__ == "__main__":
+    harvest_fno_universe()
@@ -1,15 +1,23 @@
 import time
 import pandas as pd
-import joblib
 import os
 from datetime import datetime
 from ai_option_brain.data_loader import ZerodhaDataFetcher
-from ai_option_brain.feature_engineer import FeatureEngineer
+from ai_option_brain.live_feed import LiveFeed
+from ai_option_brain.online_features import OnlineFeatureEngine, FEATURES
+from ai_option_brain.feature_manifest import load_model
 from dotenv import load_dotenv
 
 load_dotenv()
 
-def live_scanner():
+VIX_SYMBOL = "INDIA VIX"
+# Inputs of the signal rules below (computed even when the model does not use them)
+SIGNAL_FEATURES = ['hv_20', 'trend_dist']
+
+def live_scanner(source=None):
+    """
+    :param source: Tick source for the live feed (default: Kite WebSocket; ReplayTickSource for offline runs)
+    """
     print("🧠 AI Option Brain: LIVE SCANNER (Sniper Mode)")
     print("="*60)
     
@@ -23,75 +31,76 @@ def live_scanner():
     top_stocks = lb_df.head(20)['Symbol'].tolist()
     print(f"🎯 Monitoring Top {len(top_stocks)} Stocks: {top_stocks}")
     
-    # 2. Load Models
+    # 2. Load Models (each with the manifest of features it was trained on)
     models = {}
+    manifests = {}
     print("   Loading Models...")
     for symbol in top_stocks:
         model_path = f"ai_option_brain/models/{symbol}_rf_vol.pkl"
-        if os.path.exists(model_path):
-            models[symbol] = joblib.load(model_path)
-        else:
+        if not os.path.exists(model_path):
             print(f"   ⚠️ Model missing for {symbol}")
+            continue
+        model, manifest = load_model(model_path)
+        unsupported = [f for f in manifest.features if f not in FEATURES and f != 'india_vix']
+        try:
+            manifest.check_params()
+            if unsupported:
+                raise ValueError(f"live features cannot provide {unsupported}")
+        except ValueError as e:
+            print(f"   ⚠️ Skipping {symbol}: {e}")
+            continue
+        models[symbol], manifests[symbol] = model, manifest
+    needs_vix = any('india_vix' in m.features for m in manifests.values())
             
-    # 3. Connect to Zerodha
+    # 3. Connect to Zerodha and start the tick feed
+    # History is fetched once per symbol to seed the in-memory bars; after that
+    # closed 1-min bars are built from WebSocket ticks without any REST polling.
     fetcher = ZerodhaDataFetcher()
-    # fetcher.connect() # Not needed
+    print("   Seeding bar buffers from history...")
+    feed = LiveFeed(fetcher, [s for s in top_stocks if s in models] + ([VIX_SYMBOL] if needs_vix else [])).start(source)
+    # Per-symbol streaming feature state (O(1) per new bar instead of a full batch recompute),
+    # limited to the model's manifest features and the signal inputs
+    engines = {symbol: OnlineFeatureEngine([f for f in dict.fromkeys(manifests[symbol].features + SIGNAL_FEATURES)
+                                            if f in FEATURES])
+               for symbol in models}
     
     print("="*60)
     print("📡 Scanner Active. Waiting for next minute candle...")
     
     while True:
+        # Wait for the minute to close, then scan on the freshly closed bar
+        now = datetime.now()
+        time.sleep(60 - now.second - now.microsecond / 1e6 + 1)
         now = datetime.now()
-        # Wait for the minute to close (e.g., at 00 seconds)
-        # For simulation/demo, we just run immediately then sleep 60s
+        feed.flush(now)
         
         print(f"\n⏰ Scan Time: {now.strftime('%H:%M:%S')}")
+        vix_bars = feed.bars(VIX_SYMBOL) if needs_vix else None
         
         for symbol in top_stocks:
             if symbol not in models: continue
             
             try:
-                # A. Fetch Data (Last 5 days to ensure enough for indicators)
-                # We need 1-min data
-                token = fetcher.get_instrument_token(symbol)
-                if not token: continue
-                
-                to_date = datetime.now()
-                from_date = to_date - pd.Timedelta(days=5)
-                
-                df = fetcher.fetch_historical_data(token, from_date, to_date, interval="minute")
-                
-                if df.empty: continue
+                # A. Feed the newly closed 1-min bars into the symbol's online feature state
+                engine = engines[symbol]
+                new_bars = feed.bars(symbol)
+                if engine.last_date is not None:
+                    new_bars = new_bars[new_bars['date'] > engine.last_date]
+                if new_bars.empty: continue
+                engine.update_frame(new_bars)
                 
-                # B. Feature Engineering
-                # We need to process this mini-batch
-                # Create 60m resample
-                df['date'] = pd.to_datetime(df['date'])
-                df.set_index('date', inplace=True)
-                df_60m = df.resample('60min').agg({
-                    'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'
-                }).dropna().reset_index()
-                df.reset_index(inplace=True)
-                
-                # VIX (Mock or Fetch) - For now None
-                df_features = FeatureEngineer.prepare_training_data(df, df_60m, None)
-                
-                if df_features.empty: continue
-                
-                # Get latest candle
-                latest_row = df_features.iloc[-1]
+                # B. Features are those of prepare_training_data(..., include_target=False) for the latest bar
+                if not engine.ready: continue
+                latest_row = dict(engine.features, close=new_bars['close'].iloc[-1])
+                if needs_vix:
+                    # Latest VIX close at or before the bar (as merge_asof 'backward' in training)
+                    vix = vix_bars[vix_bars['date'] <= engine.last_date]
+                    latest_row['india_vix'] = vix['close'].iloc[-1] if not vix.empty else float('nan')
                 
                 # C. Predict
-                # Prepare input vector (drop non-features)
-                drop_cols = ['date', 'open', 'high', 'low', 'close', 'volume', 'target_rv', 'log_ret']
-                features = [c for c in df_features.columns if c not in drop_cols]
-                
-                # Ensure columns match model training
-                # This is tricky if feature order changed. 
-                # Ideally we should save feature list with model.
-                # For now assuming consistent order.
-                
-                X_input = latest_row[features].values.reshape(1, -1)
+                # Inputs in the manifest's training order; a missing feature raises instead of mispredicting
+                X_input = manifests[symbol].frame(latest_row)
+                if X_input.isna().any(axis=None): continue
                 pred_rv = models[symbol].predict(X_input)[0]
                 
                 # D. Logic (Sniper)
@@ -115,8 +124,7 @@ def live_scanner():
                 # print(f"Error scanning {symbol}: {e}")
                 pass
         
-        print("   Scan complete. Sleeping 60s...")
-        time.sleep(60)
+        print("   Scan complete. Waiting for next bar...")
 
 if __name__ == "__main__":
     live_scanner()
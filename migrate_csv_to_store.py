@@ -0,0 +1,36 @@
+import os
+import glob
+from ai_option_brain.bar_store import BarStore
+
+def migrate():
+    """
+    One-off import of the legacy per-symbol CSV files into the columnar BarStore.
+    """
+    store = BarStore()
+    print("📦 Migrating CSV files to BarStore...")
+    print("="*60)
+    
+    # (pattern, suffix to strip, dataset, append)
+    sources = [
+        ("data/*.NS_2y_1d.csv", ".NS_2y_1d.csv", "minute", False),
+        ("ai_option_brain/data/raw/*_1min.csv", "_1min.csv", "minute", True),
+        ("ai_option_brain/data/raw/*_60min.csv", "_60min.csv", "60minute", True),
+        ("ai_option_brain/data/processed/*_training_data.csv", "_training_data.csv", "features", False),
+        ("ai_option_brain/results/*_backtest.csv", "_backtest.csv", "backtest", False),
+    ]
+    
+    for pattern, suffix, dataset, append in sources:
+        for path in sorted(glob.glob(pattern)):
+            symbol = os.path.basename(path).replace(suffix, "")
+            try:
+                # Pilot files overlap the Nifty 50 harvest, so they are merged instead of replacing
+                rows = store.import_csv(dataset, symbol, path, append=append)
+                print(f"   ✅ {path} → {dataset}/{symbol} ({rows} rows)")
+            except Exception as e:
+                print(f"   ❌ {path}: {e}")
+    
+    print("="*60)
+    print("🏁 Migration Complete.")
+
+if __name__ == "__main__":
+    migrate()
@@ -1,17 +1,8 @@
 import pandas as pd
 import numpy as np
-import glob
-import os
-import scipy.stats as si
-
-def black_scholes(S, K, T, r, sigma, option_type="call"):
-    if T <= 0: return max(0, S - K) if option_type == "call" else max(0, K - S)
-    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    d2 = (np.log(S / K) + (r - 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    if option_type == "call":
-        return (S * si.norm.cdf(d1, 0.0, 1.0) - K * np.exp(-r * T) * si.norm.cdf(d2, 0.0, 1.0))
-    if option_type == "put":
-        return (K * np.exp(-r * T) * si.norm.cdf(-d2, 0.0, 1.0) - S * si.norm.cdf(-d1, 0.0, 1.0))
+from ai_option_brain.bar_store import BarStore
+from ai_option_brain.utils.black_scholes import BlackScholes
+from ai_option_brain.utils.expiry_calendar import ExpiryCalendar
 
 def research_exits():
     print("🎓 University Study: Dynamic Exit Strategies vs Fixed 30%")
@@ -19,22 +10,24 @@ def research_exits():
     
     # 1. Load Top 5 Stocks (The "Elite")
     top_5 = ["APOLLOHOSP", "INDUSINDBK", "ADANIENT", "TATASTEEL", "TITAN"]
-    data_dir = "ai_option_brain/results"
+    store = BarStore()
     
     results = []
     
     for symbol in top_5:
-        file_path = f"{data_dir}/{symbol}_backtest.csv"
-        if not os.path.exists(file_path): continue
+        if not store.exists("backtest", symbol): continue
         
         print(f"🔬 Analyzing {symbol}...")
-        df = pd.read_csv(file_path)
+        df = store.read("backtest", symbol, columns=['date', 'close', 'signal', 'market_iv_proxy'])
         
         # We need to re-simulate the path for every signal
         # Logic copied from calculate_roi.py but modified for research
         
         i = 0
         total_rows = len(df)
+        closes = df['close'].values
+        ivs = df['market_iv_proxy'].values / 100
+        dates = df['date']
         
         while i < total_rows - 2000:
             row = df.iloc[i]
@@ -43,11 +36,17 @@ def research_exits():
                 entry_price = row['close']
                 entry_iv = row['market_iv_proxy'] / 100
                 r = 0.07
-                t_expiry = 7/365
+                # Nearest monthly expiry still trading at the end of the 5-day path (time to the minute)
+                path = slice(i + 1, min(i + 1875, total_rows))
+                expiry = ExpiryCalendar.next_expiry(dates.iloc[path.stop - 1])
+                t_expiry = ExpiryCalendar.years_to_expiry(dates.iloc[i], expiry)
                 
                 # Entry Premium
-                premium_paid = black_scholes(entry_price, entry_price, t_expiry, r, entry_iv, "call") + \
-                               black_scholes(entry_price, entry_price, t_expiry, r, entry_iv, "put")
+                premium_paid = BlackScholes.straddle(entry_price, entry_price, t_expiry, r, entry_iv)
+                
+                # Straddle value along the whole 5-day path in one vectorized call
+                t_remaining = np.maximum(0.0001, ExpiryCalendar.years_to_expiry(dates.iloc[path], expiry))
+                path_premium = BlackScholes.straddle(closes[path], entry_price, t_remaining, r, ivs[path])
                 
                 # Track Path
                 max_profit_pct = 0
@@ -81,13 +80,7 @@ def research_exits():
                     current_idx = i + j
                     if current_idx >= total_rows: break
                     
-                    curr_row = df.iloc[current_idx]
-                    curr_price = curr_row['close']
-                    curr_iv = curr_row['market_iv_proxy'] / 100
-                    t_remaining = max(0.0001, t_expiry - (j / (375*365)))
-                    
-                    curr_premium = black_scholes(curr_price, entry_price, t_remaining, r, curr_iv, "call") + \
-                                   black_scholes(curr_price, entry_price, t_remaining, r, curr_iv, "put")
+                    curr_premium = path_premium[j - 1]
                                    
                     pnl_pct = (curr_premium - premium_paid) / premium_paid
                     
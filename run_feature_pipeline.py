@@ -1,67 +1,171 @@
 import os
-import pandas as pd
-from ai_option_brain.feature_engineer import FeatureEngineer
+import sys
+import time
+import multiprocessing
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from ai_option_brain.feature_store import FeatureStore
+from ai_option_brain.bar_store import BarStore
+from ai_option_brain.market_context import MarketContext, MARKET_SYMBOLS
 
-import glob
+# Rough peak memory of one worker on 2 years of 1-min bars (raw frame, rolling windows, merges).
+# Check against the per-symbol peak RSS the pipeline reports.
+WORKER_MEMORY_GB = 1.5
+COMPACT_WORKER_MEMORY_GB = 1.0
+
+# Per-process market context (VIX on the session grid), set once by the pool initializer (read-only in workers)
+_MARKET = None
+
+def _init_worker(market):
+    global _MARKET
+    _MARKET = market
+
+def available_memory_gb():
+    """
+    Available physical memory (Linux/macOS sysconf; None if unknown).
+    """
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') / 1e9
+    except (ValueError, OSError, AttributeError):
+        return None
+
+def reset_peak_rss():
+    """
+    Resets this process's peak RSS to its current RSS so the next reading covers only what runs after
+    it (Linux /proc/self/clear_refs). Returns False where that is unsupported: the peak is then the
+    process's cumulative one.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+def peak_rss_mb():
+    """
+    Peak resident memory of this process in MB since start or the last reset_peak_rss (None if unavailable).
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1e3  # KB
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3  # bytes on macOS, KB on Linux
+
+def pool_size(n_symbols, worker_memory_gb=WORKER_MEMORY_GB):
+    """
+    Workers = available cores, capped by the symbols to process and by available memory.
+    """
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+    workers = min(cores, n_symbols)
+    memory = available_memory_gb()
+    if memory is not None:
+        workers = min(workers, int(memory // worker_memory_gb))
+    return max(workers, 1)
+
+def process_symbol(symbol, store_root, force=False, compact=False, chunk_rows=None):
+    """
+    Brings the stored feature set of one symbol up to date. Returns (symbol, mode, rows, peak_mb, error).
+    Unchanged inputs are skipped ('cached'); appended bars only recompute the tail ('tail').
+    peak_mb is the peak RSS of the process that ran it while building this symbol (the process's
+    cumulative peak where it cannot be reset, see reset_peak_rss).
+    """
+    reset_peak_rss()
+    try:
+        features = FeatureStore(BarStore(root=store_root))
+        mode, rows = features.build(symbol, _MARKET, force=force, compact=compact, chunk_rows=chunk_rows)
+        return symbol, mode, rows, peak_rss_mb(), None
+    except Exception as e:
+        return symbol, None, 0, peak_rss_mb(), f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+
+def run_pipeline(workers=None, symbols=None, force=False, compact=False, chunk_rows=None):
+    """
+    :param workers: Worker processes (None = sized by cores and memory, 1 = run in this process)
+    :param symbols: Subset of stored symbols to process (default: all)
+    :param force: Rebuild every symbol from scratch, ignoring the feature store cache
+    :param compact: Memory-lean float32 features (prepare_training_data(compact=True))
+    :param chunk_rows: Build each symbol out-of-core, this many 1-min rows at a time (None = whole history)
+    """
+    store = BarStore() # Raw 1-min bars live in the 'minute' dataset (fetch_nifty50_data.py)
 
-def run_pipeline():
-    raw_dir = "data" # Where fetch_nifty50_data.py saves
-    processed_dir = "ai_option_brain/data/processed"
-    os.makedirs(processed_dir, exist_ok=True)
-    
     print("⚙️ Starting Feature Engineering Pipeline (Nifty 50)...")
     print("="*60)
-    
-    # 1. Load India VIX (Common Feature)
+    start_time = time.perf_counter()
+
+    # 1. Align India VIX (Common Feature) to the session grid once and share it with every worker
     # We might not have VIX for the exact same period, but let's try to load what we have
-    vix_path = "ai_option_brain/data/raw/INDIA VIX_1min.csv"
-    if os.path.exists(vix_path):
-        print("   📊 Loading India VIX...")
-        vix_df = pd.read_csv(vix_path)
-    else:
+    print("   📊 Loading India VIX...")
+    market = MarketContext.from_store(store)
+    if 'india_vix' not in market:
         print("   ⚠️ India VIX data not found. Proceeding without VIX features.")
-        vix_df = None
 
     # 2. Scan for all downloaded stocks
-    files = glob.glob(f"{raw_dir}/*.NS_2y_1d.csv")
-    print(f"   Found {len(files)} stock files.")
-    
-    for file_path in files:
-        # Extract Symbol
-        filename = os.path.basename(file_path)
-        symbol = filename.replace(".NS_2y_1d.csv", "")
-        
-        print(f"🔍 Processing {symbol}...")
-        
-        try:
-            # Load 1-min Data
-            df_1m = pd.read_csv(file_path)
-            df_1m['date'] = pd.to_datetime(df_1m['date'])
-            
-            # Create 60-min Data (Resample)
-            df_1m.set_index('date', inplace=True)
-            df_60m = df_1m.resample('60min').agg({
-                'open': 'first',
-                'high': 'max',
-                'low': 'min',
-                'close': 'last',
-                'volume': 'sum'
-            }).dropna().reset_index()
-            df_1m.reset_index(inplace=True)
-            
-            # Run Engineer
-            df_final = FeatureEngineer.prepare_training_data(df_1m, df_60m, vix_df)
-            
-            # Save Processed Data
-            out_path = f"{processed_dir}/{symbol}_training_data.csv"
-            df_final.to_csv(out_path, index=False)
-            print(f"   ✅ Saved Training Data: {out_path} ({len(df_final)} rows)")
-            
-        except Exception as e:
-            print(f"   ❌ Error processing {symbol}: {e}")
+    symbols = symbols or [s for s in store.symbols("minute") if s not in MARKET_SYMBOLS.values()]
+    print(f"   Found {len(symbols)} stocks in store.")
+    if not symbols:
+        return {}
+
+    workers = workers or pool_size(len(symbols), COMPACT_WORKER_MEMORY_GB if compact else WORKER_MEMORY_GB)
+    print(f"   🧵 Workers: {workers}")
+
+    results = {}
+    peaks = {}
+    peak_label = "per-symbol peak RSS" if reset_peak_rss() else "cumulative process peak RSS"
+
+    def report(symbol, mode, rows, peak_mb, error):
+        results[symbol] = (mode, rows, error)
+        peaks[symbol] = peak_mb
+        if error:
+            print(f"   ❌ Error processing {symbol}: {error}")
+        elif mode == 'cached':
+            print(f"   ♻️ Up to date: features/{symbol}")
+        else:
+            memory = f", {peak_label} {peak_mb:.0f} MB" if peak_mb else ""
+            print(f"   ✅ Saved Training Data: features/{symbol} ({mode}, {rows} rows{memory})")
+
+    if workers == 1:
+        _init_worker(market)
+        for symbol in symbols:
+            print(f"🔍 Processing {symbol}...")
+            report(*process_symbol(symbol, store.root, force, compact, chunk_rows))
+    else:
+        # Long-lived forked workers: imports and the market context are set up once per worker, not per symbol
+        context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(market,)) as pool:
+            futures = {pool.submit(process_symbol, symbol, store.root, force, compact, chunk_rows): symbol
+                       for symbol in symbols}
+            for future in as_completed(futures):
+                try:
+                    report(*future.result())
+                except Exception as e:
+                    # Worker died (e.g. out of memory) before it could report
+                    report(futures[future], None, 0, None, f"{type(e).__name__}: {e}")
 
+    # 3. Summary
+    failed = {s: err for s, (_, _, err) in results.items() if err}
+    modes = [mode for mode, _, err in results.values() if not err]
     print("="*60)
-    print("🏁 Pipeline Complete.")
+    print(f"🏁 Pipeline Complete in {time.perf_counter() - start_time:.1f}s.")
+    print(f"   ✅ Rebuilt: {modes.count('full')} | ✂️ Tail: {modes.count('tail')} | "
+          f"♻️ Cached: {modes.count('cached')} | ❌ Failed: {len(failed)}")
+    for symbol, error in sorted(failed.items()):
+        print(f"      {symbol}: {error}")
+    measured = {s: mb for s, mb in peaks.items() if mb}
+    if measured and workers > 1:
+        worst = max(measured, key=measured.get)
+        print(f"   🧠 Largest {peak_label}: {measured[worst]:.0f} MB ({worst}); "
+              f"assumed {COMPACT_WORKER_MEMORY_GB if compact else WORKER_MEMORY_GB} GB per worker")
+    return results
 
 if __name__ == "__main__":
     run_pipeline()
@@ -2,14 +2,14 @@ import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_squared_error, mean_absolute_error
-import joblib
 import os
 import matplotlib.pyplot as plt
-
-import glob
+from ai_option_brain.bar_store import BarStore
+from ai_option_brain.feature_engineer import FeatureEngineer
+from ai_option_brain.feature_manifest import FeatureManifest, save_model
 
 def train_model():
-    data_dir = "ai_option_brain/data/processed"
+    store = BarStore()
     model_dir = "ai_option_brain/models"
     os.makedirs(model_dir, exist_ok=True)
     
@@ -17,25 +17,20 @@ def train_model():
     print("="*60)
     
     # Scan for all processed training data
-    files = glob.glob(f"{data_dir}/*_training_data.csv")
-    print(f"   Found {len(files)} datasets.")
+    symbols = store.symbols("features")
+    print(f"   Found {len(symbols)} datasets.")
     
-    for file_path in files:
-        # Extract Symbol
-        filename = os.path.basename(file_path)
-        symbol = filename.replace("_training_data.csv", "")
-        
-        print(f"📉 Training for {symbol}...")
-            
+    for symbol in symbols:
         print(f"📉 Training for {symbol}...")
-        df = pd.read_csv(file_path)
-        df['date'] = pd.to_datetime(df['date']).dt.tz_localize(None)
+        df = store.read("features", symbol)
         
         # Features & Target
-        # Drop non-feature columns
-        drop_cols = ['date', 'open', 'high', 'low', 'close', 'volume', 'target_rv', 'log_ret']
-        features = [c for c in df.columns if c not in drop_cols]
+        # Model inputs are the engineered features only (no raw OHLCV, log_ret or labels); the
+        # manifest records them, in order, with their parameters
+        features = FeatureEngineer.input_features(df.columns)
         target = 'target_rv'
+        manifest = FeatureManifest.for_features(features, target)
+        print(f"   🧩 Features: {features}")
         
         # Train/Test Split (Date Based)
         # Train: Dec 2024 - May 2025
@@ -69,8 +64,8 @@ def train_model():
         print(f"   📊 RMSE: {rmse:.4f} | MAE: {mae:.4f}")
         print(f"   Mean Target RV: {y_test.mean():.4f}")
         
-        # Save Model
-        joblib.dump(model, f"{model_dir}/{symbol}_rf_vol.pkl")
+        # Save Model (with its feature manifest)
+        save_model(model, manifest, f"{model_dir}/{symbol}_rf_vol.pkl")
 
         
         # Feature Importance
@@ -1,6 +1,6 @@
-import os
-import pandas as pd
-import glob
+from ai_option_brain.bar_store import BarStore
+from ai_option_brain.feature_store import FeatureStore
+from ai_option_brain.market_context import MarketContext
 
 # Nifty 50 List
 NIFTY_50 = [
@@ -16,8 +16,13 @@ NIFTY_50 = [
     "TCS", "TECHM", "TITAN", "ULTRACEMCO", "WIPRO"
 ]
 
-def validate_data():
-    data_dir = "data"
+def validate_data(verify_features=False, chunk_rows=100000):
+    """
+    :param verify_features: Also check that chunked feature builds (run_feature_pipeline chunk_rows) and
+                            the stored, tail-rebuilt features reproduce the in-memory build exactly
+                            for every valid symbol (slow)
+    """
+    store = BarStore()
     print("🕵️‍♂️ Validating Nifty 50 Data...")
     print("="*60)
     
@@ -28,22 +33,14 @@ def validate_data():
     found_symbols = []
     
     for symbol in NIFTY_50:
-        file_path = f"{data_dir}/{symbol}.NS_2y_1d.csv"
-        
-        if not os.path.exists(file_path):
+        if not store.exists("minute", symbol):
             print(f"❌ Missing: {symbol}")
             missing_count += 1
             continue
             
         try:
-            # Check file size
-            if os.path.getsize(file_path) < 100: # Empty or header only
-                print(f"⚠️ Invalid (Empty): {symbol}")
-                invalid_count += 1
-                continue
-                
-            # Check CSV content
-            df = pd.read_csv(file_path)
+            # Check stored content
+            df = store.read("minute", symbol)
             
             # Check Columns
             required_cols = ['date', 'open', 'high', 'low', 'close', 'volume']
@@ -73,11 +70,22 @@ def validate_data():
     print(f"   ❌ Invalid: {invalid_count}")
     print(f"   🚫 Missing: {missing_count}")
     print("="*60)
+
+    if verify_features:
+        features = FeatureStore(store)
+        market = MarketContext.from_store(store)
+        mismatched = [s for s in found_symbols if not features.verify(s, market, chunk_rows=chunk_rows)]
+        print(f"🧮 Chunked ({chunk_rows} rows) and stored features == in-memory: "
+              f"{len(found_symbols) - len(mismatched)}/{len(found_symbols)}")
+        if mismatched:
+            print(f"   ❌ Mismatch: {mismatched}")
+        print("="*60)
     
-    # List Missing/Invalid for Retry
+    # List Missing/Invalid for Retry (fetch_nifty50_data.py re-harvests these automatically)
     retry_list = [s for s in NIFTY_50 if s not in found_symbols]
     if retry_list:
         print(f"🔄 Retry List ({len(retry_list)}): {retry_list}")
+    return retry_list
 
 if __name__ == "__main__":
     validate_data()
@@ -0,0 +1,77 @@
+import io
+import time
+import contextlib
+import numpy as np
+import pandas as pd
+from ai_option_brain.bar_store import BarStore
+from ai_option_brain.feature_engineer import FeatureEngineer
+from ai_option_brain.kite_stub_server import SyntheticMarket
+from ai_option_brain.online_features import OnlineFeatureEngine, FEATURES
+
+def load_bars(symbol, days=45):
+    """
+    Recent stored 1-min bars of `symbol`, or synthetic bars when the store has none.
+    """
+    store = BarStore()
+    if store.exists("minute", symbol):
+        end = store.last_timestamp("minute", symbol)
+        return store.read("minute", symbol, start=end - pd.Timedelta(days=days)), "store"
+    end = pd.Timestamp("2025-11-28 23:59")
+    return SyntheticMarket().minute_bars(100000, end - pd.Timedelta(days=days), end).reset_index(drop=True), "synthetic"
+
+def batch_last_row(df_1m):
+    """
+    The live batch path: features of the newest bar from a full prepare_training_data run.
+    """
+    df_60m = FeatureEngineer.resample_macro(df_1m)
+    with contextlib.redirect_stdout(io.StringIO()):
+        features = FeatureEngineer.prepare_training_data(df_1m, df_60m, None, include_target=False)
+    if features.empty or features['date'].iloc[-1] != df_1m['date'].iloc[-1]:
+        return None
+    return features[FEATURES].iloc[-1].values.astype(float)
+
+def validate_online_features(symbol="RELIANCE", checks=40, rtol=1e-9):
+    print("🔬 Validating Online Feature Engine vs Batch prepare_training_data...")
+    print("="*60)
+
+    df, source = load_bars(symbol)
+    df = df[['date', 'open', 'high', 'low', 'close', 'volume']].reset_index(drop=True)
+    print(f"   Bars: {len(df)} ({source})")
+
+    # 1. Stream every bar through the online engine
+    engine = OnlineFeatureEngine()
+    online = np.full((len(df), len(FEATURES)), np.nan)
+    ready = np.zeros(len(df), dtype=bool)
+    t0 = time.perf_counter()
+    for i, row in enumerate(zip(df['date'], df['high'].values, df['low'].values, df['close'].values, df['volume'].values,
+                                df['open'].values)):
+        online[i] = list(engine.update(*row).values())
+        ready[i] = engine.ready
+    per_bar_us = (time.perf_counter() - t0) / len(df) * 1e6
+
+    # 2. Compare against the batch path on history prefixes (first ready bar, hour/session edges, tail)
+    first_ready = int(np.argmax(ready)) if ready.any() else len(df) - 1
+    positions = sorted(set(np.linspace(first_ready, len(df) - 1, checks).astype(int)) |
+                       {max(first_ready - 1, 0), first_ready})
+    mismatches = 0
+    batch_time = 0.0
+    for i in positions:
+        t0 = time.perf_counter()
+        expected = batch_last_row(df.iloc[:i + 1])
+        batch_time += time.perf_counter() - t0
+        if expected is None:
+            ok = not ready[i]
+        else:
+            ok = ready[i] and np.allclose(online[i], expected, rtol=rtol, atol=1e-12)
+        if not ok:
+            mismatches += 1
+            print(f"   ❌ {df['date'].iloc[i]}: online {online[i]} vs batch {expected}")
+
+    print(f"   Checked {len(positions)} bars: {len(positions) - mismatches} match (rtol {rtol:g})")
+    print(f"   Latency: online {per_bar_us:.1f} µs/bar | batch {batch_time / len(positions) * 1000:.0f} ms/call")
+    print("="*60)
+    print("✅ Parity OK" if mismatches == 0 else f"❌ {mismatches} mismatches")
+    return mismatches == 0
+
+if __name__ == "__main__":
+    validate_online_features()
@@ -1,23 +1,6 @@
 import numpy as np
-import scipy.stats as si
 import matplotlib.pyplot as plt
-
-def black_scholes(S, K, T, r, sigma, option_type="call"):
-    # S: Spot price
-    # K: Strike price
-    # T: Time to maturity (years)
-    # r: Risk-free interest rate
-    # sigma: Volatility of underlying asset
-    
-    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    d2 = (np.log(S / K) + (r - 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    
-    if option_type == "call":
-        option_price = (S * si.norm.cdf(d1, 0.0, 1.0) - K * np.exp(-r * T) * si.norm.cdf(d2, 0.0, 1.0))
-    if option_type == "put":
-        option_price = (K * np.exp(-r * T) * si.norm.cdf(-d2, 0.0, 1.0) - S * si.norm.cdf(-d1, 0.0, 1.0))
-        
-    return option_price
+from ai_option_brain.utils.black_scholes import BlackScholes
 
 def validate_pricing():
     print("🔬 Validating Pricing Model: Heuristic vs Black-Scholes")
@@ -32,8 +15,8 @@ def validate_pricing():
     sigma = 0.20 # 20% IV
     
     # 1. Calculate Initial Premium (Entry)
-    bs_call = black_scholes(S0, K, T, r, sigma, "call")
-    bs_put = black_scholes(S0, K, T, r, sigma, "put")
+    bs_call = BlackScholes.price(S0, K, T, r, sigma, "call")
+    bs_put = BlackScholes.price(S0, K, T, r, sigma, "put")
     real_entry_premium = bs_call + bs_put
     
     heuristic_entry_premium = 0.8 * S0 * sigma * np.sqrt(T)
@@ -56,8 +39,8 @@ def validate_pricing():
         # A. Real Value (BS)
         # Assume 1 day passed (T - 1/365)
         T_new = (T_days - 1) / 365
-        bs_call_new = black_scholes(S_new, K, T_new, r, sigma, "call")
-        bs_put_new = black_scholes(S_new, K, T_new, r, sigma, "put")
+        bs_call_new = BlackScholes.price(S_new, K, T_new, r, sigma, "call")
+        bs_put_new = BlackScholes.price(S_new, K, T_new, r, sigma, "put")
         real_value = bs_call_new + bs_put_new
         
         # B. Heuristic Value (From calculate_roi.py)
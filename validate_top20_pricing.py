@@ -1,21 +1,15 @@
 import os
 import pandas as pd
 import numpy as np
-import scipy.stats as si
 from kiteconnect import KiteConnect
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
+from ai_option_brain.instrument_master import InstrumentMaster
+from ai_option_brain.utils.black_scholes import BlackScholes
+from ai_option_brain.utils.expiry_calendar import ExpiryCalendar
 
 load_dotenv()
 
-def black_scholes(S, K, T, r, sigma, option_type="call"):
-    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    d2 = (np.log(S / K) + (r - 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    if option_type == "call":
-        return (S * si.norm.cdf(d1, 0.0, 1.0) - K * np.exp(-r * T) * si.norm.cdf(d2, 0.0, 1.0))
-    if option_type == "put":
-        return (K * np.exp(-r * T) * si.norm.cdf(-d2, 0.0, 1.0) - S * si.norm.cdf(-d1, 0.0, 1.0))
-
 def validate_top20():
     print("🔬 Validating Pricing for Top 20 Stocks (Dec Expiry)...")
     print("="*80)
@@ -34,13 +28,12 @@ def validate_top20():
     if not api_key or not access_token:
         print("❌ API Key/Token missing.")
         return
-    kite = KiteConnect(api_key=api_key)
+    kite = KiteConnect(api_key=api_key, root=os.getenv("ZERODHA_API_ROOT"))
     kite.set_access_token(access_token)
     
-    # 3. Fetch Instruments
-    print("   Fetching NFO Instruments...")
-    instruments = kite.instruments("NFO")
-    nse_instruments = kite.instruments("NSE")
+    # 3. Load Instruments (cached daily, indexed)
+    print("   Loading NFO Instruments...")
+    instruments = InstrumentMaster(kite)
     
     results = []
     
@@ -48,14 +41,13 @@ def validate_top20():
     target_date = "2025-11-28" # Last trading day
     expiry_month = "25DEC"
     r = 0.07
-    t_expiry = 27 / 365 # Approx days to Dec 25
     
     print(f"{'Symbol':<12} | {'Spot':<8} | {'Real Straddle':<15} | {'BS Price':<15} | {'Diff':<8}")
     print("-" * 80)
     
     for symbol in top_20:
         # A. Get Spot Token
-        spot_token = next((i['instrument_token'] for i in nse_instruments if i['tradingsymbol'] == symbol), None)
+        spot_token = instruments.get_token(symbol, "NSE")
         if not spot_token: continue
         
         # B. Get Spot Price
@@ -66,42 +58,25 @@ def validate_top20():
         spot_price = spot_data[-1]['close'] # Closing price
         
         # C. Find ATM Strike
-        # Step size varies (e.g. 10, 20, 50, 100). 
-        # Simple heuristic: Round to nearest 0.5% or check instrument list.
-        # Let's try to match exact symbol in instruments list to find valid strikes
-        
-        # Filter instruments for this symbol and expiry
-        sym_instrs = [i for i in instruments if i['name'] == symbol and i['expiry'].strftime('%Y-%m-%d') == '2025-12-24'] # Dec expiry is usually last Thu
-        # Actually expiry date might vary. Let's filter by tradingsymbol contains 25DEC
-        
-        # Construct expected symbol start
-        # e.g. RELIANCE25DEC...
-        prefix = f"{symbol}{expiry_month}"
-        candidates = [i for i in instruments if i['tradingsymbol'].startswith(prefix)]
+        # Step size varies (e.g. 10, 20, 50, 100), so pick the listed strike closest to spot.
+        # Expiry is the listed contract month matching expiry_month (e.g. 25DEC).
+        expiry = next((e for e in instruments.get_expiries(symbol) if e.strftime('%y%b').upper() == expiry_month), None)
+        if not expiry: continue
+        t_expiry = ExpiryCalendar.years_to_expiry(to_date, expiry) # From the snapshot close to the expiry close
         
+        candidates = instruments.get_chain(symbol, expiry=expiry, instrument_type='CE')
         if not candidates: continue
         
-        # Find strike closest to spot
-        # Parse strike from tradingsymbol? Or use 'strike' field if available (it is!)
-        # Kite instrument dump has 'strike' field.
-        
         closest_instr = min(candidates, key=lambda x: abs(x['strike'] - spot_price))
         strike = closest_instr['strike']
         
         # D. Get Option Tokens
-        ce_symbol = f"{symbol}{expiry_month}{int(strike)}CE"
-        pe_symbol = f"{symbol}{expiry_month}{int(strike)}PE"
-        
-        # Some strikes might be float? usually int for Nifty stocks
-        # Check if strike has decimal
-        if strike % 1 != 0:
-             ce_symbol = f"{symbol}{expiry_month}{strike}CE"
-             pe_symbol = f"{symbol}{expiry_month}{strike}PE"
-        
-        ce_token = next((i['instrument_token'] for i in candidates if i['tradingsymbol'] == ce_symbol), None)
-        pe_token = next((i['instrument_token'] for i in candidates if i['tradingsymbol'] == pe_symbol), None)
+        ce_instr = instruments.get_contract(symbol, expiry, strike, 'CE')
+        pe_instr = instruments.get_contract(symbol, expiry, strike, 'PE')
         
-        if not ce_token or not pe_token: continue
+        if not ce_instr or not pe_instr: continue
+        ce_token = ce_instr['instrument_token']
+        pe_token = pe_instr['instrument_token']
         
         # E. Get Option Prices
         ce_data = kite.historical_data(ce_token, from_date, to_date, "minute")
@@ -125,8 +100,7 @@ def validate_top20():
         hv_df['log_ret'] = np.log(hv_df['close'] / hv_df['close'].shift(1))
         hv = hv_df['log_ret'].tail(20).std() * np.sqrt(252)
         
-        bs_val = black_scholes(spot_price, strike, t_expiry, r, hv, "call") + \
-                 black_scholes(spot_price, strike, t_expiry, r, hv, "put")
+        bs_val = BlackScholes.straddle(spot_price, strike, t_expiry, r, hv)
                  
         diff = ((bs_val - real_straddle) / real_straddle) * 100
         